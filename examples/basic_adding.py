@@ -92,7 +92,8 @@ class BasicAdder:
     def subscribe_to_updates(self) -> None:
         """Subscribe to order book and user event updates."""
         l2_book_subscription: L2BookSubscription = {"type": "l2Book", "coin": COIN}
-        self.info.subscribe(l2_book_subscription, self.on_book_update)
+        # on_book_update places orders over REST, so run it off the websocket thread and skip stale books
+        self.info.subscribe(l2_book_subscription, self.on_book_update, delivery="conflate")
 
         user_events_subscription: UserEventsSubscription = {"type": "userEvents", "user": self.address}
         self.info.subscribe(user_events_subscription, self.on_user_events)
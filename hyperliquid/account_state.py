@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+
+from hyperliquid.info import Info
+from hyperliquid.utils.types import Any, Dict, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+Position = NamedTuple(
+    "Position",
+    [
+        ("coin", str),
+        ("size", float),
+        ("entry_px", Optional[float]),
+        ("unrealized_pnl", float),
+        ("margin_used", float),
+        ("liquidation_px", Optional[float]),
+    ],
+)
+OpenOrder = NamedTuple(
+    "OpenOrder",
+    [("coin", str), ("oid", int), ("is_buy", bool), ("limit_px", float), ("sz", float), ("timestamp", int)],
+)
+MarginSummary = NamedTuple(
+    "MarginSummary",
+    [("account_value", float), ("total_margin_used", float), ("total_ntl_pos", float), ("withdrawable", float)],
+)
+AccountSnapshot = NamedTuple(
+    "AccountSnapshot",
+    [
+        ("positions", Dict[str, Position]),
+        ("open_orders", Dict[int, OpenOrder]),
+        ("spot_balances", Optional[Dict[str, float]]),  # None when the feed does not carry spot balances
+        ("margin", MarginSummary),
+        ("received_at", float),
+    ],
+)
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def parse_clearinghouse_state(state: Any) -> Dict[str, Any]:
+    positions = {}
+    for asset_position in state.get("assetPositions", []):
+        p = asset_position["position"]
+        positions[p["coin"]] = Position(
+            p["coin"],
+            float(p["szi"]),
+            _optional_float(p.get("entryPx")),
+            float(p.get("unrealizedPnl", 0)),
+            float(p.get("marginUsed", 0)),
+            _optional_float(p.get("liquidationPx")),
+        )
+    summary = state.get("marginSummary", {})
+    margin = MarginSummary(
+        float(summary.get("accountValue", 0)),
+        float(summary.get("totalMarginUsed", 0)),
+        float(summary.get("totalNtlPos", 0)),
+        float(state.get("withdrawable", 0)),
+    )
+    return {"positions": positions, "margin": margin}
+
+
+def parse_open_orders(orders: Any) -> Dict[int, OpenOrder]:
+    return {
+        o["oid"]: OpenOrder(o["coin"], o["oid"], o["side"] == "B", float(o["limitPx"]), float(o["sz"]), o["timestamp"])
+        for o in orders
+    }
+
+
+def parse_spot_balances(spot_state: Any) -> Dict[str, float]:
+    return {b["coin"]: float(b["total"]) for b in spot_state.get("balances", [])}
+
+
+class AccountState:
+    """Positions, open orders, spot balances and margin of one user, kept current from the webData2 feed.
+
+    Every webData2 message is parsed once into an immutable AccountSnapshot that replaces the previous one, so
+    lookups are dictionary reads with no request. When no message arrived within max_staleness seconds (or before
+    the first one), reads fall back to one REST refresh of the same snapshot.
+    """
+
+    def __init__(self, info: Info, address: str, max_staleness: float = 30.0):
+        self.info = info
+        self.address = address
+        self.max_staleness = max_staleness
+        self._snapshot: Optional[AccountSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._subscription_id: Optional[int] = None
+        self._rest_spot_balances: Optional[Dict[str, float]] = None
+        self._rest_spot_balances_at = 0.0
+        self.ws_updates = 0
+        self.rest_refreshes = 0
+
+    def start(self) -> None:
+        # Each message is a full snapshot, so a backlog only needs the newest one
+        self._subscription_id = self.info.subscribe(
+            {"type": "webData2", "user": self.address}, self.on_web_data2, delivery="conflate"
+        )
+
+    def stop(self) -> None:
+        if self._subscription_id is not None:
+            self.info.unsubscribe({"type": "webData2", "user": self.address}, self._subscription_id)
+            self._subscription_id = None
+
+    def on_web_data2(self, msg: Any) -> None:
+        data = msg["data"]
+        clearinghouse = parse_clearinghouse_state(data["clearinghouseState"])
+        self._snapshot = AccountSnapshot(
+            clearinghouse["positions"],
+            parse_open_orders(data.get("openOrders", [])),
+            parse_spot_balances(data["spotState"]) if "spotState" in data else None,
+            clearinghouse["margin"],
+            time.monotonic(),
+        )
+        self.ws_updates += 1
+
+    def refresh(self) -> AccountSnapshot:
+        """Rebuild the snapshot over REST."""
+        clearinghouse = parse_clearinghouse_state(self.info.user_state(self.address))
+        snapshot = AccountSnapshot(
+            clearinghouse["positions"],
+            parse_open_orders(self.info.open_orders(self.address)),
+            parse_spot_balances(self.info.spot_user_state(self.address)),
+            clearinghouse["margin"],
+            time.monotonic(),
+        )
+        self._snapshot = snapshot
+        self.rest_refreshes += 1
+        return snapshot
+
+    def snapshot(self) -> AccountSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - snapshot.received_at <= self.max_staleness:
+            return snapshot
+        with self._refresh_lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - snapshot.received_at <= self.max_staleness:
+                return snapshot
+            logger.debug(f"Account state for {self.address} is stale, refreshing over REST")
+            return self.refresh()
+
+    def position(self, coin: str) -> float:
+        """Signed position size in coin, 0 if there is no position."""
+        p = self.snapshot().positions.get(coin)
+        return p.size if p is not None else 0.0
+
+    def position_info(self, coin: str) -> Optional[Position]:
+        return self.snapshot().positions.get(coin)
+
+    def spot_balance(self, coin: str) -> float:
+        spot_balances = self.snapshot().spot_balances
+        if spot_balances is None:
+            if self._rest_spot_balances is None or time.monotonic() - self._rest_spot_balances_at > self.max_staleness:
+                self._rest_spot_balances = parse_spot_balances(self.info.spot_user_state(self.address))
+                self._rest_spot_balances_at = time.monotonic()
+                self.rest_refreshes += 1
+            spot_balances = self._rest_spot_balances
+        return spot_balances.get(coin, 0.0)
+
+    def open_orders(self) -> Dict[int, OpenOrder]:
+        return self.snapshot().open_orders
+
+    def margin(self) -> MarginSummary:
+        return self.snapshot().margin
@@ -3,11 +3,12 @@ import logging
 from json import JSONDecodeError
 import threading
 import time
-import requests
 
 from hyperliquid.utils.constants import MAINNET_API_URL
-from hyperliquid.utils.error import ClientError, ServerError
-from typing import Any
+from hyperliquid.utils.error import ClientError, ServerError, WsPostNotSentError
+from hyperliquid.utils.transport import Transport, get_transport
+from hyperliquid.websocket_manager import WebsocketManager
+from typing import Any, Optional
 
 # ====== 限流参数 ======
 MAX_CALLS_PER_SECOND = 3
@@ -15,23 +16,53 @@ RETRY_ON_429 = 5
 RETRY_BASE_DELAY = 1.5  # 秒，指数退避基数
 # =====================
 
+# 可以走 websocket post 通道的接口及对应的请求类型
+WS_POST_REQUEST_TYPES = {"/info": "info", "/exchange": "action"}
+
+
 class API:
     _lock = threading.Lock()
     _call_times = []  # 存储每次请求的时间戳
 
-    def __init__(self, base_url=None):
+    def __init__(self, base_url: Optional[str] = None, transport: Optional[Transport] = None):
         self.base_url = base_url or MAINNET_API_URL
-        self.session = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        # 同一 base_url 的 Info / Exchange 共用一个连接池
+        self.transport = transport or get_transport(self.base_url)
+        self.session = self.transport.session
         self._logger = logging.getLogger(__name__)
+        self.ws_poster: Optional[WebsocketManager] = None
+        self.ws_post_timeout = 10.0
+
+    def enable_ws_post(self, ws_manager: WebsocketManager, timeout: float = 10.0) -> None:
+        """/info 和 /exchange 请求改走 websocket post 通道。
+
+        /info 请求失败或超时都改用 HTTP 重发。/exchange 只在请求没有发出(未连接或发送失败)时改用 HTTP；
+        已经发出但超时或连接断开时抛出 WsPostOutcomeUnknownError，此时 action 可能已经执行，
+        调用方应先查询订单状态再决定是否重下，否则同一订单可能被下两次。
+        """
+        self.ws_poster = ws_manager
+        self.ws_post_timeout = timeout
+
+    def disable_ws_post(self) -> None:
+        self.ws_poster = None
 
     def post(self, url_path: str, payload: Any = None) -> Any:
         payload = payload or {}
+        request_type = WS_POST_REQUEST_TYPES.get(url_path)
+        if self.ws_poster is not None and request_type is not None:
+            try:
+                return self.ws_poster.post(request_type, payload, self.ws_post_timeout)
+            except WsPostNotSentError as e:
+                self._logger.warning(f"websocket post未发出({e.message})，改用HTTP请求")
+            except Exception as e:
+                if url_path == "/exchange":
+                    raise
+                self._logger.warning(f"websocket post失败({e!r})，改用HTTP请求")
         url = self.base_url + url_path
         retry = 0
         while True:
             self._throttle()
-            response = self.session.post(url, json=payload)
+            response = self.transport.post(url, payload)
             if response.status_code == 429:
                 if retry < RETRY_ON_429:
                     delay = RETRY_BASE_DELAY * (2 ** retry)
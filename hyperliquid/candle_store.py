@@ -0,0 +1,133 @@
+import os
+from functools import lru_cache
+from types import ModuleType
+
+from hyperliquid.info import Info
+from hyperliquid.utils.signing import get_timestamp_ms
+from hyperliquid.utils.types import Any, List, Optional
+
+# numpy is optional and only imported when candles are converted or read
+CANDLE_FIELDS = [
+    ("t", "<i8"),  # open time in milliseconds
+    ("T", "<i8"),  # close time in milliseconds
+    ("o", "<f8"),
+    ("h", "<f8"),
+    ("l", "<f8"),
+    ("c", "<f8"),
+    ("v", "<f8"),
+    ("n", "<i8"),  # number of trades
+]
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 3_600_000,
+    "2h": 2 * 3_600_000,
+    "4h": 4 * 3_600_000,
+    "8h": 8 * 3_600_000,
+    "12h": 12 * 3_600_000,
+    "1d": 86_400_000,
+    "3d": 3 * 86_400_000,
+    "1w": 7 * 86_400_000,
+    "1M": 30 * 86_400_000,
+}
+
+
+def _numpy() -> ModuleType:
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("CandleStore requires numpy, install it with: pip install numpy") from e
+    return numpy
+
+
+@lru_cache(maxsize=None)
+def candle_dtype() -> Any:
+    """The numpy structured dtype of CANDLE_FIELDS."""
+    return _numpy().dtype(CANDLE_FIELDS)
+
+
+def candles_to_array(candles: List[Any]) -> Any:
+    """Convert candles_snapshot records into a candle_dtype() structured array."""
+    arr = _numpy().empty(len(candles), dtype=candle_dtype())
+    for i, c in enumerate(candles):
+        arr[i] = (c["t"], c["T"], float(c["o"]), float(c["h"]), float(c["l"]), float(c["c"]), float(c["v"]), c["n"])
+    return arr
+
+
+class CandleStore:
+    """Local append-only candle history, one flat binary file per coin and interval.
+
+    Files hold candle_dtype() records ordered by open time and are read back as read-only memory maps,
+    so slices returned by read() are views into the page cache rather than copies. sync() only
+    downloads the range after the last stored candle, refreshing that candle since it may have been
+    stored while still open. Requires numpy, which is not a dependency of the package.
+    """
+
+    def __init__(self, info: Info, root_dir: str):
+        self.info = info
+        self.root_dir = root_dir
+
+    def path(self, name: str, interval: str) -> str:
+        coin = self.info.name_to_coin.get(name, name).replace("/", "_")
+        return os.path.join(self.root_dir, coin, f"{interval}.bin")
+
+    def read(self, name: str, interval: str, start_time: Optional[int] = None, end_time: Optional[int] = None) -> Any:
+        """Return the stored candles whose open time lies in [start_time, end_time] without copying."""
+        np, dtype = _numpy(), candle_dtype()
+        path = self.path(name, interval)
+        if not os.path.exists(path) or os.path.getsize(path) < dtype.itemsize:
+            return np.empty(0, dtype=dtype)
+        candles = np.memmap(path, dtype=dtype, mode="r", shape=(os.path.getsize(path) // dtype.itemsize,))
+        open_times = candles["t"]
+        lo = 0 if start_time is None else int(np.searchsorted(open_times, start_time, side="left"))
+        hi = len(candles) if end_time is None else int(np.searchsorted(open_times, end_time, side="right"))
+        return candles[lo:hi]
+
+    def last_open_time(self, name: str, interval: str) -> Optional[int]:
+        candles = self.read(name, interval)
+        return int(candles["t"][-1]) if len(candles) else None
+
+    def sync(self, name: str, interval: str, start_time: Optional[int] = None, end_time: Optional[int] = None) -> int:
+        """Download the candles missing after the last stored one and append them.
+
+        start_time is only used when nothing is stored yet. Returns the number of candles appended.
+        """
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unsupported candle interval {interval}")
+        interval_ms = INTERVAL_MS[interval]
+        end_time = end_time if end_time is not None else get_timestamp_ms()
+        last_open = self.last_open_time(name, interval)
+        if last_open is None:
+            if start_time is None:
+                raise ValueError(f"No stored {interval} candles for {name}, a start_time is required")
+            fetch_from = start_time
+        else:
+            fetch_from = last_open
+
+        path = self.path(name, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        appended = 0
+        while fetch_from <= end_time:
+            page = candles_to_array(self.info.candles_snapshot(name, interval, fetch_from, end_time))
+            if last_open is not None:
+                page = page[page["t"] >= last_open]
+            if len(page) == 0:
+                break
+            with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+                if last_open is not None and page["t"][0] == last_open:
+                    # The last stored candle may have been open when it was written; overwrite it in place.
+                    f.seek(-candle_dtype().itemsize, os.SEEK_END)
+                    f.write(page[:1].tobytes())
+                    page = page[1:]
+                f.seek(0, os.SEEK_END)
+                f.write(page.tobytes())
+            appended += len(page)
+            if len(page) == 0:
+                break
+            last_open = int(page["t"][-1])
+            fetch_from = last_open + interval_ms
+        return appended
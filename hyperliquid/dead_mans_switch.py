@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.signing import CancelRequest, get_timestamp_ms
+from hyperliquid.utils.types import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DeadMansSwitch:
+    """Keeps a scheduleCancel armed and a signed cancel-all ready to post.
+
+    A background thread pushes the exchange-side scheduled cancel `timeout` seconds into the future every
+    `refresh_interval` seconds, so all open orders are cancelled by the exchange if this process stops refreshing
+    it. The same thread polls `order_source` for the orders to cancel and re-signs a bulk cancel whenever that set
+    changes (or the signature gets old), so fire() normally sends a single request with no signing first. fire()
+    still checks `order_source` and signs a new cancel if orders changed since the last poll, so an order placed
+    just before firing is not left open.
+    """
+
+    def __init__(
+        self,
+        exchange: Exchange,
+        order_source: Callable[[], List[CancelRequest]],
+        timeout: float = 60,
+        refresh_interval: float = 20,
+        poll_interval: float = 1,
+        max_presign_age: float = 60,
+    ):
+        if timeout < 5:
+            raise ValueError("scheduleCancel requires the cancel time to be at least 5 seconds ahead")
+        if refresh_interval >= timeout:
+            raise ValueError("refresh_interval must be shorter than timeout")
+        self.exchange = exchange
+        self.order_source = order_source
+        self.timeout = timeout
+        self.refresh_interval = refresh_interval
+        self.poll_interval = poll_interval
+        self.max_presign_age = max_presign_age
+        self._lock = threading.Lock()
+        self._presigned: Optional[Dict[str, Any]] = None
+        self._presigned_orders: Optional[FrozenSet[Tuple[str, int]]] = None
+        self._presigned_at = 0.0
+        self._last_schedule = 0.0
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="dead-mans-switch", daemon=True)
+        self._thread.start()
+
+    def stop(self, clear_schedule: bool = True) -> None:
+        """Stop refreshing. With clear_schedule the pending scheduled cancel is removed as well."""
+        self._stop_event.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        if clear_schedule:
+            try:
+                self.exchange.schedule_cancel(None)
+            except Exception as e:
+                logger.warning(f"Failed to clear scheduled cancel: {e}")
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            now = time.time()
+            if now - self._last_schedule >= self.refresh_interval:
+                try:
+                    self.exchange.schedule_cancel(get_timestamp_ms() + int(self.timeout * 1000))
+                    self._last_schedule = now
+                except Exception as e:
+                    logger.warning(f"Failed to refresh scheduled cancel: {e}")
+            try:
+                self.presign()
+            except Exception as e:
+                logger.warning(f"Failed to presign cancel-all: {e}")
+            self._stop_event.wait(self.poll_interval)
+
+    def presign(self, force: bool = False) -> None:
+        """Re-sign the cancel-all if the order set changed or the current signature is too old."""
+        cancel_requests = list(self.order_source())
+        orders = frozenset((c["coin"], c["oid"]) for c in cancel_requests)
+        with self._lock:
+            fresh = time.time() - self._presigned_at < self.max_presign_age
+            if not force and orders == self._presigned_orders and fresh:
+                return
+        presigned = self.exchange.presign_bulk_cancel(cancel_requests) if cancel_requests else None
+        with self._lock:
+            self._presigned = presigned
+            self._presigned_orders = orders
+            self._presigned_at = time.time()
+
+    def fire(self) -> Any:
+        """Post the cancel-all. Returns the exchange response, or None if there was nothing to cancel.
+
+        The presigned cancel is used when it still covers exactly the current orders; otherwise the current orders
+        are signed and cancelled now. If order_source fails, the presigned cancel is posted as it is.
+        """
+        try:
+            cancel_requests: Optional[List[CancelRequest]] = list(self.order_source())
+        except Exception as e:
+            logger.warning(f"Failed to read orders before firing, posting the presigned cancel-all: {e}")
+            cancel_requests = None
+        with self._lock:
+            presigned = self._presigned
+            presigned_orders = self._presigned_orders
+            # The nonce is consumed by posting, so the next fire needs a new signature
+            self._presigned = None
+            self._presigned_orders = None
+        if (
+            cancel_requests is not None
+            and frozenset((c["coin"], c["oid"]) for c in cancel_requests) != presigned_orders
+        ):
+            presigned = self.exchange.presign_bulk_cancel(cancel_requests) if cancel_requests else None
+        if presigned is None:
+            return None
+        return self.exchange.post_presigned(presigned)
@@ -8,6 +8,7 @@ from eth_account.signers.local import LocalAccount
 from hyperliquid.api import API
 from hyperliquid.info import Info
 from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.nonce import NonceManager, get_nonce_manager
 from hyperliquid.utils.signing import (
     CancelByCloidRequest,
     CancelRequest,
@@ -15,11 +16,9 @@ from hyperliquid.utils.signing import (
     OidOrCloid,
     OrderRequest,
     OrderType,
-    OrderWire,
     ScheduleCancelAction,
     float_to_usd_int,
-    get_timestamp_ms,
-    order_request_to_order_wire,
+    order_requests_to_order_wires,
     order_wires_to_order_action,
     sign_agent,
     sign_approve_builder_fee,
@@ -48,6 +47,13 @@ from hyperliquid.utils.types import (
 
 
 class Exchange(API):
+    """Signs and sends actions for a wallet.
+
+    Nonces come from the wallet's shared NonceManager, which is safe across threads and Exchange instances in one
+    process but not across processes. Processes signing with the same key must pass
+    nonce_manager=get_nonce_manager(wallet.address, lock_dir=...) with a common lock_dir.
+    """
+
     # Default Max Slippage for Market Orders 5%
     DEFAULT_SLIPPAGE = 0.05
 
@@ -60,14 +66,25 @@ class Exchange(API):
         account_address: Optional[str] = None,
         spot_meta: Optional[SpotMeta] = None,
         perp_dexs: Optional[List[str]] = None,
+        nonce_manager: Optional[NonceManager] = None,
     ):
         super().__init__(base_url)
         self.wallet = wallet
+        # Nonces are allocated per signer, so Exchange instances sharing a wallet never reuse a nonce
+        self.nonce_manager = nonce_manager or get_nonce_manager(wallet.address)
         self.vault_address = vault_address
         self.account_address = account_address
         self.info = Info(base_url, True, meta, spot_meta, perp_dexs)
         self.expires_after: Optional[int] = None
 
+    def post(self, url_path: str, payload: Any = None) -> Any:
+        try:
+            return super().post(url_path, payload)
+        finally:
+            if url_path == "/exchange":
+                # Our own action may have changed orders, positions or balances
+                self.info.response_cache.invalidate()
+
     def _post_action(self, action, signature, nonce):
         payload = {
             "action": action,
@@ -79,6 +96,15 @@ class Exchange(API):
         logging.debug(payload)
         return self.post("/exchange", payload)
 
+    def post_presigned(self, presigned: Dict[str, Any]) -> Any:
+        """Post an action prepared by one of the presign_* methods.
+
+        The payload is sent exactly as it was signed, so a later set_expires_after does not invalidate it.
+        A presigned action can only be posted once since its nonce is consumed.
+        """
+        logging.debug(presigned)
+        return self.post("/exchange", presigned)
+
     def _slippage_price(
         self,
         name: str,
@@ -129,15 +155,18 @@ class Exchange(API):
             order["cloid"] = cloid
         return self.bulk_orders([order], builder)
 
-    def bulk_orders(self, order_requests: List[OrderRequest], builder: Optional[BuilderInfo] = None) -> Any:
-        order_wires: List[OrderWire] = [
-            order_request_to_order_wire(order, self.info.name_to_asset(order["coin"])) for order in order_requests
-        ]
-        timestamp = get_timestamp_ms()
-
+    def bulk_orders_action(self, order_requests: List[OrderRequest], builder: Optional[BuilderInfo] = None) -> Any:
+        """Build the unsigned action posted by bulk_orders."""
+        order_wires = order_requests_to_order_wires(
+            order_requests, [self.info.name_to_asset(order["coin"]) for order in order_requests]
+        )
         if builder:
             builder["b"] = builder["b"].lower()
-        order_action = order_wires_to_order_action(order_wires, builder)
+        return order_wires_to_order_action(order_wires, builder)
+
+    def bulk_orders(self, order_requests: List[OrderRequest], builder: Optional[BuilderInfo] = None) -> Any:
+        order_action = self.bulk_orders_action(order_requests, builder)
+        timestamp = self.nonce_manager.next_nonce()
 
         signature = sign_l1_action(
             self.wallet,
@@ -179,21 +208,28 @@ class Exchange(API):
         }
         return self.bulk_modify_orders_new([modify])
 
-    def bulk_modify_orders_new(self, modify_requests: List[ModifyRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+    def bulk_modify_orders_action(self, modify_requests: List[ModifyRequest]) -> Any:
+        """Build the unsigned action posted by bulk_modify_orders_new."""
+        orders = [modify["order"] for modify in modify_requests]
+        order_wires = order_requests_to_order_wires(
+            orders, [self.info.name_to_asset(order["coin"]) for order in orders]
+        )
         modify_wires = [
             {
                 "oid": modify["oid"].to_raw() if isinstance(modify["oid"], Cloid) else modify["oid"],
-                "order": order_request_to_order_wire(modify["order"], self.info.name_to_asset(modify["order"]["coin"])),
+                "order": order_wire,
             }
-            for modify in modify_requests
+            for modify, order_wire in zip(modify_requests, order_wires)
         ]
-
-        modify_action = {
+        return {
             "type": "batchModify",
             "modifies": modify_wires,
         }
 
+    def bulk_modify_orders_new(self, modify_requests: List[ModifyRequest]) -> Any:
+        timestamp = self.nonce_manager.next_nonce()
+        modify_action = self.bulk_modify_orders_action(modify_requests)
+
         signature = sign_l1_action(
             self.wallet,
             modify_action,
@@ -270,8 +306,11 @@ class Exchange(API):
         return self.bulk_cancel_by_cloid([{"coin": name, "cloid": cloid}])
 
     def bulk_cancel(self, cancel_requests: List[CancelRequest]) -> Any:
-        timestamp = get_timestamp_ms()
-        cancel_action = {
+        return self.post_presigned(self.presign_bulk_cancel(cancel_requests))
+
+    def bulk_cancel_action(self, cancel_requests: List[CancelRequest]) -> Any:
+        """Build the unsigned action posted by bulk_cancel."""
+        return {
             "type": "cancel",
             "cancels": [
                 {
@@ -281,6 +320,16 @@ class Exchange(API):
                 for cancel in cancel_requests
             ],
         }
+
+    def presign_bulk_cancel(self, cancel_requests: List[CancelRequest]) -> Dict[str, Any]:
+        """Build and sign a bulk cancel without sending it, for posting later with post_presigned.
+
+        Useful for kill switches where the cancel should go out in a single request. Nonces are only accepted
+        within a limited window and must stay above the oldest of the account's recent nonces, so a presigned
+        action should be refreshed regularly rather than kept for long.
+        """
+        timestamp = self.nonce_manager.next_nonce()
+        cancel_action = self.bulk_cancel_action(cancel_requests)
         signature = sign_l1_action(
             self.wallet,
             cancel_action,
@@ -290,14 +339,16 @@ class Exchange(API):
             self.base_url == MAINNET_API_URL,
         )
 
-        return self._post_action(
-            cancel_action,
-            signature,
-            timestamp,
-        )
+        return {
+            "action": cancel_action,
+            "nonce": timestamp,
+            "signature": signature,
+            "vaultAddress": self.vault_address,
+            "expiresAfter": self.expires_after,
+        }
 
     def bulk_cancel_by_cloid(self, cancel_requests: List[CancelByCloidRequest]) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
 
         cancel_action = {
             "type": "cancelByCloid",
@@ -332,7 +383,7 @@ class Exchange(API):
         Args:
             time (int): if time is not None, then set the cancel time in the future. If None, then unsets any cancel time in the future.
         """
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         schedule_cancel_action: ScheduleCancelAction = {
             "type": "scheduleCancel",
         }
@@ -353,7 +404,7 @@ class Exchange(API):
         )
 
     def update_leverage(self, leverage: int, name: str, is_cross: bool = True) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         update_leverage_action = {
             "type": "updateLeverage",
             "asset": self.info.name_to_asset(name),
@@ -375,7 +426,7 @@ class Exchange(API):
         )
 
     def update_isolated_margin(self, amount: float, name: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         amount = float_to_usd_int(amount)
         update_isolated_margin_action = {
             "type": "updateIsolatedMargin",
@@ -398,7 +449,7 @@ class Exchange(API):
         )
 
     def set_referrer(self, code: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         set_referrer_action = {
             "type": "setReferrer",
             "code": code,
@@ -418,7 +469,7 @@ class Exchange(API):
         )
 
     def create_sub_account(self, name: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         create_sub_account_action = {
             "type": "createSubAccount",
             "name": name,
@@ -438,7 +489,7 @@ class Exchange(API):
         )
 
     def usd_class_transfer(self, amount: float, to_perp: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         str_amount = str(amount)
         if self.vault_address:
             str_amount += f" subaccount:{self.vault_address}"
@@ -457,7 +508,7 @@ class Exchange(API):
         )
 
     def perp_dex_class_transfer(self, dex: str, token: str, amount: float, to_perp: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         str_amount = str(amount)
         if self.vault_address:
             str_amount += f" subaccount:{self.vault_address}"
@@ -478,7 +529,7 @@ class Exchange(API):
         )
 
     def sub_account_transfer(self, sub_account_user: str, is_deposit: bool, usd: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         sub_account_transfer_action = {
             "type": "subAccountTransfer",
             "subAccountUser": sub_account_user,
@@ -500,7 +551,7 @@ class Exchange(API):
         )
 
     def sub_account_spot_transfer(self, sub_account_user: str, is_deposit: bool, token: str, amount: float) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         sub_account_transfer_action = {
             "type": "subAccountSpotTransfer",
             "subAccountUser": sub_account_user,
@@ -523,7 +574,7 @@ class Exchange(API):
         )
 
     def vault_usd_transfer(self, vault_address: str, is_deposit: bool, usd: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         vault_transfer_action = {
             "type": "vaultTransfer",
             "vaultAddress": vault_address,
@@ -539,7 +590,7 @@ class Exchange(API):
         )
 
     def usd_transfer(self, amount: float, destination: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "usdSend"}
         is_mainnet = self.base_url == MAINNET_API_URL
         signature = sign_usd_transfer_action(self.wallet, action, is_mainnet)
@@ -550,7 +601,7 @@ class Exchange(API):
         )
 
     def spot_transfer(self, amount: float, destination: str, token: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "destination": destination,
             "amount": str(amount),
@@ -567,7 +618,7 @@ class Exchange(API):
         )
 
     def token_delegate(self, validator: str, wei: int, is_undelegate: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "validator": validator,
             "wei": wei,
@@ -584,7 +635,7 @@ class Exchange(API):
         )
 
     def withdraw_from_bridge(self, amount: float, destination: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {"destination": destination, "amount": str(amount), "time": timestamp, "type": "withdraw3"}
         is_mainnet = self.base_url == MAINNET_API_URL
         signature = sign_withdraw_from_bridge_action(self.wallet, action, is_mainnet)
@@ -597,7 +648,7 @@ class Exchange(API):
     def approve_agent(self, name: Optional[str] = None) -> Tuple[Any, str]:
         agent_key = "0x" + secrets.token_hex(32)
         account = eth_account.Account.from_key(agent_key)
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         is_mainnet = self.base_url == MAINNET_API_URL
         action = {
             "type": "approveAgent",
@@ -619,14 +670,14 @@ class Exchange(API):
         )
 
     def approve_builder_fee(self, builder: str, max_fee_rate: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
 
         action = {"maxFeeRate": max_fee_rate, "builder": builder, "nonce": timestamp, "type": "approveBuilderFee"}
         signature = sign_approve_builder_fee(self.wallet, action, self.base_url == MAINNET_API_URL)
         return self._post_action(action, signature, timestamp)
 
     def convert_to_multi_sig_user(self, authorized_users: List[str], threshold: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         authorized_users = sorted(authorized_users)
         signers = {
             "authorizedUsers": authorized_users,
@@ -647,7 +698,7 @@ class Exchange(API):
     def spot_deploy_register_token(
         self, token_name: str, sz_decimals: int, wei_decimals: int, max_gas: int, full_name: str
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "spotDeploy",
             "registerToken2": {
@@ -673,7 +724,7 @@ class Exchange(API):
     def spot_deploy_user_genesis(
         self, token: int, user_and_wei: List[Tuple[str, str]], existing_token_and_wei: List[Tuple[int, str]]
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "spotDeploy",
             "userGenesis": {
@@ -697,7 +748,7 @@ class Exchange(API):
         )
 
     def spot_deploy_enable_freeze_privilege(self, token: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "spotDeploy",
             "enableFreezePrivilege": {
@@ -719,7 +770,7 @@ class Exchange(API):
         )
 
     def spot_deploy_freeze_user(self, token: int, user: str, freeze: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "spotDeploy",
             "freezeUser": {
@@ -743,7 +794,7 @@ class Exchange(API):
         )
 
     def spot_deploy_revoke_freeze_privilege(self, token: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "spotDeploy",
             "revokeFreezePrivilege": {
@@ -765,7 +816,7 @@ class Exchange(API):
         )
 
     def spot_deploy_genesis(self, token: int, max_supply: str, no_hyperliquidity: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         genesis = {
             "token": token,
             "maxSupply": max_supply,
@@ -791,7 +842,7 @@ class Exchange(API):
         )
 
     def spot_deploy_register_spot(self, base_token: int, quote_token: int) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "spotDeploy",
             "registerSpot": {
@@ -815,7 +866,7 @@ class Exchange(API):
     def spot_deploy_register_hyperliquidity(
         self, spot: int, start_px: float, order_sz: float, n_orders: int, n_seeded_levels: Optional[int]
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         register_hyperliquidity = {
             "spot": spot,
             "startPx": str(start_px),
@@ -843,7 +894,7 @@ class Exchange(API):
         )
 
     def spot_deploy_set_deployer_trading_fee_share(self, token: int, share: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "spotDeploy",
             "setDeployerTradingFeeShare": {
@@ -876,7 +927,7 @@ class Exchange(API):
         only_isolated: bool,
         schema: Optional[PerpDexSchemaInput],
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         schema_wire = None
         if schema is not None:
             schema_wire = {
@@ -919,7 +970,7 @@ class Exchange(API):
         oracle_pxs: Dict[str, str],
         mark_pxs: Optional[Dict[str, str]],
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         oracle_pxs_wire = sorted(list(oracle_pxs.items()))
         mark_pxs_wire = None
         if mark_pxs is not None:
@@ -953,7 +1004,7 @@ class Exchange(API):
         return self.c_signer_inner("jailSelf")
 
     def c_signer_inner(self, variant: str) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "CSignerAction",
             variant: None,
@@ -983,7 +1034,7 @@ class Exchange(API):
         unjailed: bool,
         initial_wei: int,
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "CValidatorAction",
             "register": {
@@ -1023,7 +1074,7 @@ class Exchange(API):
         commission_bps: Optional[int],
         signer: Optional[str],
     ) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "CValidatorAction",
             "changeProfile": {
@@ -1051,7 +1102,7 @@ class Exchange(API):
         )
 
     def c_validator_unregister(self) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "CValidatorAction",
             "unregister": None,
@@ -1071,6 +1122,12 @@ class Exchange(API):
         )
 
     def multi_sig(self, multi_sig_user, inner_action, signatures, nonce, vault_address=None):
+        return self.post_presigned(
+            self.presign_multi_sig(multi_sig_user, inner_action, signatures, nonce, vault_address)
+        )
+
+    def presign_multi_sig(self, multi_sig_user, inner_action, signatures, nonce, vault_address=None):
+        """Wrap collected signer signatures in a multiSig action signed by this wallet, for post_presigned."""
         multi_sig_user = multi_sig_user.lower()
         multi_sig_action = {
             "type": "multiSig",
@@ -1091,14 +1148,16 @@ class Exchange(API):
             nonce,
             self.expires_after,
         )
-        return self._post_action(
-            multi_sig_action,
-            signature,
-            nonce,
-        )
+        return {
+            "action": multi_sig_action,
+            "nonce": nonce,
+            "signature": signature,
+            "vaultAddress": self.vault_address,
+            "expiresAfter": self.expires_after,
+        }
 
     def use_big_blocks(self, enable: bool) -> Any:
-        timestamp = get_timestamp_ms()
+        timestamp = self.nonce_manager.next_nonce()
         action = {
             "type": "evmUserModify",
             "usingBigBlocks": enable,
@@ -0,0 +1,116 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from hyperliquid.info import Info
+from hyperliquid.utils.signing import get_timestamp_ms
+from hyperliquid.utils.types import Any, Fill, NamedTuple, Optional, Set, UserFillsMsg
+
+logger = logging.getLogger(__name__)
+
+OrderFills = NamedTuple(
+    "OrderFills",
+    [
+        ("oid", int),
+        ("coin", str),
+        ("size", float),  # total filled size
+        ("vwap", float),
+        ("fee", float),
+        ("fills", int),
+        ("last_time", int),  # time of the latest fill in milliseconds
+    ],
+)
+
+
+class _OrderAggregate:
+    def __init__(self, coin: str):
+        self.coin = coin
+        self.size = 0.0
+        self.notional = 0.0
+        self.fee = 0.0
+        self.last_time = 0
+        self.tids: Set[Any] = set()
+
+
+class FillCache:
+    """One user's fills aggregated by order id, kept current from the userFills feed.
+
+    Each fill is folded into its order's running size, notional and fee as it arrives, so the fill price of an
+    order, including one filled in several parts, is a dictionary read with no request. Fills are deduplicated by
+    trade id, which makes the feed's initial snapshot and a REST backfill of the same period safe to combine. Only
+    the max_orders most recently filled orders are kept.
+    """
+
+    def __init__(self, info: Info, address: str, max_orders: int = 10000):
+        self.info = info
+        self.address = address
+        self.max_orders = max_orders
+        self._orders: "OrderedDict[int, _OrderAggregate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._subscription_id: Optional[int] = None
+
+    def start(self, backfill_ms: Optional[int] = None) -> None:
+        """Subscribe to userFills and, if backfill_ms is given, load the fills of that many past milliseconds."""
+        self._subscription_id = self.info.subscribe({"type": "userFills", "user": self.address}, self.on_user_fills)
+        if backfill_ms:
+            self.backfill(get_timestamp_ms() - backfill_ms)
+
+    def stop(self) -> None:
+        if self._subscription_id is not None:
+            self.info.unsubscribe({"type": "userFills", "user": self.address}, self._subscription_id)
+            self._subscription_id = None
+
+    def backfill(self, start_time: int, end_time: Optional[int] = None) -> int:
+        """Add the user's fills in [start_time, end_time] over REST and return how many were new."""
+        added = 0
+        for fill in self.info.iter_user_fills_by_time(self.address, start_time, end_time):
+            added += self.add(fill)
+        logger.debug(f"Backfilled {added} fills for {self.address}")
+        return added
+
+    def on_user_fills(self, msg: UserFillsMsg) -> None:
+        for fill in msg["data"]["fills"]:
+            self.add(fill)
+
+    def add(self, fill: Fill) -> bool:
+        """Fold one fill into its order, returning False if the fill was already counted."""
+        oid = fill["oid"]
+        tid = fill.get("tid", (fill["hash"], fill["time"], fill["px"], fill["sz"]))
+        px, sz = float(fill["px"]), float(fill["sz"])
+        with self._lock:
+            aggregate = self._orders.get(oid)
+            if aggregate is None:
+                aggregate = self._orders[oid] = _OrderAggregate(fill["coin"])
+                if len(self._orders) > self.max_orders:
+                    self._orders.popitem(last=False)
+            elif tid in aggregate.tids:
+                return False
+            aggregate.tids.add(tid)
+            aggregate.size += sz
+            aggregate.notional += px * sz
+            aggregate.fee += float(fill.get("fee", 0))
+            aggregate.last_time = max(aggregate.last_time, fill["time"])
+            self._orders.move_to_end(oid)
+        return True
+
+    def get(self, oid: int) -> Optional[OrderFills]:
+        with self._lock:
+            aggregate = self._orders.get(oid)
+            if aggregate is None or aggregate.size <= 0:
+                return None
+            return OrderFills(
+                oid,
+                aggregate.coin,
+                aggregate.size,
+                aggregate.notional / aggregate.size,
+                aggregate.fee,
+                len(aggregate.tids),
+                aggregate.last_time,
+            )
+
+    def vwap(self, oid: int) -> Optional[float]:
+        order_fills = self.get(oid)
+        return order_fills.vwap if order_fills is not None else None
+
+    def __len__(self) -> int:
+        return len(self._orders)
@@ -1,8 +1,15 @@
 import logging
 import eth_account
 from eth_account.signers.local import LocalAccount
+from hyperliquid.account_state import AccountState
+from hyperliquid.dead_mans_switch import DeadMansSwitch
 from hyperliquid.exchange import Exchange
-from hyperliquid.info import Info
+from hyperliquid.fill_cache import FillCache
+from hyperliquid.info import INFO_CACHE_TTLS, Info
+from hyperliquid.utils.error import WsPostOutcomeUnknownError
+from hyperliquid.utils.rolling import RollingWindow
+from hyperliquid.utils.types import Any, Cloid, Dict, List, Tuple
+import random
 import time
 from collections import defaultdict
 from threading import Thread
@@ -10,6 +17,9 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# check_orders中各类成交订单的名称，用于日志
+ORDER_KIND_NAMES = {"buy": "买单", "short": "做空单", "sell": "卖单", "cover": "平空单"}
+
 
 def setup(base_url=None, skip_ws=False, private_key="", address=""):
     logger.info("Connecting account...")
@@ -17,7 +27,8 @@ def setup(base_url=None, skip_ws=False, private_key="", address=""):
     if not address:
         address = account.address
     logger.info(f"Running with address: {address}")
-    info = Info(base_url, skip_ws)
+    # 行情和账户查询很频繁，短时间内的相同查询复用结果
+    info = Info(base_url, skip_ws, cache_ttls=INFO_CACHE_TTLS)
     spot_user_state = info.spot_user_state(address)
     logger.info(f"Spot balances: {spot_user_state['balances']}")
     if not any(float(b['total']) > 0 for b in spot_user_state["balances"]):
@@ -61,7 +72,7 @@ class GridTrading:
         self.short_cover_orders = []  # 做空减仓订单
         self.filled_short_oids = set()
         self.filled_short_cover_oids = set()
-        self.stats = defaultdict(float)
+        self.stats: Dict[str, float] = defaultdict(float)
         self.stats['buy_count'] = 0
         self.stats['sell_count'] = 0
         self.stats['short_count'] = 0
@@ -74,6 +85,9 @@ class GridTrading:
         self.stats['unrealized_pnl'] = 0.0
         self.stats['last_log_time'] = time.time()
         self.ws_midprice = None
+        self._ws_mid_time = 0.0  # 最近一次allMids推送的时间，连接断开后推送停止，据此判断行情是否过期
+        # 价格滚动窗口，由WebSocket行情逐笔写入，窗口长度在load_risk_config中按配置更新
+        self._price_window = RollingWindow(60)
         self.pending_orders_to_place = [] # 存储待补充的订单
         self._start_ws_thread()
         # 确定模式描述
@@ -93,21 +107,98 @@ class GridTrading:
 
         self.load_risk_config(risk_config_path)
 
+        # 死人开关：交易所侧定时撤单 + 预签名的一键撤单
+        self.dead_mans_switch = None
+        if self.risk_config.get("dead_mans_switch", False):
+            self.dead_mans_switch = DeadMansSwitch(
+                self.exchange,
+                self.local_cancel_requests,
+                timeout=self.risk_config.get("dms_timeout", 60),
+                refresh_interval=self.risk_config.get("dms_refresh_interval", 20),
+            )
+            self.dead_mans_switch.start()
+            logger.info(f"死人开关已启动: 超时{self.risk_config.get('dms_timeout', 60)}秒自动撤销全部挂单")
+
+        # 下单和查询改走 websocket post 通道，失败时自动回退到 HTTP
+        if self.risk_config.get("ws_post", False):
+            ws_manager = getattr(self.info, "ws_manager", None)
+            if ws_manager is None:
+                logger.warning("未启用websocket，ws_post配置无效，继续使用HTTP")
+            else:
+                self.exchange.enable_ws_post(ws_manager, self.risk_config.get("ws_post_timeout", 5))
+                self.info.enable_ws_post(ws_manager, self.risk_config.get("ws_post_timeout", 5))
+                logger.info("已启用websocket post通道下单")
+
+        # 账户状态：订阅webData2推送的持仓、余额和挂单，数据过期时才回退到REST查询
+        self.account_state = None
+        if self.risk_config.get("account_state_ws", False):
+            try:
+                self.account_state = AccountState(
+                    self.info, self.address, self.risk_config.get("account_state_max_staleness", 30)
+                )
+                self.account_state.start()
+                logger.info("已订阅webData2账户状态推送")
+            except Exception as e:
+                self.account_state = None
+                logger.warning(f"订阅webData2账户状态失败({e})，继续使用REST查询")
+
+        # 成交缓存：订阅userFills推送并按oid汇总成交均价，成交价格直接查表，查不到时回退到query_order_by_oid
+        self.fill_cache = None
+        if self.risk_config.get("fill_cache_ws", False):
+            try:
+                self.fill_cache = FillCache(self.info, self.address)
+                self.fill_cache.start(int(self.risk_config.get("fill_cache_backfill_seconds", 3600) * 1000))
+                logger.info(f"已订阅userFills成交推送，缓存 {len(self.fill_cache)} 个历史成交订单")
+            except Exception as e:
+                # 订阅成功但回补失败时取消订阅，不再让推送继续写入一个不会被使用的缓存
+                if self.fill_cache is not None:
+                    try:
+                        self.fill_cache.stop()
+                    except Exception as stop_error:
+                        logger.debug(f"取消userFills订阅失败: {stop_error}")
+                self.fill_cache = None
+                logger.warning(f"订阅userFills成交推送失败({e})，继续逐单查询成交价格")
+
+        # 批量成交处理从这个时间(毫秒)开始查询成交记录，每轮检查后推进到该轮获取挂单的时间
+        self._fills_since_ms = int(time.time() * 1000)
+
+    def local_cancel_requests(self):
+        """根据本地挂单记录生成撤单请求，无需查询交易所"""
+        orders = self.buy_orders + self.sell_orders + self.short_orders + self.short_cover_orders
+        return [{"coin": self.COIN, "oid": o['oid']} for o in orders]
+
+    def cancel_all_orders(self):
+        """紧急撤销所有挂单：优先发送预签名的撤单，失败时查询挂单后撤销"""
+        if self.dead_mans_switch is not None:
+            try:
+                result = self.dead_mans_switch.fire()
+                if result is not None and result.get("status") == "ok":
+                    logger.info(f"已通过预签名撤单撤销所有挂单: {result}")
+                    return
+                logger.warning(f"预签名撤单未成功({result})，改为查询挂单后撤销")
+            except Exception as e:
+                logger.error(f"预签名撤单异常: {e}，改为查询挂单后撤销")
+        open_orders = self.info.open_orders(self.address)
+        if open_orders:
+            cancel_requests = [{"coin": self.COIN, "oid": o['oid']} for o in open_orders]
+            self.exchange.bulk_cancel(cancel_requests)
+            logger.info("已撤销所有挂单。")
+
     def _start_ws_thread(self):
-        def ws_callback(data):
-            if isinstance(data, dict) and 'mid' in data:
-                try:
-                    self.ws_midprice = float(data['mid'])
-                except Exception:
-                    pass
-            elif isinstance(data, dict) and self.COIN in data:
-                try:
-                    self.ws_midprice = float(data[self.COIN])
-                except Exception:
-                    pass
+        def ws_callback(msg):
+            try:
+                mid = msg["data"]["mids"].get(self.COIN)
+                if mid is None:
+                    return
+                price = float(mid)
+            except Exception:
+                return
+            now = time.time()
+            self.ws_midprice = price
+            self._ws_mid_time = now
+            self._price_window.append(now, price)
         try:
-            sub = {"type": "mids", "coin": self.COIN}
-            self.info.subscribe(sub, ws_callback)
+            self.info.subscribe({"type": "allMids"}, ws_callback)
             logger.info(f"WebSocket 已订阅 {self.COIN} midprice 实时行情")
         except Exception as e:
             logger.warning(f"WebSocket 订阅 midprice 失败: {e}")
@@ -181,8 +272,15 @@ class GridTrading:
         """所有挂单价格都四舍五入为整数"""
         return int(round(price))
 
+    def _ws_mid_fresh(self):
+        """WebSocket行情在ws_mid_max_staleness秒内有推送时才可用；WebsocketManager不会重连，断线后价格会停在最后一笔"""
+        if getattr(self, 'ws_midprice', None) is None:
+            return False
+        max_staleness = getattr(self, 'risk_config', {}).get("ws_mid_max_staleness", 10)
+        return time.time() - self._ws_mid_time <= max_staleness
+
     def get_midprice(self):
-        if hasattr(self, 'ws_midprice') and self.ws_midprice is not None:
+        if self._ws_mid_fresh():
             return self.ws_midprice
         else:
             try:
@@ -198,6 +296,8 @@ class GridTrading:
 
     def get_position(self):
         try:
+            if self.account_state is not None:
+                return self.account_state.position(self.COIN)
             user_state = self.info.user_state(self.address)
             positions = user_state.get("assetPositions", [])
             for position in positions:
@@ -215,6 +315,12 @@ class GridTrading:
             logger.error(f"无效的midprice: {midprice}, 无法计算网格")
             return
 
+        # 自适应网格：按实时波动率确定网格区间，样本不足时沿用固定区间
+        if self.risk_config.get("adaptive_grid", False):
+            adaptive_range = self._adaptive_grid_range(midprice)
+            if adaptive_range is not None:
+                self.gridmin, self.gridmax = adaptive_range
+
         # 自动设置网格区间
         if self.gridmin is None or self.gridmax is None:
             # 使用grid_ratio参数，如果没有设置则使用默认值0.1
@@ -224,19 +330,7 @@ class GridTrading:
             self.gridmin = midprice - price_range
             logger.info(f"自动设置网格区间 gridmin={self.gridmin:.6f}, gridmax={self.gridmax:.6f}, grid_ratio={grid_ratio}")
         
-        # 使用更精确的网格价格计算
-        pricestep = (self.gridmax - self.gridmin) / self.gridnum
-        self.eachprice = []
-        
-        logger.info(f"计算网格价格: tick_size={self.tick_size}, 价格步长={pricestep}")
-        
-        for i in range(self.gridnum + 1):
-            # 计算原始价格
-            raw_price = self.gridmin + i * pricestep
-            # 四舍五入到tick_size
-            rounded_price = self.round_to_tick_size(raw_price)
-            self.eachprice.append(rounded_price)
-            logger.debug(f"网格 {i}: {raw_price} -> {rounded_price}")
+        self._calc_grid_prices()
 
         logger.info(f"Grid levels: {self.eachprice}")
         
@@ -256,6 +350,36 @@ class GridTrading:
                     self.place_order_with_retry(self.COIN, False, self.eachgridamount, price, {"limit": {"tif": "Gtc"}}, i, is_short_order=True)
 
 
+    def _calc_grid_prices(self):
+        """按gridmin/gridmax和网格数量计算等间距的网格价格"""
+        # 使用更精确的网格价格计算
+        pricestep = (self.gridmax - self.gridmin) / self.gridnum
+        self.eachprice = []
+        
+        logger.info(f"计算网格价格: tick_size={self.tick_size}, 价格步长={pricestep}")
+        
+        for i in range(self.gridnum + 1):
+            # 计算原始价格
+            raw_price = self.gridmin + i * pricestep
+            # 四舍五入到tick_size
+            rounded_price = self.round_to_tick_size(raw_price)
+            self.eachprice.append(rounded_price)
+            logger.debug(f"网格 {i}: {raw_price} -> {rounded_price}")
+
+    def _adaptive_grid_range(self, midprice):
+        """根据价格滚动标准差计算网格区间，返回(gridmin, gridmax)，样本不足时返回None"""
+        cfg = self.risk_config
+        self._price_window.evict(time.time())
+        if len(self._price_window) < cfg.get("adaptive_min_samples", 30):
+            logger.info(f"[自适应网格] 价格样本不足({len(self._price_window)})，沿用当前网格区间")
+            return None
+        half_range = self._price_window.stdev() * cfg.get("adaptive_range_mult", 4.0)
+        min_half = midprice * cfg.get("adaptive_min_ratio", 0.01)
+        max_half = midprice * cfg.get("adaptive_max_ratio", 0.2)
+        half_range = min(max(half_range, min_half), max_half)
+        logger.info(f"[自适应网格] 波动率stdev={self._price_window.stdev():.6f}, 网格半宽={half_range:.6f}, 步长={2 * half_range / self.gridnum:.6f}")
+        return midprice - half_range, midprice + half_range
+
     def _find_price_in_order(self, order_dict):
         """递归查找avgPx或limitPx，优先自身查找，再递归'order'字段，再递归所有value，兼容所有主流API结构，支持嵌套dict和list"""
         if isinstance(order_dict, dict):
@@ -289,152 +413,46 @@ class GridTrading:
 
     def check_orders(self):
         if not hasattr(self, '_last_check_time'):
-            self._last_check_time = 0
+            self._last_check_time = 0.0
         current_time = time.time()
         if current_time - self._last_check_time < 5:
             return
         self._last_check_time = current_time
+        snapshot_ms = int(current_time * 1000)
         try:
             open_orders_map = {o['oid']: o for o in self.info.open_orders(self.address)}
         except Exception as e:
             logger.warning(f"获取挂单失败: {e}")
             return
-        # 检查做多网格的买单
-        if self.enable_long_grid:
-            active_buy_oids = {o['oid'] for o in self.buy_orders}
-            filled_buy_oids = active_buy_oids - set(open_orders_map.keys())
-            for oid in filled_buy_oids:
-                buy_order_meta = next((o for o in self.buy_orders if o['oid'] == oid), None)
-                if not buy_order_meta: continue
+        # 成交处理分三步：先收集全部已成交订单，再一次性获取成交价格，最后计算补单并统一提交。
+        # 补单在收集完成后才下，本轮新挂的订单不会因为不在挂单列表中而被误判为已成交
+        filled: List[Tuple[str, int, Dict[str, Any]]] = []  # (订单类型, oid, 订单记录)
+        for kind, orders, enabled in (
+            ("buy", self.buy_orders, self.enable_long_grid),
+            ("short", self.short_orders, self.enable_short_grid),
+            ("sell", self.sell_orders, True),
+            ("cover", self.short_cover_orders, self.enable_short_grid),
+        ):
+            if enabled:
+                filled.extend((kind, o['oid'], o) for o in orders if o['oid'] not in open_orders_map)
+        if filled:
+            fill_prices = self._fetch_fill_prices([oid for _, oid, _ in filled])
+            replacements = []
+            for kind, oid, meta in filled:
                 try:
-                    fill_info = self.info.query_order_by_oid(self.address, oid)
-                    # 递归查找成交价格
-                    buy_price = self._find_price_in_order(fill_info)
-                    if buy_price is None:
-                        logger.error(f"买单 {oid} 无法确定成交价格，跳过此订单。 Fill info: {fill_info}")
-                        continue
-                    logger.info(f"🎯 检测到买单成交: oid={oid}, 价格={buy_price}")
-                    # 经典循环网格：买单成交，挂出卖单平仓；卖单成交，挂出买单开仓
-                    # 在买单成交价之上增加一个固定的止盈价差来挂卖单
-                    sell_price = self.round_to_tick_size(buy_price * (1 + self.tp))
-                    logger.info(f"【下单决策】买单 {oid} 成交于 {buy_price}。")
-                    logger.info(f"【下单决策】根据止盈率 {self.tp}，计算目标卖价: {buy_price} * (1 + {self.tp}) = {buy_price * (1 + self.tp)}")
-                    logger.info(f"【下单决策】四舍五入后，最终止盈卖价为: {sell_price}")
-                    if sell_price <= buy_price:
-                        original_sell_price = sell_price
-                        sell_price = self.round_to_tick_size(buy_price + self.tick_size)
-                        logger.error(f"【严重警告】计算出的卖价({original_sell_price}) <= 买价({buy_price})。")
-                        logger.error(f"为防止亏损，已强制将卖价调整为 {sell_price} (买价 + 一个tick_size)。")
-                    logger.info(f"准备挂出平仓卖单: 价格={sell_price}, 数量={self.eachgridamount}")
-                    self.place_order_with_retry(self.COIN, False, self.eachgridamount, sell_price, {"limit": {"tif": "Gtc"}, "reduceOnly": True}, buy_order_meta['index'])
-                    self.buy_orders = [o for o in self.buy_orders if o['oid'] != oid]
+                    order = self._replacement_order(kind, oid, meta, fill_prices.get(oid))
+                    if order is not None:
+                        replacements.append(order)
                 except Exception as e:
-                    logger.error(f"处理买单 {oid} 成交时异常: {e}")
-
-        # 检查做空网格的开仓单
-        if self.enable_short_grid:
-            active_short_oids = {o['oid'] for o in self.short_orders}
-            filled_short_oids = active_short_oids - set(open_orders_map.keys())
-            for oid in filled_short_oids:
-                short_order_meta = next((o for o in self.short_orders if o['oid'] == oid), None)
-                if not short_order_meta: continue
-
-                try:
-                    fill_info = self.info.query_order_by_oid(self.address, oid)
-                    # 递归查找成交价格
-                    short_price = self._find_price_in_order(fill_info)
-                    if short_price is None:
-                        logger.error(f"做空单 {oid} 无法确定成交价格，跳过此订单。 Fill info: {fill_info}")
-                        continue
-                    logger.info(f"🎯 检测到做空单成交: oid={oid}, 价格={short_price}")
-
-                    # 移除已成交做空单
-                    self.short_orders = [o for o in self.short_orders if o['oid'] != oid]
-
-                    # 挂一个止盈平仓买单
-                    cover_price = self.round_to_tick_size(short_price * (1 - self.tp))
-                    logger.info(f"做空单成交，挂平仓买单: 价格={cover_price}, 数量={self.eachgridamount}")
-                    self.place_order_with_retry(self.COIN, True, self.eachgridamount, cover_price, {"limit": {"tif": "Gtc"}}, short_order_meta['index'], reduce_only=True)
-
-                    # 【修复核心】补充：如果该做空单是补挂的（即由平空单成交后补挂），也要在此处挂出对应的平仓买单
-                    # 只要是short_orders列表里的单子，无论初始还是补挂，成交后都要补买单
+                    logger.error(f"处理{ORDER_KIND_NAMES[kind]} {oid} 成交时异常: {e}")
+            self._place_orders(replacements)
+        # 本轮挂单快照之后的成交才会在下一轮被识别
+        self._fills_since_ms = snapshot_ms
 
-                except Exception as e:
-                    logger.error(f"处理做空单 {oid} 成交时异常: {e}")
-
-        # 检查所有卖单（包括做多网格的平仓单和做空网格的开仓单）
-        active_sell_oids = {o['oid'] for o in self.sell_orders}
-        filled_sell_oids = active_sell_oids - set(open_orders_map.keys())
-        for oid in filled_sell_oids:
-            sell_order_meta = next((o for o in self.sell_orders if o['oid'] == oid), None)
-            if not sell_order_meta: continue
-
-            try:
-                fill_info = self.info.query_order_by_oid(self.address, oid)
-                # 递归查找成交价格，兼容所有结构
-                sell_price = self._find_price_in_order(fill_info)
-                if sell_price is None:
-                    logger.error(f"卖单 {oid} 无法确定成交价格，跳过此订单。 Fill info: {fill_info}")
-                    continue
-                logger.info(f"🎯 检测到卖单成交: oid={oid}, 价格={sell_price}")
-
-                # 移除已成交卖单
-                self.sell_orders = [o for o in self.sell_orders if o['oid'] != oid]
-
-                # 根据网格模式决定下一步操作
-                if self.enable_long_grid:
-                    # 在只做多模式下，卖单是平仓单，成交意味着盈利。
-                    # 我们需要在其下方重新挂一个买单，以维持网格密度。
-                    buy_price = self.round_to_tick_size(sell_price / (1 + self.tp))
-                    if buy_price >= sell_price:
-                        original_buy_price = buy_price
-                        buy_price = self.round_to_tick_size(sell_price - self.tick_size)
-                        logger.error(f"【严重警告】为卖单 {oid} 计算出的新买价({original_buy_price}) >= 卖价({sell_price})。")
-                        logger.error(f"为防止亏损，已强制将买价调整为 {buy_price} (卖价 - 一个tick_size)。")
-                    # 新增保护：市价<=买单价时跳过补单
-                    if not self.should_place_long_order(buy_price):
-                        logger.warning(f"市价{self.get_midprice()}<=补买单价{buy_price}，跳过补单，防止刷单。")
-                        continue
-                    logger.info(f"卖单成交，重新挂买单: 价格={buy_price}, 数量={self.eachgridamount}")
-                    self.place_order_with_retry(self.COIN, True, self.eachgridamount, buy_price, {"limit": {"tif": "Gtc"}}, sell_order_meta['index'])
-                # 注意：做空网格的开仓单现在在单独的处理逻辑中，这里不再处理
-            except Exception as e:
-                logger.error(f"处理卖单 {oid} 成交时异常: {e}")
-
-        # 检查做空网格的平仓单（cover a short）
-        if self.enable_short_grid:
-            active_cover_oids = {o['oid'] for o in self.short_cover_orders}
-            filled_cover_oids = active_cover_oids - set(open_orders_map.keys())
-            for oid in filled_cover_oids:
-                cover_order_meta = next((o for o in self.short_cover_orders if o['oid'] == oid), None)
-                if not cover_order_meta: continue
-
-                try:
-                    fill_info = self.info.query_order_by_oid(self.address, oid)
-                    # 递归查找成交价格（直接传入fill_info，支持多层嵌套）
-                    cover_price = self._find_price_in_order(fill_info)
-                    if cover_price is None:
-                        logger.error(f"平空单 {oid} 无法确定成交价格，跳过此订单。 Fill info: {fill_info}")
-                        continue
-                    logger.info(f"🎯 检测到平空单成交: oid={oid}, 价格={cover_price}")
-
-                    # 移除已成交平仓单
-                    self.short_cover_orders = [o for o in self.short_cover_orders if o['oid'] != oid]
-                    # 重新挂一个做空单
-                    short_price = self.round_to_tick_size(cover_price / (1 - self.tp))
-                    # 新增保护：市价>=补卖单价时跳过补单
-                    if not self.should_place_short_order(short_price):
-                        logger.warning(f"市价{self.get_midprice()}>=补卖单价{short_price}，跳过补单，防止刷单。")
-                        continue
-                    logger.info(f"平空单成交，重新挂做空单: 价格={short_price}, 数量={self.eachgridamount}")
-                    self.place_order_with_retry(self.COIN, False, self.eachgridamount, short_price, {"limit": {"tif": "Gtc"}}, cover_order_meta['index'])
-                except Exception as e:
-                    logger.error(f"处理平空单 {oid} 成交时异常: {e}")
-                    
         # --- 自动补单闭环：仓位归零且无挂单时自动补挂做空单（加冷却和标志位防止重复） ---
         if self.enable_short_grid:
             if not hasattr(self, '_last_replenish_time'):
-                self._last_replenish_time = 0
+                self._last_replenish_time = 0.0
             if not hasattr(self, '_is_replenishing'):
                 self._is_replenishing = False
             pos = self.get_position()
@@ -454,7 +472,7 @@ class GridTrading:
         # --- 新增：做多网格的仓位归零自动补单闭环 ---
         if self.enable_long_grid:
             if not hasattr(self, '_last_long_replenish_time'):
-                self._last_long_replenish_time = 0
+                self._last_long_replenish_time = 0.0
             if not hasattr(self, '_is_long_replenishing'):
                 self._is_long_replenishing = False
             pos = self.get_position()
@@ -471,44 +489,236 @@ class GridTrading:
                 else:
                     logger.info(f"[自动补单] 做多冷却中，{int(60 - (now - self._last_long_replenish_time))}秒后可再次补单。")
 
+    def _fetch_fill_prices(self, oids):
+        """获取已成交订单的成交价格，返回 {oid: 价格}，无法确定价格的为None。
+        优先使用成交缓存中的成交均价；开启batch_fill_handling时用一次成交记录查询按订单汇总均价；其余订单逐个查询"""
+        def lookup(oid):
+            try:
+                fill_info = self.info.query_order_by_oid(self.address, oid)
+            except Exception as e:
+                logger.error(f"查询订单 {oid} 成交信息失败: {e}")
+                return None
+            # 递归查找成交价格，兼容所有结构
+            price = self._find_price_in_order(fill_info)
+            if price is None:
+                logger.error(f"订单 {oid} 无法确定成交价格，跳过此订单。 Fill info: {fill_info}")
+            return price
+
+        prices = {}
+        if self.fill_cache is not None:
+            for oid in oids:
+                order_fills = self.fill_cache.get(oid)
+                # 成交推送可能晚于挂单查询到达，累计成交量不足一格时视为未知，改走REST查询
+                if order_fills is not None and order_fills.size >= self.eachgridamount * (1 - 1e-9):
+                    prices[oid] = order_fills.vwap
+            oids = [oid for oid in oids if oid not in prices]
+        if self.risk_config.get("batch_fill_handling", False) and len(oids) > 1:
+            prices.update(self._recent_fill_vwaps(oids))
+            oids = [oid for oid in oids if oid not in prices]
+        prices.update((oid, lookup(oid)) for oid in oids)
+        return prices
+
+    def _recent_fill_vwaps(self, oids):
+        """一次查询上一轮检查以来的全部成交，按oid汇总成交均价，只返回累计成交满一格的订单"""
+        wanted = set(oids)
+        sizes: Dict[int, float] = defaultdict(float)
+        notionals: Dict[int, float] = defaultdict(float)
+        try:
+            for fill in self.info.iter_user_fills_by_time(self.address, self._fills_since_ms):
+                oid = fill["oid"]
+                if oid in wanted:
+                    sz = float(fill["sz"])
+                    sizes[oid] += sz
+                    notionals[oid] += float(fill["px"]) * sz
+        except Exception as e:
+            logger.error(f"查询成交记录失败: {e}，改为逐个查询订单")
+            return {}
+        # 部分成交发生在上一轮之前的订单汇总不全，交给逐个查询
+        return {oid: notionals[oid] / sz for oid, sz in sizes.items() if sz >= self.eachgridamount * (1 - 1e-9)}
+
+    def _replacement_order(self, kind, oid, meta, fill_price):
+        """根据成交订单计算补单，返回待提交的订单，无需补单或价格未知时返回None"""
+        if fill_price is None:
+            # 价格未知时保留该订单，下一轮重新检查
+            return None
+        if kind == "buy":
+            buy_price = fill_price
+            logger.info(f"🎯 检测到买单成交: oid={oid}, 价格={buy_price}")
+            self.buy_orders = [o for o in self.buy_orders if o['oid'] != oid]
+            # 经典循环网格：买单成交，挂出卖单平仓；卖单成交，挂出买单开仓
+            # 在买单成交价之上增加一个固定的止盈价差来挂卖单
+            sell_price = self.round_to_tick_size(buy_price * (1 + self.tp))
+            logger.info(f"【下单决策】买单 {oid} 成交于 {buy_price}。")
+            logger.info(f"【下单决策】根据止盈率 {self.tp}，计算目标卖价: {buy_price} * (1 + {self.tp}) = {buy_price * (1 + self.tp)}")
+            logger.info(f"【下单决策】四舍五入后，最终止盈卖价为: {sell_price}")
+            if sell_price <= buy_price:
+                original_sell_price = sell_price
+                sell_price = self.round_to_tick_size(buy_price + self.tick_size)
+                logger.error(f"【严重警告】计算出的卖价({original_sell_price}) <= 买价({buy_price})。")
+                logger.error(f"为防止亏损，已强制将卖价调整为 {sell_price} (买价 + 一个tick_size)。")
+            logger.info(f"准备挂出平仓卖单: 价格={sell_price}, 数量={self.eachgridamount}")
+            return self._order_spec(False, sell_price, {"limit": {"tif": "Gtc"}, "reduceOnly": True}, meta['index'])
+        if kind == "short":
+            short_price = fill_price
+            logger.info(f"🎯 检测到做空单成交: oid={oid}, 价格={short_price}")
+            # 移除已成交做空单
+            self.short_orders = [o for o in self.short_orders if o['oid'] != oid]
+            # 挂一个止盈平仓买单；无论初始还是补挂的做空单，成交后都要补买单
+            cover_price = self.round_to_tick_size(short_price * (1 - self.tp))
+            logger.info(f"做空单成交，挂平仓买单: 价格={cover_price}, 数量={self.eachgridamount}")
+            return self._order_spec(True, cover_price, {"limit": {"tif": "Gtc"}}, meta['index'], reduce_only=True)
+        if kind == "sell":
+            sell_price = fill_price
+            logger.info(f"🎯 检测到卖单成交: oid={oid}, 价格={sell_price}")
+            # 移除已成交卖单
+            self.sell_orders = [o for o in self.sell_orders if o['oid'] != oid]
+            # 做空网格的开仓单在单独的处理逻辑中，这里只处理做多网格的平仓单
+            if not self.enable_long_grid:
+                return None
+            # 在只做多模式下，卖单是平仓单，成交意味着盈利。
+            # 我们需要在其下方重新挂一个买单，以维持网格密度。
+            buy_price = self.round_to_tick_size(sell_price / (1 + self.tp))
+            if buy_price >= sell_price:
+                original_buy_price = buy_price
+                buy_price = self.round_to_tick_size(sell_price - self.tick_size)
+                logger.error(f"【严重警告】为卖单 {oid} 计算出的新买价({original_buy_price}) >= 卖价({sell_price})。")
+                logger.error(f"为防止亏损，已强制将买价调整为 {buy_price} (卖价 - 一个tick_size)。")
+            # 新增保护：市价<=买单价时跳过补单
+            if not self.should_place_long_order(buy_price):
+                logger.warning(f"市价{self.get_midprice()}<=补买单价{buy_price}，跳过补单，防止刷单。")
+                return None
+            logger.info(f"卖单成交，重新挂买单: 价格={buy_price}, 数量={self.eachgridamount}")
+            return self._order_spec(True, buy_price, {"limit": {"tif": "Gtc"}}, meta['index'])
+        cover_price = fill_price
+        logger.info(f"🎯 检测到平空单成交: oid={oid}, 价格={cover_price}")
+        # 移除已成交平仓单
+        self.short_cover_orders = [o for o in self.short_cover_orders if o['oid'] != oid]
+        # 重新挂一个做空单
+        short_price = self.round_to_tick_size(cover_price / (1 - self.tp))
+        # 新增保护：市价>=补卖单价时跳过补单
+        if not self.should_place_short_order(short_price):
+            logger.warning(f"市价{self.get_midprice()}>=补卖单价{short_price}，跳过补单，防止刷单。")
+            return None
+        logger.info(f"平空单成交，重新挂做空单: 价格={short_price}, 数量={self.eachgridamount}")
+        return self._order_spec(False, short_price, {"limit": {"tif": "Gtc"}}, meta['index'])
+
+    def _order_spec(self, is_buy, px, order_type, grid_index, reduce_only=False, is_short_order=False):
+        return {"coin": self.COIN, "is_buy": is_buy, "sz": self.eachgridamount, "limit_px": float(px), "order_type": order_type,
+                "reduce_only": reduce_only, "grid_index": grid_index, "is_short_order": is_short_order}
+
+    def _place_orders(self, orders):
+        """提交补单：开启batch_fill_handling且有多个补单时合并为一次bulk_orders请求，否则逐个下单"""
+        if len(orders) < 2 or not self.risk_config.get("batch_fill_handling", False):
+            for o in orders:
+                self.place_order_with_retry(o["coin"], o["is_buy"], o["sz"], o["limit_px"], o["order_type"], o["grid_index"], o["reduce_only"], o["is_short_order"])
+            return
+        logger.info(f"[批量下单请求] 共 {len(orders)} 个补单: {[(o['is_buy'], o['limit_px'], o['grid_index']) for o in orders]}")
+        cloids = [Cloid.from_int(random.getrandbits(128)) for _ in orders]
+        try:
+            order_result = self.exchange.bulk_orders([
+                {"coin": o["coin"], "is_buy": o["is_buy"], "sz": o["sz"], "limit_px": o["limit_px"],
+                 "order_type": o["order_type"], "reduce_only": o["reduce_only"], "cloid": cloid}
+                for o, cloid in zip(orders, cloids)
+            ])
+        except WsPostOutcomeUnknownError as e:
+            logger.warning(f"[批量下单结果未知] {e.message}，逐个查询订单状态后再决定是否重下")
+            for o, cloid in zip(orders, cloids):
+                self._log_order_request(o)
+                self._resolve_unknown_order(cloid, o)
+            return
+        except Exception as e:
+            logger.error(f"[批量下单异常] 发生异常: {e}，全部加入重试列表")
+            for o in orders:
+                self._queue_pending_order(o)
+            return
+        logger.info(f"[批量下单响应] 结果: {order_result}")
+        statuses = order_result["response"]["data"].get("statuses", []) if order_result.get("status") == "ok" else []
+        for i, o in enumerate(orders):
+            # 每个订单的结果前补一行单笔下单请求，日志分析按请求和结果配对
+            self._log_order_request(o)
+            if i < len(statuses):
+                self._register_order_status(statuses[i], o)
+            else:
+                logger.error(f"[批量下单失败] 订单 {o['limit_px']} 无返回状态，将加入重试列表")
+                self._queue_pending_order(o)
+
+    def _log_order_request(self, order):
+        logger.info(f"[下单请求] 币种: {order['coin']}, {'买' if order['is_buy'] else '卖'}, 数量: {order['sz']}, 价格: {order['limit_px']}, reduceOnly: {order['reduce_only']}, 网格序号: {order['grid_index']}")
+
+    def _register_order_status(self, status, order):
+        """根据交易所返回的单个订单状态登记挂单；直接成交只记录日志，其他状态加入重试列表"""
+        px, sz, grid_index, reduce_only = order["limit_px"], order["sz"], order["grid_index"], order["reduce_only"]
+        if "resting" in status:
+            oid = status["resting"]["oid"]
+            logger.info(f"[下单成功] oid: {oid}, 价格: {px}, 数量: {sz}, reduceOnly: {reduce_only}, 网格序号: {grid_index}")
+            if order["is_buy"] and not reduce_only:
+                self.buy_orders.append({"index": grid_index, "oid": oid, "px": px})
+            elif order["is_buy"] and reduce_only:
+                self.short_cover_orders.append({"index": grid_index, "oid": oid, "px": px})
+            elif not order["is_buy"] and order["is_short_order"]:
+                self.short_orders.append({"index": grid_index, "oid": oid, "px": px})
+            else:
+                self.sell_orders.append({"index": grid_index, "oid": oid, "px": px, "is_tp": reduce_only})
+        elif "filled" in status:
+            filled_info = status["filled"]
+            logger.info(f"[下单直接成交] oid: {filled_info.get('oid')}, 价格: {filled_info.get('avgPx')}, 数量: {filled_info.get('totalSz')}, reduceOnly: {reduce_only}, 网格序号: {grid_index}")
+        else:
+            logger.warning(f"[下单异常] 状态异常，将加入重试列表: {status}")
+            self._queue_pending_order(order)
+
+    def _queue_pending_order(self, order):
+        self.pending_orders_to_place.append({"coin": order["coin"], "is_buy": order["is_buy"], "sz": float(order["sz"]), "limit_px": float(order["limit_px"]), "order_type": order["order_type"], "original_index": order["grid_index"], "reduce_only": order["reduce_only"]})
+
     def place_order_with_retry(self, coin, is_buy, sz, px, order_type, grid_index=None, reduce_only=False, is_short_order=False):
         """带重试逻辑的下单函数，处理429限流"""
         max_retries = 5
-        logger.info(f"[下单请求] 币种: {coin}, {'买' if is_buy else '卖'}, 数量: {sz}, 价格: {px}, reduceOnly: {reduce_only}, 网格序号: {grid_index}")
+        order = {"coin": coin, "is_buy": is_buy, "sz": sz, "limit_px": px, "order_type": order_type,
+                 "reduce_only": reduce_only, "grid_index": grid_index, "is_short_order": is_short_order}
+        self._log_order_request(order)
+        # 带上cloid，请求结果未知时可以按cloid查询订单是否已经下成功
+        cloid = Cloid.from_int(random.getrandbits(128))
         try:
             px = float(px)
-            order_result = self.exchange.order(coin, is_buy, sz, px, order_type, reduce_only=reduce_only)
+            order["limit_px"] = px
+            order_result = self.exchange.order(coin, is_buy, sz, px, order_type, reduce_only=reduce_only, cloid=cloid)
             logger.info(f"[下单响应] 结果: {order_result}")
             if order_result.get("status") == "ok":
                 statuses = order_result["response"]["data"].get("statuses", [])
                 if statuses:
-                    if "resting" in statuses[0]:
-                        oid = statuses[0]["resting"]["oid"]
-                        logger.info(f"[下单成功] oid: {oid}, 价格: {px}, 数量: {sz}, reduceOnly: {reduce_only}, 网格序号: {grid_index}")
-                        if is_buy and not reduce_only:
-                            self.buy_orders.append({"index": grid_index, "oid": oid})
-                        elif is_buy and reduce_only:
-                            self.short_cover_orders.append({"index": grid_index, "oid": oid})
-                        elif not is_buy and is_short_order:
-                            self.short_orders.append({"index": grid_index, "oid": oid})
-                        elif not is_buy and not is_short_order:
-                            self.sell_orders.append({"index": grid_index, "oid": oid, "is_tp": reduce_only})
-                    elif "filled" in statuses[0]:
-                        filled_info = statuses[0]["filled"]
-                        logger.info(f"[下单直接成交] oid: {filled_info.get('oid')}, 价格: {filled_info.get('avgPx')}, 数量: {filled_info.get('totalSz')}, reduceOnly: {reduce_only}, 网格序号: {grid_index}")
-                        return
-                    else:
-                        logger.warning(f"[下单异常] 状态异常，将加入重试列表: {statuses}")
-                        self.pending_orders_to_place.append({"coin": coin, "is_buy": is_buy, "sz": float(sz), "limit_px": float(px), "order_type": order_type, "original_index": grid_index, "reduce_only": reduce_only})
+                    self._register_order_status(statuses[0], order)
                 else:
                     logger.warning(f"[下单异常] 状态异常，将加入重试列表: {statuses}")
-                    self.pending_orders_to_place.append({"coin": coin, "is_buy": is_buy, "sz": float(sz), "limit_px": float(px), "order_type": order_type, "original_index": grid_index, "reduce_only": reduce_only})
+                    self._queue_pending_order(order)
             else:
                 logger.error(f"[下单失败] 结果: {order_result}，将加入重试列表")
-                self.pending_orders_to_place.append({"coin": coin, "is_buy": is_buy, "sz": float(sz), "limit_px": float(px), "order_type": order_type, "original_index": grid_index, "reduce_only": reduce_only})
+                self._queue_pending_order(order)
+        except WsPostOutcomeUnknownError as e:
+            logger.warning(f"[下单结果未知] {e.message}，查询订单状态后再决定是否重下")
+            self._resolve_unknown_order(cloid, order)
         except Exception as e:
             logger.error(f"[下单异常] 发生异常: {e}，将加入重试列表")
-            self.pending_orders_to_place.append({"coin": coin, "is_buy": is_buy, "sz": float(sz), "limit_px": float(px), "order_type": order_type, "original_index": grid_index, "reduce_only": reduce_only})
+            self._queue_pending_order(order)
+
+    def _resolve_unknown_order(self, cloid, order):
+        """下单请求已发出但没有收到响应：按cloid查询订单，已下单则登记，确认交易所没有这个订单才加入重试列表"""
+        try:
+            result = self.info.query_order_by_cloid(self.address, cloid)
+        except Exception as e:
+            logger.error(f"[下单结果未知] 查询订单状态失败: {e}，不再重下，等待再平衡补齐网格")
+            return
+        if result.get("status") != "order":
+            logger.info(f"[下单结果未知] 交易所没有该订单，将加入重试列表: {result}")
+            self._queue_pending_order(order)
+            return
+        placed = result["order"]
+        oid = placed["order"]["oid"]
+        if placed["status"] == "open":
+            self._register_order_status({"resting": {"oid": oid}}, order)
+        elif placed["status"] == "filled":
+            # 订单状态里没有成交均价，限价单的成交价不差于限价
+            self._register_order_status({"filled": {"oid": oid, "avgPx": placed["order"]["limitPx"], "totalSz": placed["order"]["origSz"]}}, order)
+        else:
+            logger.warning(f"[下单结果未知] 订单已到达交易所，状态为{placed['status']}，不再重下: oid={oid}")
 
     def _retry_pending_orders(self):
         if not self.pending_orders_to_place:
@@ -527,6 +737,8 @@ class GridTrading:
     def get_balance(self):
         """获取账户USDC余额，简化实现，实际可根据币种调整"""
         try:
+            if self.account_state is not None:
+                return self.account_state.spot_balance("USDC")
             user_state = self.info.user_state(self.address)
             for asset in user_state.get("spotBalances", []):
                 if asset["coin"] == "USDC":
@@ -546,7 +758,23 @@ class GridTrading:
             "min_balance_factor": 1.2,
             "min_order_ratio": 0.8,
             "volatility_window": 60,
-            "volatility_threshold": 0.01
+            "volatility_threshold": 0.01,
+            "ws_mid_max_staleness": 10,
+            "adaptive_grid": False,
+            "adaptive_range_mult": 4.0,
+            "adaptive_min_ratio": 0.01,
+            "adaptive_max_ratio": 0.2,
+            "adaptive_min_samples": 30,
+            "dead_mans_switch": False,
+            "dms_timeout": 60,
+            "dms_refresh_interval": 20,
+            "ws_post": False,
+            "ws_post_timeout": 5,
+            "account_state_ws": False,
+            "account_state_max_staleness": 30,
+            "batch_fill_handling": False,
+            "fill_cache_ws": False,
+            "fill_cache_backfill_seconds": 3600
         }
         try:
             with open(config_path, "r") as f:
@@ -555,8 +783,10 @@ class GridTrading:
             logger.info(f"已加载风控配置: {self.risk_config}")
         except Exception as e:
             logger.warning(f"未找到或加载风控配置失败({e})，使用默认风控参数")
+        self._price_window.window_seconds = self.risk_config.get("volatility_window", 60)
 
-    def pre_rebalance_risk_check(self):
+    def pre_rebalance_risk_check(self, block_on_volatility=True):
+        """再平衡前的风控检查。自适应再平衡传入block_on_volatility=False：剧烈波动正是它要调整网格的场景"""
         cfg = self.risk_config
         # 1. 持仓风险
         pos = self.get_position()
@@ -572,7 +802,10 @@ class GridTrading:
             return False
         # 3. 挂单风险
         try:
-            open_orders = self.info.open_orders(self.address)
+            if self.account_state is not None:
+                open_orders = self.account_state.open_orders()
+            else:
+                open_orders = self.info.open_orders(self.address)
         except Exception as e:
             logger.warning(f"[风控] 查询挂单异常: {e}")
             return False
@@ -586,8 +819,10 @@ class GridTrading:
             return False
         # 5. 极端行情风险
         if self.is_extreme_volatility(cfg.get("volatility_window", 60), cfg.get("volatility_threshold", 0.01)):
-            logger.warning(f"[风控] 检测到极端行情，暂停再平衡")
-            return False
+            if block_on_volatility:
+                logger.warning(f"[风控] 检测到极端行情，暂停再平衡")
+                return False
+            logger.info("[风控] 检测到极端行情，自适应再平衡将按当前波动率放宽网格")
         return True
 
     def is_extreme_volatility(self, window=None, threshold=None):
@@ -595,25 +830,103 @@ class GridTrading:
         cfg = self.risk_config
         window = window if window is not None else cfg.get("volatility_window", 60)
         threshold = threshold if threshold is not None else cfg.get("volatility_threshold", 0.01)
-        if not hasattr(self, '_price_history'):
-            self._price_history = []
         now = time.time()
-        mid = self.get_midprice()
-        self._price_history.append((now, mid))
-        self._price_history = [(t, p) for t, p in self._price_history if now - t <= window]
-        if len(self._price_history) < 2:
-            return False
-        prices = [p for t, p in self._price_history]
-        min_p, max_p = min(prices), max(prices)
-        if min_p > 0 and (max_p - min_p) / min_p > threshold:
-            return True
-        return False
+        if not self._ws_mid_fresh():
+            # 没有WebSocket行情或行情已过期时退化为在风控检查时采样
+            mid = self.get_midprice()
+            if mid:
+                self._price_window.append(now, mid)
+        self._price_window.window_seconds = window
+        self._price_window.evict(now)
+        return self._price_window.range_ratio() > threshold
+
+    def adaptive_rebalance(self):
+        """自适应再平衡：按当前波动率重算网格，通过改单把现有开仓单移动到新网格价，不撤销全部挂单
+
+        止盈/平仓单保持不动；新价格会立即成交的开仓单撤销；空出的网格位补挂新单。
+        """
+        midprice = self.get_midprice()
+        if not midprice or midprice <= 0:
+            logger.error(f"[自适应再平衡] 无效的midprice: {midprice}")
+            return
+        adaptive_range = self._adaptive_grid_range(midprice)
+        if adaptive_range is None:
+            return
+        self.gridmin, self.gridmax = adaptive_range
+        self._calc_grid_prices()
+        logger.info(f"[自适应再平衡] 新网格价格: {self.eachprice}")
+
+        grids = []
+        if self.enable_long_grid:
+            grids.append((self.buy_orders, self.sell_orders, True))
+        if self.enable_short_grid:
+            grids.append((self.short_orders, self.short_cover_orders, False))
+        for open_orders, exit_orders, is_buy in grids:
+            modifies, cancels = [], []
+            for order in open_orders:
+                new_px = self.eachprice[order['index']]
+                crosses = new_px >= midprice if is_buy else new_px <= midprice
+                if crosses:
+                    cancels.append(order)
+                elif new_px != order.get('px'):
+                    modifies.append((order, new_px))
+
+            if modifies:
+                modify_requests = [{
+                    "oid": order['oid'],
+                    "order": {
+                        "coin": self.COIN,
+                        "is_buy": is_buy,
+                        "sz": self.eachgridamount,
+                        "limit_px": float(new_px),
+                        "order_type": {"limit": {"tif": "Gtc"}},
+                        "reduce_only": False,
+                    },
+                } for order, new_px in modifies]
+                try:
+                    result = self.exchange.bulk_modify_orders_new(modify_requests)
+                    logger.info(f"[自适应再平衡] 改单 {len(modify_requests)} 个, 结果: {result}")
+                    statuses = result["response"]["data"]["statuses"] if result.get("status") == "ok" else []
+                    for (order, new_px), status in zip(modifies, statuses):
+                        # 改单会生成新的oid；已成交的单也更新oid，交给check_orders处理
+                        new_state = None
+                        if isinstance(status, dict):
+                            new_state = status.get("resting") or status.get("filled")
+                        if new_state:
+                            order['oid'] = new_state['oid']
+                            order['px'] = new_px
+                        else:
+                            logger.warning(f"[自适应再平衡] 改单失败 oid={order['oid']}: {status}")
+                except Exception as e:
+                    logger.error(f"[自适应再平衡] 批量改单异常: {e}")
+
+            if cancels:
+                try:
+                    self.exchange.bulk_cancel([{"coin": self.COIN, "oid": o['oid']} for o in cancels])
+                    cancelled = {o['oid'] for o in cancels}
+                    open_orders[:] = [o for o in open_orders if o['oid'] not in cancelled]
+                    logger.info(f"[自适应再平衡] 撤销穿价开仓单 {len(cancels)} 个")
+                except Exception as e:
+                    logger.error(f"[自适应再平衡] 撤单异常: {e}")
+
+            occupied = {o['index'] for o in open_orders} | {o['index'] for o in exit_orders}
+            for i, price in enumerate(self.eachprice):
+                if i in occupied:
+                    continue
+                if is_buy and price < midprice:
+                    self.place_order_with_retry(self.COIN, True, self.eachgridamount, price, {"limit": {"tif": "Gtc"}}, i)
+                elif not is_buy and price > midprice:
+                    self.place_order_with_retry(self.COIN, False, self.eachgridamount, price, {"limit": {"tif": "Gtc"}}, i, is_short_order=True)
 
     def rebalance(self):
         """定时再平衡：撤销所有挂单，清空本地挂单状态，重新计算网格并挂单"""
-        if not self.pre_rebalance_risk_check():
+        adaptive = self.risk_config.get("adaptive_grid", False)
+        if not self.pre_rebalance_risk_check(block_on_volatility=not adaptive):
             logger.warning("[再平衡] 风控不通过，跳过本次再平衡")
             return
+        if adaptive:
+            self.adaptive_rebalance()
+            return
         logger.info("[再平衡] 开始撤销所有未成交挂单...")
         try:
             open_orders = self.info.open_orders(self.address)
@@ -655,13 +968,12 @@ class GridTrading:
             except KeyboardInterrupt:
                 logger.info("🛑 用户中断，正在安全退出...")
                 try:
-                    open_orders = self.info.open_orders(self.address)
-                    if open_orders:
-                        cancel_requests = [{"coin": self.COIN, "oid": o['oid']} for o in open_orders]
-                        self.exchange.bulk_cancel(cancel_requests)
-                        logger.info("已撤销所有挂单。")
+                    self.cancel_all_orders()
                 except Exception as e:
                     logger.error(f"退出时撤销挂单失败: {e}")
+                if self.dead_mans_switch is not None:
+                    # 保留交易所侧的定时撤单作为兜底
+                    self.dead_mans_switch.stop(clear_schedule=False)
                 break
             except Exception as e:
                 logger.error(f"❌ 策略运行异常: {e}")
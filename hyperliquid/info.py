@@ -1,17 +1,45 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
 from hyperliquid.api import API
+from hyperliquid.utils.request_cache import get_request_cache
 from hyperliquid.utils.types import (
     Any,
     Callable,
     Cloid,
+    Dict,
+    Iterator,
     List,
     Meta,
     Optional,
+    Set,
     SpotMeta,
     SpotMetaAndAssetCtxs,
     Subscription,
+    Union,
     cast,
 )
 from hyperliquid.websocket_manager import WebsocketManager
+from hyperliquid.websocket_pool import WebsocketPool
+
+# Suggested seconds an /info response is reused, by request type; pass them as Info(cache_ttls=...) to opt in. Types
+# not listed are always fetched, but identical requests in flight at the same time still share one POST. Account data
+# is invalidated after every /exchange action.
+INFO_CACHE_TTLS: Dict[str, float] = {
+    "clearinghouseState": 1.0,
+    "spotClearinghouseState": 1.0,
+    "openOrders": 1.0,
+    "frontendOpenOrders": 1.0,
+    "allMids": 0.5,
+    "meta": 60.0,
+    "spotMeta": 60.0,
+    "perpDexs": 60.0,
+}
+
+# Most records the time-range endpoints return per request; a shorter page is the last one of the range
+USER_FILLS_PAGE_LIMIT = 2000
+USER_FUNDING_PAGE_LIMIT = 2000
+FUNDING_HISTORY_PAGE_LIMIT = 500
 
 
 class Info(API):
@@ -24,11 +52,21 @@ class Info(API):
         # Note that when perp_dexs is None, then "" is used as the perp dex. "" represents
         # the original dex.
         perp_dexs: Optional[List[str]] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        ws_connections: int = 1,
+        ws_shard_by: str = "identifier",
     ):  # pylint: disable=too-many-locals
         super().__init__(base_url)
-        self.ws_manager: Optional[WebsocketManager] = None
+        # Shared by every Info for this base URL so Exchange can invalidate it after its actions
+        self.response_cache = get_request_cache(self.base_url)
+        self.cache_ttls = {} if cache_ttls is None else cache_ttls
+        self.ws_manager: Optional[Union[WebsocketManager, WebsocketPool]] = None
         if not skip_ws:
-            self.ws_manager = WebsocketManager(self.base_url)
+            if ws_connections > 1:
+                # Subscriptions are sharded over several sockets, see hyperliquid.websocket_pool
+                self.ws_manager = WebsocketPool(self.base_url, ws_connections, ws_shard_by)
+            else:
+                self.ws_manager = WebsocketManager(self.base_url)
             self.ws_manager.start()
 
         if spot_meta is None:
@@ -74,6 +112,13 @@ class Info(API):
             self.name_to_coin[asset_info["name"]] = asset_info["name"]
             self.asset_to_sz_decimals[asset] = asset_info["szDecimals"]
 
+    def post(self, url_path: str, payload: Any = None) -> Any:
+        if url_path != "/info" or not payload:
+            return super().post(url_path, payload)
+        key = json.dumps(payload, sort_keys=True)
+        ttl = self.cache_ttls.get(payload.get("type"), 0)
+        return self.response_cache.get(key, ttl, lambda: super(Info, self).post(url_path, payload))
+
     def disconnect_websocket(self):
         if self.ws_manager is None:
             raise RuntimeError("Cannot call disconnect_websocket since skip_ws was used")
@@ -432,6 +477,116 @@ class Info(API):
             return self.post("/info", {"type": "userFunding", "user": user, "startTime": startTime, "endTime": endTime})
         return self.post("/info", {"type": "userFunding", "user": user, "startTime": startTime})
 
+    def iter_user_fills_by_time(
+        self, address: str, start_time: int, end_time: Optional[int] = None, prefetch: bool = False
+    ) -> Iterator[Any]:
+        """Lazily iterate over all of a user's fills in a time range.
+
+        Walks the range page by page with user_fills_by_time, dropping the fills repeated on page boundaries.
+        With prefetch=True the next page is requested in a background thread while the current one is consumed.
+        Requests still go through the shared rate limiter.
+
+        Args:
+            address (str): Onchain address in 42-character hexadecimal format;
+                            e.g. 0x0000000000000000000000000000000000000000.
+            start_time (int): Unix timestamp in milliseconds
+            end_time (Optional[int]): Unix timestamp in milliseconds
+
+        Yields:
+            Fills in the same format as user_fills_by_time.
+        """
+        return self._iter_time_pages(
+            lambda start: self.user_fills_by_time(address, start, end_time),
+            start_time,
+            end_time,
+            USER_FILLS_PAGE_LIMIT,
+            prefetch,
+        )
+
+    def iter_funding_history(
+        self, name: str, startTime: int, endTime: Optional[int] = None, prefetch: bool = False
+    ) -> Iterator[Any]:
+        """Lazily iterate over the funding history of a coin in a time range.
+
+        See iter_user_fills_by_time for the paging and prefetch behaviour.
+
+        Yields:
+            Records in the same format as funding_history.
+        """
+        return self._iter_time_pages(
+            lambda start: self.funding_history(name, start, endTime),
+            startTime,
+            endTime,
+            FUNDING_HISTORY_PAGE_LIMIT,
+            prefetch,
+        )
+
+    def iter_user_funding_history(
+        self, user: str, startTime: int, endTime: Optional[int] = None, prefetch: bool = False
+    ) -> Iterator[Any]:
+        """Lazily iterate over a user's funding history in a time range.
+
+        See iter_user_fills_by_time for the paging and prefetch behaviour.
+
+        Yields:
+            Records in the same format as user_funding_history.
+        """
+        return self._iter_time_pages(
+            lambda start: self.user_funding_history(user, start, endTime),
+            startTime,
+            endTime,
+            USER_FUNDING_PAGE_LIMIT,
+            prefetch,
+        )
+
+    @staticmethod
+    def _iter_time_pages(
+        fetch_page: Callable[[int], Any], start_time: int, end_time: Optional[int], page_limit: int, prefetch: bool
+    ) -> Iterator[Any]:
+        # Each page starts at the latest time seen so far, since several records can share the boundary
+        # millisecond. Records already yielded at that millisecond are remembered and skipped. A page shorter
+        # than page_limit holds the rest of the range, so the walk ends there without another request.
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            future = executor.submit(fetch_page, start_time) if executor else None
+            boundary_time = None
+            boundary_keys: Set[str] = set()
+            while True:
+                page = future.result() if future else fetch_page(start_time)
+                if not page:
+                    return
+                last_page = len(page) < page_limit
+                records = []
+                for record in page:
+                    if record["time"] == boundary_time and json.dumps(record, sort_keys=True) in boundary_keys:
+                        continue
+                    records.append(record)
+                if not records:
+                    # Everything left at the boundary millisecond was already yielded, so step past it.
+                    if boundary_time is None or last_page:
+                        return
+                    start_time = boundary_time + 1
+                    if end_time is not None and start_time > end_time:
+                        return
+                    if executor:
+                        future = executor.submit(fetch_page, start_time)
+                    continue
+                last_time = max(record["time"] for record in records)
+                if last_time != boundary_time:
+                    boundary_keys = set()
+                boundary_time = last_time
+                boundary_keys.update(json.dumps(r, sort_keys=True) for r in records if r["time"] == last_time)
+                start_time = last_time
+                done = last_page or (end_time is not None and start_time > end_time)
+                if executor and not done:
+                    future = executor.submit(fetch_page, start_time)
+                yield from records
+                if done:
+                    return
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+
     def l2_snapshot(self, name: str) -> Any:
         """Retrieve L2 snapshot for a given coin
 
@@ -608,12 +763,24 @@ class Info(API):
         ):
             subscription["coin"] = self.name_to_coin[subscription["coin"]]
 
-    def subscribe(self, subscription: Subscription, callback: Callable[[Any], None]) -> int:
+    def subscribe(
+        self,
+        subscription: Subscription,
+        callback: Callable[[Any], None],
+        delivery: str = "inline",
+        queue_size: int = 1000,
+    ) -> int:
+        """Subscribe to a websocket feed.
+
+        delivery selects where the callback runs: "inline" on the websocket thread, "thread" on a dedicated worker
+        with a bounded queue that drops the oldest messages when full, or "conflate" on a worker that only keeps
+        the latest undelivered message. Counters are available from ws_manager.delivery_stats().
+        """
         self._remap_coin_subscription(subscription)
         if self.ws_manager is None:
             raise RuntimeError("Cannot call subscribe since skip_ws was used")
         else:
-            return self.ws_manager.subscribe(subscription, callback)
+            return self.ws_manager.subscribe(subscription, callback, delivery=delivery, queue_size=queue_size)
 
     def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
         self._remap_coin_subscription(subscription)
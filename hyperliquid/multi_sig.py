@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_account.signers.local import LocalAccount
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.signing import multi_sig_l1_action_payload_digest, recover_from_hash, sign_hash
+from hyperliquid.utils.types import Any, Dict, FrozenSet, List, Optional, Tuple
+
+
+class MultiSigCoordinator:
+    """Collects, verifies and wraps multi-sig signatures for actions of one multi-sig user.
+
+    The exchange wallet is the outer signer. Every signer signs the same digest for a given action and nonce, so it
+    is hashed once and the per-wallet signing and the signer recovery of a whole batch run concurrently on a thread
+    pool (secp256k1 calls release the GIL with the coincurve backend). The authorized signer set and threshold from
+    userToMultiSigSigners are cached for signers_ttl seconds.
+    """
+
+    def __init__(
+        self,
+        exchange: Exchange,
+        multi_sig_user: str,
+        signer_wallets: List[LocalAccount],
+        signers_ttl: float = 300,
+        max_workers: Optional[int] = None,
+    ):
+        self.exchange = exchange
+        self.multi_sig_user = multi_sig_user.lower()
+        self.signer_wallets = signer_wallets
+        self.signers_ttl = signers_ttl
+        self.is_mainnet = exchange.base_url == MAINNET_API_URL
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="multi-sig")
+        self._signers_lock = threading.Lock()
+        self._signers: Optional[Tuple[FrozenSet[str], int]] = None
+        self._signers_fetched_at = 0.0
+
+    def authorized_signers(self, refresh: bool = False) -> Tuple[FrozenSet[str], int]:
+        """Return the lowercased authorized signer addresses and the signature threshold."""
+        with self._signers_lock:
+            if refresh or self._signers is None or time.time() - self._signers_fetched_at > self.signers_ttl:
+                config = self.exchange.info.query_user_to_multi_sig_signers(self.multi_sig_user)
+                if not config:
+                    raise ValueError(f"{self.multi_sig_user} is not a multi-sig user")
+                users = frozenset(user.lower() for user in config["authorizedUsers"])
+                self._signers = (users, config["threshold"])
+                self._signers_fetched_at = time.time()
+            return self._signers
+
+    def _digest(self, action: Any, nonce: int, vault_address: Optional[str]) -> bytes:
+        digest: bytes = multi_sig_l1_action_payload_digest(
+            action,
+            self.is_mainnet,
+            vault_address,
+            nonce,
+            self.exchange.expires_after,
+            self.multi_sig_user,
+            self.exchange.wallet.address,
+        )
+        return digest
+
+    def collect(
+        self, actions: List[Any], nonces: List[int], vault_address: Optional[str] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """Sign every action with every signer wallet. Returns the signatures per action, in wallet order."""
+        digests = [self._digest(action, nonce, vault_address) for action, nonce in zip(actions, nonces)]
+        futures = [[self._pool.submit(sign_hash, w, digest) for w in self.signer_wallets] for digest in digests]
+        return [[f.result() for f in per_action] for per_action in futures]
+
+    def verify(
+        self,
+        actions: List[Any],
+        nonces: List[int],
+        signatures: List[List[Dict[str, Any]]],
+        vault_address: Optional[str] = None,
+    ) -> List[List[str]]:
+        """Check that each action carries at least threshold signatures from distinct authorized signers.
+
+        Raises ValueError naming the first failing action. Returns the recovered signer addresses per action.
+        """
+        users, threshold = self.authorized_signers()
+        digests = [self._digest(action, nonce, vault_address) for action, nonce in zip(actions, nonces)]
+        futures = [
+            [self._pool.submit(recover_from_hash, d, sig) for sig in sigs] for d, sigs in zip(digests, signatures)
+        ]
+        recovered = [[f.result() for f in per_action] for per_action in futures]
+        for i, signers in enumerate(recovered):
+            unauthorized = [signer for signer in signers if signer.lower() not in users]
+            if unauthorized:
+                raise ValueError(f"Action {i} is signed by unauthorized signers {unauthorized}")
+            if len({signer.lower() for signer in signers}) < threshold:
+                raise ValueError(f"Action {i} has fewer than {threshold} distinct signatures")
+        return recovered
+
+    def prepare(self, actions: List[Any], vault_address: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Collect, verify and wrap signatures for actions, returning multiSig payloads for post_presigned."""
+        nonces = [self.exchange.nonce_manager.next_nonce() for _ in actions]
+        signatures = self.collect(actions, nonces, vault_address)
+        self.verify(actions, nonces, signatures, vault_address)
+        return [
+            self.exchange.presign_multi_sig(self.multi_sig_user, action, sigs, nonce, vault_address)
+            for action, sigs, nonce in zip(actions, signatures, nonces)
+        ]
+
+    def shutdown(self) -> None:
+        self._pool.shutdown()
@@ -0,0 +1,91 @@
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+
+import eth_account
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.signing import sign_l1_action
+from hyperliquid.utils.types import Any, Dict, List, Optional
+
+# The wallet of a signing worker process, set once by the pool initializer so the key is not sent with every action
+_worker_wallet: Any = None
+
+
+def _init_worker(private_key: str) -> None:
+    global _worker_wallet
+    _worker_wallet = eth_account.Account.from_key(private_key)
+
+
+def _sign_in_worker(action, vault_address, nonce, expires_after, is_mainnet):
+    return sign_l1_action(_worker_wallet, action, vault_address, nonce, expires_after, is_mainnet)
+
+
+class SigningExecutor:
+    """Signs L1 actions for an Exchange on a worker pool so they are ready to post when needed.
+
+    Nonces are taken from the exchange's NonceManager at submit time, in submission order, and each result is a
+    payload for Exchange.post_presigned. mode="thread" (the default) avoids pickling and process start-up and
+    still overlaps work when the secp256k1 backend releases the GIL (coincurve does). mode="process" signs in a
+    process pool and sidesteps the GIL entirely; each worker receives the private key once, when it starts. Note
+    that on Linux the workers are forked, which is unsafe once the calling process runs other threads.
+    """
+
+    def __init__(self, exchange: Exchange, mode: str = "thread", max_workers: Optional[int] = None):
+        if mode not in ("process", "thread"):
+            raise ValueError(f"Unknown signing executor mode {mode}")
+        self.exchange = exchange
+        self.mode = mode
+        self._pool: Executor = (
+            ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(exchange.wallet.key.hex(),)
+            )
+            if mode == "process"
+            else ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="signer")
+        )
+
+    def submit(self, action: Any) -> "Future[Dict[str, Any]]":
+        exchange = self.exchange
+        nonce = exchange.nonce_manager.next_nonce()
+        vault_address, expires_after = exchange.vault_address, exchange.expires_after
+        is_mainnet = exchange.base_url == MAINNET_API_URL
+        if self.mode == "process":
+            signature_future = self._pool.submit(
+                _sign_in_worker, action, vault_address, nonce, expires_after, is_mainnet
+            )
+        else:
+            signature_future = self._pool.submit(
+                sign_l1_action, exchange.wallet, action, vault_address, nonce, expires_after, is_mainnet
+            )
+        result: "Future[Dict[str, Any]]" = Future()
+
+        def done(f: "Future[Any]") -> None:
+            error = f.exception()
+            if error is not None:
+                result.set_exception(error)
+                return
+            result.set_result(
+                {
+                    "action": action,
+                    "nonce": nonce,
+                    "signature": f.result(),
+                    "vaultAddress": vault_address if action["type"] != "usdClassTransfer" else None,
+                    "expiresAfter": expires_after,
+                }
+            )
+
+        signature_future.add_done_callback(done)
+        return result
+
+    def sign_all(self, actions: List[Any]) -> List[Dict[str, Any]]:
+        """Sign several actions concurrently and return the payloads in the same order."""
+        futures = [self.submit(action) for action in actions]
+        return [f.result() for f in futures]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self) -> "SigningExecutor":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
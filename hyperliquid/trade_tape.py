@@ -0,0 +1,210 @@
+import threading
+from array import array
+from collections import deque
+
+from hyperliquid.utils.rolling import RollingWindow
+from hyperliquid.utils.types import Any, Deque, List, NamedTuple, Optional, Trade, TradesMsg
+
+Bar = NamedTuple(
+    "Bar",
+    [
+        ("start", int),  # time of the first trade in milliseconds
+        ("end", int),  # time of the last trade in milliseconds
+        ("open", float),
+        ("high", float),
+        ("low", float),
+        ("close", float),
+        ("volume", float),
+        ("signed_volume", float),  # buyer-initiated minus seller-initiated size
+        ("vwap", float),
+        ("trades", int),
+    ],
+)
+
+
+class _BarBuilder:
+    def __init__(self):
+        self.trades = 0
+        self.volume = 0.0
+        self.signed_volume = 0.0
+        self.notional = 0.0
+
+    def add(self, t: int, px: float, sz: float, sign: float) -> None:
+        if self.trades == 0:
+            self.start, self.open, self.high, self.low = t, px, px, px
+        self.end, self.close = t, px
+        self.high = max(self.high, px)
+        self.low = min(self.low, px)
+        self.trades += 1
+        self.volume += sz
+        self.signed_volume += sign * sz
+        self.notional += px * sz
+
+    def bar(self) -> Bar:
+        vwap = self.notional / self.volume if self.volume > 0 else self.close
+        return Bar(
+            self.start,
+            self.end,
+            self.open,
+            self.high,
+            self.low,
+            self.close,
+            self.volume,
+            self.signed_volume,
+            vwap,
+            self.trades,
+        )
+
+
+class _TradeWindow(RollingWindow):
+    """RollingWindow of trade prices that also keeps each trade's size and side, with running volume sums."""
+
+    def __init__(self, window_seconds: float, capacity: int):
+        super().__init__(window_seconds, capacity)
+        self._sizes = array("d", bytes(8 * capacity))
+        self._signs = array("d", bytes(8 * capacity))
+        self.notional = 0.0
+        self.volume = 0.0
+        self.signed_volume = 0.0
+
+    def add(self, t: float, px: float, sz: float, sign: float) -> None:
+        with self._lock:
+            # Free the oldest slot first so its size is subtracted before the new trade overwrites it
+            if self._size == self.capacity:
+                self._pop_oldest()
+            slot = self._seq % self.capacity
+            self._sizes[slot] = sz
+            self._signs[slot] = sign
+            self.notional += px * sz
+            self.volume += sz
+            self.signed_volume += sign * sz
+            self._append(t, px)
+
+    def vwap(self) -> Optional[float]:
+        with self._lock:
+            return self.notional / self.volume if self.volume > 0 else None
+
+    def imbalance(self) -> float:
+        with self._lock:
+            return self.signed_volume / self.volume if self.volume > 0 else 0.0
+
+    def _pop_oldest(self) -> None:
+        slot = (self._seq - self._size) % self.capacity
+        self.notional -= self._prices[slot] * self._sizes[slot]
+        self.volume -= self._sizes[slot]
+        self.signed_volume -= self._signs[slot] * self._sizes[slot]
+        super()._pop_oldest()
+        if self._size == 0:
+            self.notional = self.volume = self.signed_volume = 0.0
+
+    def _resum(self) -> None:
+        super()._resum()
+        self.notional = self.volume = self.signed_volume = 0.0
+        for seq in range(self._seq - self._size, self._seq):
+            slot = seq % self.capacity
+            self.notional += self._prices[slot] * self._sizes[slot]
+            self.volume += self._sizes[slot]
+            self.signed_volume += self._signs[slot] * self._sizes[slot]
+
+
+class TradeTape:
+    """Streaming aggregates of one coin's trades feed.
+
+    Trades are kept in a RollingWindow covering the last window_seconds, extended with running sums so VWAP,
+    volume, signed volume and trade count are O(1) to read. Side "B" trades were initiated by a buyer and count
+    as positive signed volume. Completed trade-count bars (every bar_trades trades) and volume bars (every
+    bar_volume of size, splitting a trade that crosses the boundary) are kept for the last max_bars of each.
+    Pass on_trades as the callback of a trades subscription, or feed recorded trades through add_trade.
+    """
+
+    def __init__(
+        self,
+        coin: str,
+        window_seconds: float = 300.0,
+        capacity: int = 16384,
+        bar_trades: Optional[int] = None,
+        bar_volume: Optional[float] = None,
+        max_bars: int = 1000,
+    ):
+        self.coin = coin
+        # Trade times are milliseconds and the window works in seconds. Its price statistics (min, max, stdev, ATR)
+        # cover the same trades as the volume sums.
+        self.window = _TradeWindow(window_seconds, capacity)
+        self._lock = threading.Lock()
+        self.bar_trades = bar_trades
+        self.bar_volume = bar_volume
+        self.trade_bars: Deque[Bar] = deque(maxlen=max_bars)
+        self.volume_bars: Deque[Bar] = deque(maxlen=max_bars)
+        self._trade_bar = _BarBuilder()
+        self._volume_bar = _BarBuilder()
+
+    def __len__(self) -> int:
+        return len(self.window)
+
+    def on_trades(self, ws_msg: TradesMsg) -> None:
+        for trade in ws_msg["data"]:
+            if trade["coin"] == self.coin:
+                self.add_trade(trade)
+
+    def add_trade(self, trade: Trade) -> None:
+        self.add(trade["time"], float(trade["px"]), float(trade["sz"]), 1.0 if trade["side"] == "B" else -1.0)
+
+    def add(self, t: int, px: float, sz: float, sign: float) -> None:
+        with self._lock:
+            self.window.add(t / 1000, px, sz, sign)
+            self._add_to_bars(t, px, sz, sign)
+
+    def _add_to_bars(self, t: int, px: float, sz: float, sign: float) -> None:
+        if self.bar_trades:
+            self._trade_bar.add(t, px, sz, sign)
+            if self._trade_bar.trades >= self.bar_trades:
+                self.trade_bars.append(self._trade_bar.bar())
+                self._trade_bar = _BarBuilder()
+        if self.bar_volume:
+            remaining = sz
+            while remaining > self.bar_volume * 1e-12:
+                part = min(remaining, self.bar_volume - self._volume_bar.volume)
+                self._volume_bar.add(t, px, part, sign)
+                remaining -= part
+                if self._volume_bar.volume >= self.bar_volume * (1 - 1e-12):
+                    self.volume_bars.append(self._volume_bar.bar())
+                    self._volume_bar = _BarBuilder()
+
+    def evict(self, now_ms: int) -> None:
+        """Drop trades older than window_seconds relative to now_ms."""
+        self.window.evict(now_ms / 1000)
+
+    def vwap(self) -> Optional[float]:
+        return self.window.vwap()
+
+    def volume(self) -> float:
+        return self.window.volume
+
+    def signed_volume(self) -> float:
+        return self.window.signed_volume
+
+    def imbalance(self) -> float:
+        """Signed volume as a fraction of volume, from -1 (all sells) to 1 (all buys)."""
+        return self.window.imbalance()
+
+    def trade_count(self) -> int:
+        return len(self.window)
+
+    def last_price(self) -> Optional[float]:
+        return self.window.last()
+
+    def bars(self, kind: str = "trades") -> List[Bar]:
+        """Completed bars, oldest first; kind is "trades" or "volume"."""
+        if kind == "trades":
+            return list(self.trade_bars)
+        if kind == "volume":
+            return list(self.volume_bars)
+        raise ValueError(f"Unknown bar kind {kind}")
+
+    def subscribe(self, info: Any) -> int:
+        """Subscribe on_trades to the coin's trades feed through an Info instance."""
+        subscription = {"type": "trades", "coin": self.coin}
+        subscription_id: int = info.subscribe(subscription, self.on_trades)
+        # Info maps spot pair names to the coin the feed reports, such as "@107"
+        self.coin = subscription["coin"]
+        return subscription_id
@@ -0,0 +1,79 @@
+import logging
+import threading
+from collections import deque
+
+from hyperliquid.utils.types import Any, Callable, Deque, Dict
+
+DELIVERY_MODES = ("inline", "thread", "conflate")
+
+
+class DeliveryWorker:
+    """Runs a subscription callback on its own thread so a slow handler cannot stall the websocket thread.
+
+    In "thread" mode messages wait in a queue of at most queue_size; when it is full the oldest message is dropped.
+    In "conflate" mode only the latest undelivered message is kept, which suits feeds where each message supersedes
+    the previous one (mids, books, account snapshots). Calling the worker enqueues a message and never blocks.
+    Messages whose callback raised are counted in errors rather than delivered.
+    """
+
+    def __init__(self, callback: Callable[[Any], None], mode: str = "thread", queue_size: int = 1000, name: str = ""):
+        if mode not in ("thread", "conflate"):
+            raise ValueError(f"Unsupported delivery worker mode {mode}")
+        self.callback = callback
+        self.mode = mode
+        self._queue: Deque[Any] = deque(maxlen=1 if mode == "conflate" else queue_size)
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.delivered = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.errors = 0
+        self._thread = threading.Thread(target=self._run, name=name or f"ws-delivery-{mode}", daemon=True)
+        self._thread.start()
+
+    def __call__(self, msg: Any) -> None:
+        with self._cond:
+            if len(self._queue) == self._queue.maxlen:
+                if self.mode == "conflate":
+                    self.conflated += 1
+                else:
+                    self.dropped += 1
+            self._queue.append(msg)
+            self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                msg = self._queue.popleft()
+            try:
+                self.callback(msg)
+            except Exception:
+                self.errors += 1
+                logging.exception("Websocket subscription callback failed")
+            else:
+                self.delivered += 1
+
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "delivered": self.delivered,
+            "pending": len(self._queue),
+            "dropped": self.dropped,
+            "conflated": self.conflated,
+            "errors": self.errors,
+        }
+
+    def stop(self) -> None:
+        """Stop the worker; messages still queued are discarded."""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not threading.current_thread():
+            self._thread.join()
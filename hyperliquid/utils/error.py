@@ -15,3 +15,16 @@ class ServerError(Error):
     def __init__(self, status_code, message):
         self.status_code = status_code
         self.message = message
+
+
+class WsPostError(Error):
+    def __init__(self, message):
+        self.message = message
+
+
+class WsPostNotSentError(WsPostError):
+    """The post never reached the websocket, so sending it again cannot execute it twice."""
+
+
+class WsPostOutcomeUnknownError(WsPostError):
+    """The post was sent but no response arrived, so the request may or may not have been executed."""
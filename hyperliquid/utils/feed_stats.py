@@ -0,0 +1,101 @@
+import threading
+import time
+
+from hyperliquid.utils.rolling import RollingWindow
+from hyperliquid.utils.types import Any, Dict, List, Optional, Tuple, WsMsg
+
+
+def exchange_time_ms(ws_msg: WsMsg) -> Optional[int]:
+    """The exchange timestamp of a message, for channels whose payload says when it was produced.
+
+    candle is deliberately missing: its t and T fields are the bounds of the candle interval, not when the update
+    was sent, so "now - T" is negative for the open candle and only measures the interval for closed ones.
+    """
+    if ws_msg["channel"] == "l2Book" or ws_msg["channel"] == "bbo":
+        return ws_msg["data"]["time"]
+    if ws_msg["channel"] == "trades" and ws_msg["data"]:
+        return max(trade["time"] for trade in ws_msg["data"])
+    return None
+
+
+class FeedStats:
+    """Rolling latency statistics for websocket feeds, keyed by subscription identifier.
+
+    For every frame it records the inter-arrival gap and, where the payload carries an exchange timestamp, the lag
+    between that timestamp and the local receive time. Lag therefore includes any offset between the local and
+    exchange clocks; keep the host NTP synced if absolute values matter. Ping round trips are tracked separately.
+    All windows cover the last window_seconds.
+    """
+
+    def __init__(self, window_seconds: float = 60.0, capacity: int = 4096):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self._windows_by_identifier: Dict[str, Tuple[RollingWindow, RollingWindow]] = {}  # (lags, gaps)
+        self._last_received: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.ping_rtt = RollingWindow(window_seconds * 10, 256)
+        self._ping_sent: Optional[float] = None
+
+    def _windows(self, identifier: str) -> Tuple[RollingWindow, RollingWindow]:
+        windows = self._windows_by_identifier.get(identifier)
+        if windows is None:
+            with self._lock:
+                windows = self._windows_by_identifier.setdefault(
+                    identifier,
+                    (
+                        RollingWindow(self.window_seconds, self.capacity),
+                        RollingWindow(self.window_seconds, self.capacity),
+                    ),
+                )
+        return windows
+
+    def record(self, identifier: str, ws_msg: WsMsg, received_at: Optional[float] = None) -> None:
+        if received_at is None:
+            received_at = time.time()
+        lags, gaps = self._windows(identifier)
+        last = self._last_received.get(identifier)
+        self._last_received[identifier] = received_at
+        if last is not None:
+            gaps.append(received_at, received_at - last)
+        sent_ms = exchange_time_ms(ws_msg)
+        if sent_ms is not None:
+            lags.append(received_at, received_at * 1000 - sent_ms)
+
+    def record_ping(self) -> None:
+        self._ping_sent = time.perf_counter()
+
+    def record_pong(self) -> None:
+        sent, self._ping_sent = self._ping_sent, None
+        if sent is not None:
+            self.ping_rtt.append(time.time(), (time.perf_counter() - sent) * 1000)
+
+    def snapshot(self, identifier: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """Lag (ms), inter-arrival gaps (s), message rate (per second) and age of the last message (s)."""
+        if now is None:
+            now = time.time()
+        lags, gaps = self._windows(identifier)
+        lags.evict(now)
+        gaps.evict(now)
+        last = self._last_received.get(identifier)
+        return {
+            "lag_ms_last": lags.last(),
+            "lag_ms_mean": lags.mean(),
+            "lag_ms_max": lags.max(),
+            "gap_s_mean": gaps.mean(),
+            "gap_s_max": gaps.max(),
+            "rate_per_s": len(gaps) / self.window_seconds,
+            "age_s": None if last is None else now - last,
+            "ping_rtt_ms": self.ping_rtt.last(),
+        }
+
+    def is_fresh(self, identifier: str, max_age_s: float, max_lag_ms: Optional[float] = None) -> bool:
+        """Whether the feed delivered a message within max_age_s and, if given, its last lag is within max_lag_ms."""
+        stats = self.snapshot(identifier)
+        if stats["age_s"] is None or stats["age_s"] > max_age_s:
+            return False
+        if max_lag_ms is not None and stats["lag_ms_last"] is not None and stats["lag_ms_last"] > max_lag_ms:
+            return False
+        return True
+
+    def identifiers(self) -> List[str]:
+        return list(self._windows_by_identifier)
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+
+from hyperliquid.utils.signing import get_timestamp_ms
+from hyperliquid.utils.types import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None  # type: ignore
+
+# The exchange rejects nonces more than a day ahead of its clock. Stay far inside that and wait for the clock
+# instead if a burst of actions ever pushes the nonce this far ahead.
+MAX_NONCE_AHEAD_MS = 60 * 60 * 1000
+
+
+class NonceManager:
+    """Hands out strictly increasing millisecond-timestamp nonces for one signer.
+
+    Nonces are the current time in milliseconds, or one more than the previous nonce when several actions are
+    signed within the same millisecond. Allocation is thread-safe. With lock_path set, the last nonce is also
+    kept in that file under an flock, so several processes signing with the same key never collide.
+    """
+
+    def __init__(self, lock_path: Optional[str] = None, max_ahead_ms: int = MAX_NONCE_AHEAD_MS):
+        if lock_path is not None and fcntl is None:
+            raise RuntimeError("Cross-process nonce allocation requires fcntl, which is not available on this platform")
+        self.lock_path = lock_path
+        self.max_ahead_ms = max_ahead_ms
+        self._last = 0
+        self._lock = threading.Lock()
+
+    def enable_shared(self, lock_path: str) -> None:
+        if fcntl is None:
+            raise RuntimeError("Cross-process nonce allocation requires fcntl, which is not available on this platform")
+        with self._lock:
+            self.lock_path = lock_path
+
+    def next_nonce(self) -> int:
+        with self._lock:
+            if self.lock_path is None:
+                nonce = self._allocate(self._last)
+            else:
+                nonce = self._allocate_shared()
+            self._last = nonce
+            return nonce
+
+    def _allocate(self, last: int) -> int:
+        now = get_timestamp_ms()
+        nonce = max(now, last + 1)
+        if nonce - now > self.max_ahead_ms:
+            time.sleep((nonce - now - self.max_ahead_ms) / 1000)
+        return nonce
+
+    def _allocate_shared(self) -> int:
+        assert self.lock_path is not None and fcntl is not None
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            raw = os.read(fd, 32)
+            shared_last = int(raw) if raw.strip() else 0
+            nonce = self._allocate(max(shared_last, self._last))
+            os.lseek(fd, 0, os.SEEK_SET)
+            os.ftruncate(fd, 0)
+            os.write(fd, str(nonce).encode())
+            return nonce
+        finally:
+            os.close(fd)
+
+
+_managers: Dict[str, NonceManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_nonce_manager(signer: str, lock_dir: Optional[str] = None) -> NonceManager:
+    """Return the process-wide NonceManager for a signer address, creating it on first use.
+
+    With lock_dir, nonces are coordinated with other processes through a per-signer file in that directory.
+    """
+    key = signer.lower()
+    with _managers_lock:
+        lock_path = None if lock_dir is None else os.path.join(lock_dir, f"nonce_{key}")
+        manager = _managers.get(key)
+        if manager is None:
+            manager = NonceManager(lock_path)
+            _managers[key] = manager
+        elif lock_path is not None and manager.lock_path is None:
+            # Upgrade in place so Exchange instances already holding this manager stay in sync
+            manager.enable_shared(lock_path)
+        return manager
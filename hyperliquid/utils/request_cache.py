@@ -0,0 +1,86 @@
+import copy
+import threading
+import time
+from concurrent.futures import Future
+
+from hyperliquid.utils.types import Any, Callable, Dict, Tuple
+
+
+class RequestCache:
+    """Single-flight, short-TTL cache for read requests.
+
+    Concurrent get() calls for the same key share one fetch. With a positive ttl the result is also reused until it
+    expires. invalidate() drops cached results and detaches in-flight fetches, so nothing fetched before it is
+    handed out afterwards. Callers receive their own deep copy and may mutate it freely.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._inflight: Dict[str, "Future[Any]"] = {}
+        self._generation = 0
+        self.hits = 0
+        self.coalesced = 0
+        self.misses = 0
+
+    def get(self, key: str, ttl: float, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            future = self._inflight.get(key)
+            if future is None:
+                future = Future()
+                self._inflight[key] = future
+                generation = self._generation
+                leader = True
+                self.misses += 1
+            else:
+                leader = False
+                self.coalesced += 1
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if ttl > 0 and generation == self._generation:
+                self._entries[key] = (time.monotonic() + ttl, value)
+        future.set_result(value)
+        return copy.deepcopy(value)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._inflight.clear()
+
+
+_caches: Dict[str, RequestCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_request_cache(name: str) -> RequestCache:
+    """Return the process-wide RequestCache with the given name, e.g. an API base URL."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            cache = RequestCache()
+            _caches[name] = cache
+        return cache
+
+
+def invalidate_all() -> None:
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.invalidate()
@@ -0,0 +1,141 @@
+import math
+import threading
+from array import array
+from collections import deque
+
+from hyperliquid.utils.types import Deque, Optional, Tuple
+
+
+class RollingWindow:
+    """Time-windowed price samples in a fixed-capacity ring buffer.
+
+    Rolling min/max use monotonic deques and mean/stdev/ATR use running sums, so appending a sample and
+    reading any statistic are O(1) amortized. Samples are evicted once they are older than window_seconds
+    or when the buffer is full. ATR here is the mean absolute change between consecutive samples, i.e. the
+    true range of each tick-to-tick move.
+    """
+
+    def __init__(self, window_seconds: float, capacity: int = 4096):
+        self.window_seconds = window_seconds
+        self.capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._prices = array("d", bytes(8 * capacity))
+        self._ranges = array("d", bytes(8 * capacity))
+        self._seq = 0  # sequence number of the next sample
+        self._size = 0
+        self._min_deque: Deque[Tuple[int, float]] = deque()  # (seq, price), prices increasing
+        self._max_deque: Deque[Tuple[int, float]] = deque()  # (seq, price), prices decreasing
+        self._ref = 0.0  # prices are summed relative to this to limit cancellation error
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._range_sum = 0.0  # sum of ranges of all samples except the oldest
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, t: float, price: float) -> None:
+        with self._lock:
+            self._append(t, price)
+
+    def _append(self, t: float, price: float) -> None:
+        # Subclasses keeping per-sample data extend _pop_oldest and _resum and append through this with the lock held
+        if self._size == 0:
+            self._ref = price
+        elif self._size == self.capacity:
+            self._pop_oldest()
+        slot = self._seq % self.capacity
+        self._times[slot] = t
+        self._prices[slot] = price
+        if self._size > 0:
+            last_price = self._prices[(self._seq - 1) % self.capacity]
+            self._ranges[slot] = abs(price - last_price)
+            self._range_sum += self._ranges[slot]
+        else:
+            self._ranges[slot] = 0.0
+        d = price - self._ref
+        self._sum += d
+        self._sum_sq += d * d
+        while self._min_deque and self._min_deque[-1][1] >= price:
+            self._min_deque.pop()
+        self._min_deque.append((self._seq, price))
+        while self._max_deque and self._max_deque[-1][1] <= price:
+            self._max_deque.pop()
+        self._max_deque.append((self._seq, price))
+        self._seq += 1
+        self._size += 1
+        if self._seq % self.capacity == 0:
+            self._resum()
+        self._evict_before(t - self.window_seconds)
+
+    def evict(self, now: float) -> None:
+        """Drop samples older than window_seconds relative to now."""
+        with self._lock:
+            self._evict_before(now - self.window_seconds)
+
+    def _evict_before(self, cutoff: float) -> None:
+        while self._size > 0 and self._times[(self._seq - self._size) % self.capacity] < cutoff:
+            self._pop_oldest()
+
+    def _pop_oldest(self) -> None:
+        oldest_seq = self._seq - self._size
+        d = self._prices[oldest_seq % self.capacity] - self._ref
+        self._sum -= d
+        self._sum_sq -= d * d
+        self._size -= 1
+        if self._size > 0:
+            self._range_sum -= self._ranges[(oldest_seq + 1) % self.capacity]
+        else:
+            self._sum = self._sum_sq = self._range_sum = 0.0
+        if self._min_deque and self._min_deque[0][0] == oldest_seq:
+            self._min_deque.popleft()
+        if self._max_deque and self._max_deque[0][0] == oldest_seq:
+            self._max_deque.popleft()
+
+    def _resum(self) -> None:
+        # Recompute the running sums from scratch once per capacity appends to stop float drift accumulating.
+        start = self._seq - self._size
+        self._ref = self._prices[start % self.capacity]
+        self._sum = self._sum_sq = self._range_sum = 0.0
+        for seq in range(start, self._seq):
+            d = self._prices[seq % self.capacity] - self._ref
+            self._sum += d
+            self._sum_sq += d * d
+            if seq != start:
+                self._range_sum += self._ranges[seq % self.capacity]
+
+    def last(self) -> Optional[float]:
+        return self._prices[(self._seq - 1) % self.capacity] if self._size else None
+
+    def min(self) -> Optional[float]:
+        with self._lock:
+            return self._min_deque[0][1] if self._size else None
+
+    def max(self) -> Optional[float]:
+        with self._lock:
+            return self._max_deque[0][1] if self._size else None
+
+    def range_ratio(self) -> float:
+        """(max - min) / min over the window, 0 with fewer than two samples."""
+        with self._lock:
+            if self._size < 2:
+                return 0.0
+            min_p, max_p = self._min_deque[0][1], self._max_deque[0][1]
+        return (max_p - min_p) / min_p if min_p > 0 else 0.0
+
+    def mean(self) -> Optional[float]:
+        with self._lock:
+            return self._ref + self._sum / self._size if self._size else None
+
+    def stdev(self) -> float:
+        """Sample standard deviation of the prices in the window."""
+        with self._lock:
+            if self._size < 2:
+                return 0.0
+            variance = (self._sum_sq - self._sum * self._sum / self._size) / (self._size - 1)
+        return math.sqrt(max(variance, 0.0))
+
+    def atr(self) -> float:
+        """Average absolute price change between consecutive samples in the window."""
+        with self._lock:
+            return self._range_sum / (self._size - 1) if self._size > 1 else 0.0
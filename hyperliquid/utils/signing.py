@@ -1,12 +1,24 @@
+import marshal
+import math
+import threading
 import time
-from decimal import Decimal
+from collections import OrderedDict
+from functools import lru_cache
+from types import ModuleType
 
 import msgpack
 from eth_account import Account
 from eth_account.messages import encode_typed_data
-from eth_utils import keccak, to_hex
+from eth_keys import keys
+from eth_utils import keccak, to_checksum_address, to_hex
 
-from hyperliquid.utils.types import Cloid, Literal, NotRequired, Optional, TypedDict, Union
+from hyperliquid.utils.types import Cloid, List, Literal, NotRequired, Optional, TypedDict, Union
+
+coincurve: Optional[ModuleType]
+try:
+    import coincurve
+except ImportError:  # optional fast secp256k1 backend
+    coincurve = None
 
 Tif = Union[Literal["Alo"], Literal["Ioc"], Literal["Gtc"]]
 Tpsl = Union[Literal["tp"], Literal["sl"]]
@@ -152,8 +164,45 @@ def address_to_bytes(address):
     return bytes.fromhex(address[2:] if address.startswith("0x") else address)
 
 
+_packers = threading.local()
+
+
+def _packb(action):
+    # Packer is not thread-safe, so each thread keeps its own and reuses its internal buffer across calls.
+    packer = getattr(_packers, "packer", None)
+    if packer is None:
+        packer = _packers.packer = msgpack.Packer()
+    return packer.pack(action)
+
+
+_PACKED_ACTIONS_MAX = 1024
+_packed_actions: "OrderedDict[bytes, bytes]" = OrderedDict()
+_packed_actions_lock = threading.Lock()
+
+
+def _packb_cached(action):
+    # The msgpack bytes of an action do not depend on the nonce, so repeated actions (the same cancel set, a
+    # scheduleCancel, a retried order) reuse them. marshal is cheaper than msgpack and keeps dict order and the
+    # types msgpack tells apart (True vs 1, 1 vs 1.0), so equal keys always mean equal msgpack bytes.
+    try:
+        key = marshal.dumps(action)
+    except ValueError:
+        return _packb(action)
+    with _packed_actions_lock:
+        data = _packed_actions.get(key)
+        if data is not None:
+            _packed_actions.move_to_end(key)
+            return data
+    data = _packb(action)
+    with _packed_actions_lock:
+        _packed_actions[key] = data
+        if len(_packed_actions) > _PACKED_ACTIONS_MAX:
+            _packed_actions.popitem(last=False)
+    return data
+
+
 def action_hash(action, vault_address, nonce, expires_after):
-    data = msgpack.packb(action)
+    data = _packb_cached(action)
     data += nonce.to_bytes(8, "big")
     if vault_address is None:
         data += b"\x00"
@@ -195,6 +244,44 @@ def l1_payload(phantom_agent):
     }
 
 
+# The L1 signing domain and Agent type never change, so their EIP-712 hashes are computed once.
+EIP712_DOMAIN_TYPEHASH = keccak(b"EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)")
+L1_DOMAIN_SEPARATOR = keccak(
+    EIP712_DOMAIN_TYPEHASH + keccak(b"Exchange") + keccak(b"1") + (1337).to_bytes(32, "big") + bytes(32)
+)
+AGENT_TYPEHASH = keccak(b"Agent(string source,bytes32 connectionId)")
+AGENT_SOURCE_HASHES = {True: keccak(b"a"), False: keccak(b"b")}
+
+
+def l1_action_digest(hash, is_mainnet):
+    """EIP-712 digest of the phantom agent for an action hash, equal to hashing l1_payload() generically."""
+    struct_hash = keccak(AGENT_TYPEHASH + AGENT_SOURCE_HASHES[is_mainnet] + hash)
+    return keccak(b"\x19\x01" + L1_DOMAIN_SEPARATOR + struct_hash)
+
+
+def _coincurve_key(wallet):
+    # The parsed key is kept on the wallet itself, so it is freed with the wallet instead of in a module-level cache
+    private_key = getattr(wallet, "_coincurve_key", None)
+    if private_key is None:
+        assert coincurve is not None
+        private_key = coincurve.PrivateKey(bytes(wallet.key))
+        try:
+            wallet._coincurve_key = private_key
+        except AttributeError:
+            pass
+    return private_key
+
+
+def sign_hash(wallet, digest):
+    if coincurve is not None:
+        signature = _coincurve_key(wallet).sign_recoverable(digest, hasher=None)
+        r, s, v = int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:64], "big"), signature[64]
+    else:
+        signature = keys.PrivateKey(bytes(wallet.key)).sign_msg_hash(digest)
+        r, s, v = signature.r, signature.s, signature.v
+    return {"r": to_hex(r), "s": to_hex(s), "v": v + 27}
+
+
 def user_signed_payload(primary_type, payload_types, action):
     chain_id = int(action["signatureChainId"], 16)
     return {
@@ -220,9 +307,7 @@ def user_signed_payload(primary_type, payload_types, action):
 
 def sign_l1_action(wallet, action, active_pool, nonce, expires_after, is_mainnet):
     hash = action_hash(action, active_pool, nonce, expires_after)
-    phantom_agent = construct_phantom_agent(hash, is_mainnet)
-    data = l1_payload(phantom_agent)
-    return sign_inner(wallet, data)
+    return sign_hash(wallet, l1_action_digest(hash, is_mainnet))
 
 
 def sign_user_signed_action(wallet, action, payload_types, primary_type, is_mainnet):
@@ -293,6 +378,14 @@ def sign_multi_sig_l1_action_payload(
     )
 
 
+def multi_sig_l1_action_payload_digest(
+    action, is_mainnet, vault_address, timestamp, expires_after, payload_multi_sig_user, outer_signer
+):
+    """Digest signed by sign_multi_sig_l1_action_payload. It is the same for every signer of the multi-sig user."""
+    envelope = [payload_multi_sig_user.lower(), outer_signer.lower(), action]
+    return l1_action_digest(action_hash(envelope, vault_address, timestamp, expires_after), is_mainnet)
+
+
 def sign_multi_sig_action(wallet, action, is_mainnet, vault_address, nonce, expires_after):
     action_without_tag = action.copy()
     del action_without_tag["type"]
@@ -416,13 +509,20 @@ def sign_inner(wallet, data):
     return {"r": to_hex(signed["r"]), "s": to_hex(signed["s"]), "v": signed["v"]}
 
 
+def recover_from_hash(digest, signature):
+    """Recover the checksummed signer address of a signature produced by sign_hash."""
+    r, s, v = int(signature["r"], 16), int(signature["s"], 16), signature["v"] - 27
+    if coincurve is not None:
+        compact = r.to_bytes(32, "big") + s.to_bytes(32, "big") + bytes([v])
+        public_key = coincurve.PublicKey.from_signature_and_message(compact, digest, hasher=None).format(False)[1:]
+    else:
+        public_key = keys.Signature(vrs=(v, r, s)).recover_public_key_from_msg_hash(digest).to_bytes()
+    return to_checksum_address(keccak(public_key)[-20:])
+
+
 def recover_agent_or_user_from_l1_action(action, signature, active_pool, nonce, expires_after, is_mainnet):
     hash = action_hash(action, active_pool, nonce, expires_after)
-    phantom_agent = construct_phantom_agent(hash, is_mainnet)
-    data = l1_payload(phantom_agent)
-    structured_data = encode_typed_data(full_message=data)
-    address = Account.recover_message(structured_data, vrs=[signature["v"], signature["r"], signature["s"]])
-    return address
+    return recover_from_hash(l1_action_digest(hash, is_mainnet), signature)
 
 
 def recover_user_from_user_signed_action(action, signature, payload_types, primary_type, is_mainnet):
@@ -434,13 +534,29 @@ def recover_user_from_user_signed_action(action, signature, payload_types, prima
 
 
 def float_to_wire(x: float) -> str:
+    if x == 0 and math.copysign(1.0, x) < 0:
+        # -0.0 compares equal to 0.0, so it must not share their cache entry
+        return _float_to_wire(x)
+    return _float_to_wire_cached(x)
+
+
+def _float_to_wire(x: float) -> str:
     rounded = f"{x:.8f}"
     if abs(float(rounded) - x) >= 1e-12:
         raise ValueError("float_to_wire causes rounding", x)
-    if rounded == "-0":
-        rounded = "0"
-    normalized = Decimal(rounded).normalize()
-    return f"{normalized:f}"
+    # Stripping trailing zeros gives the same string as f"{Decimal(rounded).normalize():f}"
+    return rounded.rstrip("0").rstrip(".")
+
+
+# Grid prices and sizes repeat constantly, so their wire strings are cached
+_float_to_wire_cached = lru_cache(maxsize=65536)(_float_to_wire)
+
+
+def floats_to_wire(values: List[float]) -> List[str]:
+    """float_to_wire for a whole ladder of prices or sizes in one pass over the shared wire-string cache."""
+    cached = _float_to_wire_cached
+    # Zeros skip the cache, where 0.0 and -0.0 would share an entry
+    return [cached(x) if x else float_to_wire(x) for x in values]
 
 
 def float_to_int_for_hashing(x: float) -> int:
@@ -477,6 +593,26 @@ def order_request_to_order_wire(order: OrderRequest, asset: int) -> OrderWire:
     return order_wire
 
 
+def order_requests_to_order_wires(order_requests: List[OrderRequest], assets: List[int]) -> List[OrderWire]:
+    """order_request_to_order_wire for a batch, formatting the prices and the sizes with floats_to_wire."""
+    prices = floats_to_wire([order["limit_px"] for order in order_requests])
+    sizes = floats_to_wire([order["sz"] for order in order_requests])
+    order_wires = []
+    for order, asset, price, size in zip(order_requests, assets, prices, sizes):
+        order_wire: OrderWire = {
+            "a": asset,
+            "b": order["is_buy"],
+            "p": price,
+            "s": size,
+            "r": order["reduce_only"],
+            "t": order_type_to_wire(order["order_type"]),
+        }
+        if "cloid" in order and order["cloid"] is not None:
+            order_wire["c"] = order["cloid"].to_raw()
+        order_wires.append(order_wire)
+    return order_wires
+
+
 def order_wires_to_order_action(order_wires, builder=None):
     action = {
         "type": "order",
@@ -0,0 +1,208 @@
+import logging
+import threading
+import time
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+from hyperliquid.utils.types import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+# Idle keep-alive connections are dropped by the server or load balancer after a while, and the next order then pays
+# for a new TCP and TLS handshake. Pinging well inside that window keeps a warm connection in the pool.
+DEFAULT_KEEPALIVE_INTERVAL = 15.0
+# Without a timeout a request to an unresponsive server blocks its thread forever
+DEFAULT_TIMEOUT = 10.0
+
+
+class TransportMetrics:
+    """Counts and timings of connection setup (TCP + TLS) and teardown for one transport."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.connect_seconds_total = 0.0
+        self.connect_seconds_max = 0.0
+        self.last_connect_seconds = 0.0
+        self.closes = 0
+        self.close_seconds_total = 0.0
+        self.pings = 0
+        self.ping_failures = 0
+
+    def record_connect(self, seconds: float) -> None:
+        with self._lock:
+            self.connects += 1
+            self.connect_seconds_total += seconds
+            self.connect_seconds_max = max(self.connect_seconds_max, seconds)
+            self.last_connect_seconds = seconds
+
+    def record_close(self, seconds: float) -> None:
+        with self._lock:
+            self.closes += 1
+            self.close_seconds_total += seconds
+
+    def record_ping(self, ok: bool) -> None:
+        with self._lock:
+            self.pings += 1
+            if not ok:
+                self.ping_failures += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "connect_seconds_total": self.connect_seconds_total,
+                "connect_seconds_avg": self.connect_seconds_total / self.connects if self.connects else 0.0,
+                "connect_seconds_max": self.connect_seconds_max,
+                "last_connect_seconds": self.last_connect_seconds,
+                "closes": self.closes,
+                "close_seconds_total": self.close_seconds_total,
+                "pings": self.pings,
+                "ping_failures": self.ping_failures,
+            }
+
+
+class _TimedConnectionMixin:
+    metrics: TransportMetrics
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()  # type: ignore
+        self.metrics.record_connect(time.perf_counter() - start)
+
+    def close(self):
+        if getattr(self, "sock", None) is None:
+            return super().close()  # type: ignore
+        start = time.perf_counter()
+        super().close()  # type: ignore
+        self.metrics.record_close(time.perf_counter() - start)
+
+
+@lru_cache(maxsize=None)
+def _timed_connection_class(base: type, metrics: TransportMetrics) -> type:
+    return type(f"Timed{base.__name__}", (_TimedConnectionMixin, base), {"metrics": metrics})
+
+
+class _TimedPoolMixin:
+    metrics: TransportMetrics
+
+    def _new_conn(self):
+        # Subclass whatever connection class the pool type has right now rather than a fixed one, so libraries that
+        # patch the urllib3 connection classes (e.g. vcrpy in the tests) keep working.
+        base: type = getattr(type(self), "ConnectionCls")
+        self.ConnectionCls = _timed_connection_class(base, self.metrics)
+        return super()._new_conn()  # type: ignore
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connections report setup and teardown times to a TransportMetrics."""
+
+    def __init__(self, metrics: TransportMetrics, **kwargs: Any):
+        self.metrics = metrics
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"metrics": self.metrics}
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("TimedHTTPConnectionPool", (_TimedPoolMixin, HTTPConnectionPool), attrs),
+            "https": type("TimedHTTPSConnectionPool", (_TimedPoolMixin, HTTPSConnectionPool), attrs),
+        }
+
+
+class Transport:
+    """A pooled requests session for one base URL, shared by every API client talking to it.
+
+    Connection failures before a request is sent are retried by the adapter; requests that may have reached the
+    server are never resent. Requests give up after timeout seconds unless post is given another timeout. With
+    keepalive_interval set, a background thread sends a HEAD request whenever the
+    session has been idle that long, so the next real request finds an open connection.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        keepalive_interval: Optional[float] = DEFAULT_KEEPALIVE_INTERVAL,
+        connect_retries: int = 2,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.keepalive_interval = keepalive_interval
+        self.metrics = TransportMetrics()
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        retries = Retry(total=connect_retries, connect=connect_retries, read=0, redirect=0, status=0, other=0)
+        adapter = PooledHTTPAdapter(
+            self.metrics, pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retries
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._last_used = 0.0
+        self._stop_event = threading.Event()
+        self._keepalive_thread: Optional[threading.Thread] = None
+        self._keepalive_lock = threading.Lock()
+
+    def post(self, url: str, payload: Any, timeout: Optional[float] = None, **kwargs: Any) -> requests.Response:
+        self._ensure_keepalive()
+        try:
+            return self.session.post(url, json=payload, timeout=timeout or self.timeout, **kwargs)
+        finally:
+            self._last_used = time.monotonic()
+
+    def warm_up(self) -> None:
+        """Open a connection now instead of on the first real request."""
+        self.ping()
+
+    def ping(self) -> bool:
+        try:
+            self.session.head(self.base_url, timeout=5)
+            ok = True
+        except requests.RequestException as e:
+            logger.debug(f"Keep-alive ping to {self.base_url} failed: {e}")
+            ok = False
+        self._last_used = time.monotonic()
+        self.metrics.record_ping(ok)
+        return ok
+
+    def _ensure_keepalive(self) -> None:
+        if self.keepalive_interval is None or self._keepalive_thread is not None:
+            return
+        with self._keepalive_lock:
+            if self._keepalive_thread is None:
+                self._keepalive_thread = threading.Thread(target=self._keepalive_loop, name="keepalive", daemon=True)
+                self._keepalive_thread.start()
+
+    def _keepalive_loop(self) -> None:
+        assert self.keepalive_interval is not None
+        while not self._stop_event.wait(self.keepalive_interval / 2):
+            if time.monotonic() - self._last_used >= self.keepalive_interval:
+                self.ping()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        self.session.close()
+
+
+_transports: Dict[str, Transport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(base_url: str, **options: Any) -> Transport:
+    """Return the process-wide Transport for base_url, creating it with options on first use."""
+    with _transports_lock:
+        transport = _transports.get(base_url)
+        if transport is None:
+            transport = Transport(base_url, **options)
+            _transports[base_url] = transport
+        elif options:
+            logger.warning(f"Transport for {base_url} already exists, ignoring options {sorted(options)}")
+        return transport
@@ -1,13 +1,33 @@
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Literal, NamedTuple, Optional, Tuple, TypedDict, Union, cast
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+    Union,
+    cast,
+)
 from typing_extensions import NotRequired
 
 Any = Any
 Option = Optional
 cast = cast
 Callable = Callable
+Deque = Deque
+FrozenSet = FrozenSet
+Iterator = Iterator
 NamedTuple = NamedTuple
+Set = Set
 NotRequired = NotRequired
 
 AssetInfo = TypedDict("AssetInfo", {"name": str, "szDecimals": int})
@@ -121,6 +141,11 @@ UserEventsData = TypedDict("UserEventsData", {"fills": List[Fill]}, total=False)
 UserEventsMsg = TypedDict("UserEventsMsg", {"channel": Literal["user"], "data": UserEventsData})
 UserFillsData = TypedDict("UserFillsData", {"user": str, "isSnapshot": bool, "fills": List[Fill]})
 UserFillsMsg = TypedDict("UserFillsMsg", {"channel": Literal["userFills"], "data": UserFillsData})
+PostResponse = TypedDict(
+    "PostResponse", {"type": Union[Literal["info"], Literal["action"], Literal["error"]], "payload": Any}
+)
+PostMsgData = TypedDict("PostMsgData", {"id": int, "response": PostResponse})
+PostMsg = TypedDict("PostMsg", {"channel": Literal["post"], "data": PostMsgData})
 OtherWsMsg = TypedDict(
     "OtherWsMsg",
     {
@@ -142,6 +167,7 @@ WsMsg = Union[
     TradesMsg,
     UserEventsMsg,
     PongMsg,
+    PostMsg,
     UserFillsMsg,
     OtherWsMsg,
     ActiveAssetCtxMsg,
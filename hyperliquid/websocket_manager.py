@@ -1,11 +1,32 @@
 import json
 import logging
 import threading
+import time
 from collections import defaultdict
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
 import websocket
 
-from hyperliquid.utils.types import Any, Callable, Dict, List, NamedTuple, Optional, Subscription, Tuple, WsMsg
+from hyperliquid.utils.delivery import DELIVERY_MODES, DeliveryWorker
+from hyperliquid.utils.error import WsPostError, WsPostNotSentError, WsPostOutcomeUnknownError
+from hyperliquid.utils.feed_stats import FeedStats
+from hyperliquid.ws_recorder import WsRecorder
+from hyperliquid.utils.types import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    PostMsgData,
+    Subscription,
+    Tuple,
+    WsMsg,
+)
+
+# Channels whose messages do not say which user they belong to
+USER_CHANNELS = ("userEvents", "orderUpdates")
 
 ActiveSubscription = NamedTuple("ActiveSubscription", [("callback", Callable[[Any], None]), ("subscription_id", int)])
 
@@ -40,6 +61,8 @@ def subscription_to_identifier(subscription: Subscription) -> str:
 def ws_msg_to_identifier(ws_msg: WsMsg) -> Optional[str]:
     if ws_msg["channel"] == "pong":
         return "pong"
+    elif ws_msg["channel"] == "post":
+        return "post"
     elif ws_msg["channel"] == "allMids":
         return "allMids"
     elif ws_msg["channel"] == "l2Book":
@@ -77,11 +100,38 @@ class WebsocketManager(threading.Thread):
         self.ws_ready = False
         self.queued_subscriptions: List[Tuple[Subscription, ActiveSubscription]] = []
         self.active_subscriptions: Dict[str, List[ActiveSubscription]] = defaultdict(list)
+        # The user whose userEvents/orderUpdates feed this connection carries
+        self.user_channel_owners: Dict[str, str] = {}
+        self.post_id_counter = 0
+        self.pending_posts: Dict[int, "Future[Any]"] = {}
+        self.post_lock = threading.Lock()
+        self.recorder: Optional[WsRecorder] = None
+        self.feed_stats = FeedStats()
         ws_url = "ws" + base_url[len("http") :] + "/ws"
-        self.ws = websocket.WebSocketApp(ws_url, on_message=self.on_message, on_open=self.on_open)
+        self.ws = websocket.WebSocketApp(
+            ws_url, on_message=self.on_message, on_open=self.on_open, on_close=self.on_close
+        )
         self.ping_sender = threading.Thread(target=self.send_ping)
         self.stop_event = threading.Event()
 
+    @classmethod
+    def offline(cls) -> "WebsocketManager":
+        """A manager that accepts subscriptions without connecting, e.g. to receive replayed messages."""
+        manager = cls("https://replay.invalid")
+        manager.ws_ready = True
+        manager.ws.send = lambda *args, **kwargs: None  # type: ignore[method-assign]
+        return manager
+
+    def start_recording(self, path: str, compress: Optional[bool] = None, flush_interval: float = 1.0) -> WsRecorder:
+        """Append every received message to path; see hyperliquid.ws_recorder for the format and replay."""
+        self.recorder = WsRecorder(path, compress, flush_interval)
+        return self.recorder
+
+    def stop_recording(self) -> None:
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+
     def run(self):
         self.ping_sender.start()
         self.ws.run_forever()
@@ -91,6 +141,7 @@ class WebsocketManager(threading.Thread):
             if not self.ws.keep_running:
                 break
             logging.debug("Websocket sending ping")
+            self.feed_stats.record_ping()
             self.ws.send(json.dumps({"method": "ping"}))
         logging.debug("Websocket ping sender stopped")
 
@@ -99,8 +150,16 @@ class WebsocketManager(threading.Thread):
         self.ws.close()
         if self.ping_sender.is_alive():
             self.ping_sender.join()
+        for active_subscriptions in self.active_subscriptions.values():
+            for active_subscription in active_subscriptions:
+                if isinstance(active_subscription.callback, DeliveryWorker):
+                    active_subscription.callback.stop()
 
     def on_message(self, _ws, message):
+        received_at = time.time()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(message, received_at)
         if message == "Websocket connection established.":
             logging.debug(message)
             return
@@ -109,10 +168,15 @@ class WebsocketManager(threading.Thread):
         identifier = ws_msg_to_identifier(ws_msg)
         if identifier == "pong":
             logging.debug("Websocket received pong")
+            self.feed_stats.record_pong()
+            return
+        if ws_msg["channel"] == "post":
+            self.resolve_post(ws_msg["data"])
             return
         if identifier is None:
             logging.debug("Websocket not handling empty message")
             return
+        self.feed_stats.record(identifier, ws_msg, received_at)
         active_subscriptions = self.active_subscriptions[identifier]
         if len(active_subscriptions) == 0:
             print("Websocket message from an unexpected subscription:", message, identifier)
@@ -126,24 +190,117 @@ class WebsocketManager(threading.Thread):
         for subscription, active_subscription in self.queued_subscriptions:
             self.subscribe(subscription, active_subscription.callback, active_subscription.subscription_id)
 
+    def on_close(self, _ws, close_status_code=None, close_msg=None):
+        logging.debug(f"on_close {close_status_code} {close_msg}")
+        self.ws_ready = False
+        with self.post_lock:
+            pending = list(self.pending_posts.values())
+            self.pending_posts.clear()
+        for future in pending:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(WsPostOutcomeUnknownError("Websocket closed before the post response arrived"))
+
+    def post_async(self, request_type: str, payload: Any) -> "Future[Any]":
+        """Send an info request (request_type "info") or a signed action ("action") over the websocket.
+
+        The returned future resolves to the response data, i.e. what the HTTP /info or /exchange endpoint
+        would return, or fails with WsPostError. WsPostNotSentError means the request never left this process;
+        WsPostOutcomeUnknownError means it was sent but the connection closed before the response arrived.
+        """
+        future: "Future[Any]" = Future()
+        if not self.ws_ready:
+            future.set_exception(WsPostNotSentError("Websocket not connected"))
+            return future
+        with self.post_lock:
+            self.post_id_counter += 1
+            post_id = self.post_id_counter
+            self.pending_posts[post_id] = future
+
+        # Drops the entry when the caller cancels the future as well as when it resolves
+        def forget(_: "Future[Any]") -> None:
+            with self.post_lock:
+                self.pending_posts.pop(post_id, None)
+
+        future.add_done_callback(forget)
+        try:
+            self.ws.send(
+                json.dumps({"method": "post", "id": post_id, "request": {"type": request_type, "payload": payload}})
+            )
+        except Exception as e:
+            future.set_exception(WsPostNotSentError(f"Websocket send failed: {e}"))
+        return future
+
+    def post(self, request_type: str, payload: Any, timeout: Optional[float] = None) -> Any:
+        """post_async and wait for the response, raising WsPostOutcomeUnknownError if none arrives within timeout.
+
+        Called from the websocket thread itself, e.g. by an inline subscription callback, the response could never be
+        read while waiting, so the post is not sent and WsPostNotSentError is raised instead.
+        """
+        if threading.current_thread() is self:
+            raise WsPostNotSentError("Websocket post called from the websocket thread, which would wait for itself")
+        future = self.post_async(request_type, payload)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            raise WsPostOutcomeUnknownError(f"No post response within {timeout}s")
+        finally:
+            future.cancel()
+
+    def resolve_post(self, data: PostMsgData) -> None:
+        with self.post_lock:
+            future = self.pending_posts.pop(data["id"], None)
+        if future is None or not future.set_running_or_notify_cancel():
+            logging.debug(f"Websocket post response for unknown or cancelled request {data['id']}")
+            return
+        response = data["response"]
+        if response["type"] == "error":
+            future.set_exception(WsPostError(response["payload"]))
+        elif response["type"] == "info":
+            future.set_result(response["payload"]["data"])
+        else:
+            future.set_result(response["payload"])
+
     def subscribe(
-        self, subscription: Subscription, callback: Callable[[Any], None], subscription_id: Optional[int] = None
+        self,
+        subscription: Subscription,
+        callback: Callable[[Any], None],
+        subscription_id: Optional[int] = None,
+        delivery: str = "inline",
+        queue_size: int = 1000,
     ) -> int:
+        """Subscribe callback to a feed.
+
+        delivery "inline" runs the callback on the websocket thread. "thread" and "conflate" hand messages to a
+        DeliveryWorker with its own thread; see hyperliquid.utils.delivery for how each mode sheds load.
+        """
+        if delivery not in DELIVERY_MODES:
+            raise ValueError(f"Unknown delivery mode {delivery}")
         if subscription_id is None:
             self.subscription_id_counter += 1
             subscription_id = self.subscription_id_counter
+        identifier = subscription_to_identifier(subscription)
+        if subscription["type"] == "userEvents" or subscription["type"] == "orderUpdates":
+            # userEvents and orderUpdates messages do not include the user, so a connection can only carry one user's
+            # feed. Subscribers of that user share it; other users need their own connection, see WebsocketPool.
+            user = subscription["user"].lower()
+            owner = self.user_channel_owners.setdefault(identifier, user)
+            if owner != user:
+                raise NotImplementedError(
+                    f"Cannot subscribe to {identifier} for {user}, already subscribed for {owner}"
+                )
+        if delivery != "inline":
+            callback = DeliveryWorker(callback, delivery, queue_size, name=f"ws-{identifier}-{subscription_id}")
         if not self.ws_ready:
             logging.debug("enqueueing subscription")
             self.queued_subscriptions.append((subscription, ActiveSubscription(callback, subscription_id)))
         else:
             logging.debug("subscribing")
-            identifier = subscription_to_identifier(subscription)
-            if identifier == "userEvents" or identifier == "orderUpdates":
-                # TODO: ideally the userEvent and orderUpdates messages would include the user so that we can multiplex
-                if len(self.active_subscriptions[identifier]) != 0:
-                    raise NotImplementedError(f"Cannot subscribe to {identifier} multiple times")
-            self.active_subscriptions[identifier].append(ActiveSubscription(callback, subscription_id))
-            self.ws.send(json.dumps({"method": "subscribe", "subscription": subscription}))
+            active_subscriptions = self.active_subscriptions[identifier]
+            active_subscriptions.append(ActiveSubscription(callback, subscription_id))
+            # Later subscribers to a user channel share its one upstream subscription. Other feeds are subscribed
+            # again so the new subscriber gets the initial snapshot (l2Book, userFills, webData2, ...).
+            if identifier not in USER_CHANNELS or len(active_subscriptions) == 1:
+                self.ws.send(json.dumps({"method": "subscribe", "subscription": subscription}))
         return subscription_id
 
     def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
@@ -154,5 +311,24 @@ class WebsocketManager(threading.Thread):
         new_active_subscriptions = [x for x in active_subscriptions if x.subscription_id != subscription_id]
         if len(new_active_subscriptions) == 0:
             self.ws.send(json.dumps({"method": "unsubscribe", "subscription": subscription}))
+            self.user_channel_owners.pop(identifier, None)
         self.active_subscriptions[identifier] = new_active_subscriptions
+        for active_subscription in active_subscriptions:
+            if active_subscription.subscription_id == subscription_id and isinstance(
+                active_subscription.callback, DeliveryWorker
+            ):
+                active_subscription.callback.stop()
         return len(active_subscriptions) != len(new_active_subscriptions)
+
+    def delivery_stats(self) -> Dict[int, Dict[str, Any]]:
+        """Delivered, pending, dropped and conflated message counts per threaded or conflating subscription."""
+        return {
+            active_subscription.subscription_id: active_subscription.callback.stats()
+            for active_subscriptions in list(self.active_subscriptions.values())
+            for active_subscription in active_subscriptions
+            if isinstance(active_subscription.callback, DeliveryWorker)
+        }
+
+    def feed_health(self, subscription: Subscription) -> Dict[str, Any]:
+        """Rolling lag, gap, rate and ping statistics of a subscription's feed, see FeedStats.snapshot."""
+        return self.feed_stats.snapshot(subscription_to_identifier(subscription))
@@ -0,0 +1,204 @@
+import logging
+import threading
+import zlib
+
+from hyperliquid.utils.types import Any, Callable, Dict, List, NamedTuple, Optional, Subscription, Tuple
+from hyperliquid.websocket_manager import USER_CHANNELS, WebsocketManager, subscription_to_identifier
+
+PooledSubscription = NamedTuple(
+    "PooledSubscription",
+    [
+        ("subscription", Subscription),
+        ("callback", Callable[[Any], None]),
+        ("key", str),
+        ("shard", int),
+        ("local_id", int),
+    ],
+)
+
+
+class WebsocketPool:
+    """Spreads subscriptions over several websocket connections, with the WebsocketManager subscribe API.
+
+    Subscriptions with the same identifier always share a connection. New identifiers go to a connection chosen by
+    a hash of the identifier (shard_by="identifier") or of the channel type (shard_by="channel"), so e.g. all l2Book
+    feeds can share one socket while trades use another. userEvents and orderUpdates of different users are kept on
+    different connections, and the pool opens another connection when every one already carries another user's
+    feed. A monitor thread notices connections whose socket died, moves their subscriptions onto the live
+    connections and opens a replacement.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        size: int = 4,
+        shard_by: str = "identifier",
+        monitor_interval: float = 1.0,
+        manager_factory: Callable[[str], WebsocketManager] = WebsocketManager,
+    ):
+        if size < 1:
+            raise ValueError("A websocket pool needs at least one connection")
+        if shard_by not in ("identifier", "channel"):
+            raise ValueError(f"Unknown shard_by {shard_by}")
+        self.base_url = base_url
+        self.shard_by = shard_by
+        self.monitor_interval = monitor_interval
+        self.manager_factory = manager_factory
+        self.managers: List[WebsocketManager] = [manager_factory(base_url) for _ in range(size)]
+        self._lock = threading.RLock()
+        self._subscriptions: Dict[int, PooledSubscription] = {}
+        self._shards_by_key: Dict[str, int] = {}
+        self._subscription_id_counter = 0
+        self._started = False
+        self._stop_event = threading.Event()
+        self._monitor = threading.Thread(target=self._monitor_loop, name="ws-pool-monitor", daemon=True)
+        self.reconnects = 0
+
+    def start(self) -> None:
+        self._started = True
+        for manager in self.managers:
+            manager.start()
+        self._monitor.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        for manager in self.managers:
+            manager.stop()
+
+    def _live_shards(self) -> List[int]:
+        shards = [i for i, manager in enumerate(self.managers) if manager.is_alive()]
+        return shards or list(range(len(self.managers)))
+
+    def _pick_shard(self, subscription: Subscription, key: str) -> int:
+        identifier = subscription_to_identifier(subscription)
+        shards = self._live_shards()
+        if identifier in USER_CHANNELS:
+            taken = {shard for k, shard in self._shards_by_key.items() if k.startswith(f"{identifier}:")}
+            shards = [shard for shard in shards if shard not in taken] or [
+                shard for shard in range(len(self.managers)) if shard not in taken
+            ]
+            if not shards:
+                return self._add_connection()
+        hash_key = key if self.shard_by == "identifier" else subscription["type"]
+        return shards[zlib.crc32(hash_key.encode()) % len(shards)]
+
+    def _add_connection(self) -> int:
+        manager = self.manager_factory(self.base_url)
+        self.managers.append(manager)
+        if self._started:
+            manager.start()
+        return len(self.managers) - 1
+
+    @staticmethod
+    def _pool_key(subscription: Subscription) -> str:
+        identifier = subscription_to_identifier(subscription)
+        if subscription["type"] == "userEvents" or subscription["type"] == "orderUpdates":
+            return f'{identifier}:{subscription["user"].lower()}'
+        return identifier
+
+    def subscribe(
+        self,
+        subscription: Subscription,
+        callback: Callable[[Any], None],
+        delivery: str = "inline",
+        queue_size: int = 1000,
+    ) -> int:
+        key = self._pool_key(subscription)
+        with self._lock:
+            shard = self._shards_by_key.get(key)
+            if shard is None:
+                shard = self._pick_shard(subscription, key)
+            local_id = self.managers[shard].subscribe(subscription, callback, delivery=delivery, queue_size=queue_size)
+            self._shards_by_key[key] = shard
+            # Keep the callback the manager actually registered, so a move does not wrap it in a second worker
+            registered = self._registered_callback(shard, subscription_to_identifier(subscription), local_id, callback)
+            self._subscription_id_counter += 1
+            subscription_id = self._subscription_id_counter
+            self._subscriptions[subscription_id] = PooledSubscription(subscription, registered, key, shard, local_id)
+            return subscription_id
+
+    def _registered_callback(
+        self, shard: int, identifier: str, local_id: int, default: Callable[[Any], None]
+    ) -> Callable[[Any], None]:
+        manager = self.managers[shard]
+        candidates = list(manager.active_subscriptions.get(identifier, [])) + [
+            active for _, active in manager.queued_subscriptions
+        ]
+        for active in candidates:
+            if active.subscription_id == local_id:
+                return active.callback
+        return default
+
+    def unsubscribe(self, subscription: Subscription, subscription_id: int) -> bool:
+        with self._lock:
+            pooled = self._subscriptions.pop(subscription_id, None)
+            if pooled is None:
+                return False
+            removed = self.managers[pooled.shard].unsubscribe(pooled.subscription, pooled.local_id)
+            if not any(s.key == pooled.key for s in self._subscriptions.values()):
+                self._shards_by_key.pop(pooled.key, None)
+            return removed
+
+    def post(self, request_type: str, payload: Any, timeout: Optional[float] = None) -> Any:
+        return self.managers[self._live_shards()[0]].post(request_type, payload, timeout)
+
+    def delivery_stats(self) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            stats_by_shard = [m.delivery_stats() for m in self.managers]
+            return {
+                subscription_id: stats_by_shard[s.shard][s.local_id]
+                for subscription_id, s in self._subscriptions.items()
+                if s.local_id in stats_by_shard[s.shard]
+            }
+
+    def feed_health(self, subscription: Subscription) -> Dict[str, Any]:
+        """Feed statistics from the connection carrying subscription, see WebsocketManager.feed_health."""
+        with self._lock:
+            shard = self._shards_by_key.get(self._pool_key(subscription), 0)
+            return self.managers[shard].feed_health(subscription)
+
+    def shard_sizes(self) -> List[int]:
+        with self._lock:
+            sizes = [0] * len(self.managers)
+            for s in self._subscriptions.values():
+                sizes[s.shard] += 1
+            return sizes
+
+    def _monitor_loop(self) -> None:
+        while not self._stop_event.wait(self.monitor_interval):
+            for shard, manager in enumerate(list(self.managers)):
+                if not manager.is_alive() and not self._stop_event.is_set():
+                    self.replace_connection(shard)
+
+    def replace_connection(self, shard: int) -> None:
+        """Move the subscriptions of a closed connection onto the live ones and open a fresh connection in its place.
+
+        The replacement only receives subscriptions when no other connection is alive; otherwise it starts empty
+        and takes new identifiers as they arrive.
+        """
+        with self._lock:
+            dead = self.managers[shard]
+            logging.warning(f"Websocket connection {shard} closed, moving its subscriptions")
+            # The moved callbacks may be delivery workers, which stopping the dead manager would otherwise stop
+            dead.active_subscriptions.clear()
+            dead.queued_subscriptions.clear()
+            replacement = self.manager_factory(self.base_url)
+            self.managers[shard] = replacement
+            self.reconnects += 1
+            moved: List[Tuple[int, PooledSubscription]] = [
+                (i, s) for i, s in self._subscriptions.items() if s.shard == shard
+            ]
+            for key in {s.key for _, s in moved}:
+                del self._shards_by_key[key]
+            for subscription_id, s in moved:
+                target = self._shards_by_key.get(s.key)
+                if target is None:
+                    target = self._pick_shard(s.subscription, s.key)
+                    self._shards_by_key[s.key] = target
+                local_id = self.managers[target].subscribe(s.subscription, s.callback)
+                self._subscriptions[subscription_id] = s._replace(shard=target, local_id=local_id)
+        try:
+            dead.stop()
+        except Exception as e:
+            logging.debug(f"Stopping closed websocket connection failed: {e}")
+        replacement.start()
@@ -0,0 +1,109 @@
+import struct
+import threading
+import time
+
+from hyperliquid.utils.types import Any, Dict, Iterator, Optional, Tuple
+
+try:
+    import lz4.frame
+except ImportError:  # only needed for compressed recordings
+    lz4 = None
+
+# Each frame is the receive time (unix seconds, float64) and payload length (uint32), then the raw message bytes
+FRAME_HEADER = struct.Struct(">dI")
+
+
+def _open(path: str, mode: str, compress: Optional[bool]) -> Any:
+    if compress is None:
+        compress = path.endswith(".lz4")
+    if not compress:
+        return open(path, mode)
+    if lz4 is None:
+        raise ImportError("lz4 is required for compressed websocket recordings")
+    return lz4.frame.open(path, mode)
+
+
+class WsRecorder:
+    """Appends raw websocket messages with their receive timestamps to a file.
+
+    Frames are length-prefixed (see FRAME_HEADER), and the file is lz4 frame compressed when its name ends in
+    .lz4 or compress is set. Appending to an existing recording adds a new lz4 frame, which readers handle
+    transparently, so a recording can be resumed across restarts. The file is flushed at most flush_interval
+    seconds after a message is recorded (0 flushes every message), so a crash loses at most that much; each
+    flush also ends an lz4 block, which is why compressed recordings should not flush every message.
+    """
+
+    def __init__(self, path: str, compress: Optional[bool] = None, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        self._file = _open(path, "ab", compress)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._last_flush = time.monotonic()
+        self.frames = 0
+
+    def record(self, message: str, received_at: Optional[float] = None) -> None:
+        data = message.encode() if isinstance(message, str) else message
+        header = FRAME_HEADER.pack(time.time() if received_at is None else received_at, len(data))
+        with self._lock:
+            # The websocket thread may still be delivering a message when the recording is stopped
+            if self._closed:
+                return
+            self._file.write(header + data)
+            self.frames += 1
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._file.close()
+
+
+def read_frames(path: str, compress: Optional[bool] = None) -> Iterator[Tuple[float, str]]:
+    """Yield (receive time, message) for every frame in a recording.
+
+    A frame cut off at the end of the file, e.g. because the recorder was killed, ends the iteration.
+    """
+    with _open(path, "rb", compress) as f:
+        while True:
+            try:
+                header = f.read(FRAME_HEADER.size)
+                if len(header) < FRAME_HEADER.size:
+                    return
+                received_at, length = FRAME_HEADER.unpack(header)
+                data = f.read(length)
+            except EOFError:
+                return
+            if len(data) < length:
+                return
+            yield received_at, data.decode()
+
+
+def replay(
+    path: str, ws_manager: Any, speed: Optional[float] = None, compress: Optional[bool] = None
+) -> Dict[str, Any]:
+    """Feed a recording through ws_manager.on_message, the same dispatch path live messages take.
+
+    With speed set, messages are paced at that multiple of the recorded rate (1.0 is real time); with None they
+    are delivered as fast as the callbacks consume them. Returns the frame count and the callbacks' throughput.
+    Use WebsocketManager.offline() to subscribe callbacks without connecting anywhere.
+    """
+    frames = 0
+    first_received = None
+    start = time.perf_counter()
+    for received_at, message in read_frames(path, compress):
+        if speed is not None:
+            if first_received is None:
+                first_received = received_at
+            delay = (received_at - first_received) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        ws_manager.on_message(None, message)
+        frames += 1
+    elapsed = time.perf_counter() - start
+    return {"frames": frames, "seconds": elapsed, "frames_per_second": frames / elapsed if elapsed > 0 else 0.0}
@@ -0,0 +1,67 @@
+from hyperliquid.account_state import AccountState
+from hyperliquid.info import Info
+from hyperliquid.utils.types import cast
+
+CLEARINGHOUSE_STATE = {
+    "assetPositions": [
+        {
+            "position": {
+                "coin": "ETH",
+                "szi": "-0.5",
+                "entryPx": "2000.0",
+                "unrealizedPnl": "12.5",
+                "marginUsed": "100.0",
+                "liquidationPx": None,
+            },
+            "type": "oneWay",
+        }
+    ],
+    "marginSummary": {"accountValue": "1000.0", "totalMarginUsed": "100.0", "totalNtlPos": "987.5"},
+    "withdrawable": "900.0",
+}
+OPEN_ORDERS = [{"coin": "ETH", "oid": 7, "side": "B", "limitPx": "1900.0", "sz": "0.1", "timestamp": 1}]
+
+
+class FakeInfo:
+    def __init__(self):
+        self.requests = []
+
+    def user_state(self, address):
+        self.requests.append("clearinghouseState")
+        return CLEARINGHOUSE_STATE
+
+    def open_orders(self, address):
+        self.requests.append("openOrders")
+        return OPEN_ORDERS
+
+    def spot_user_state(self, address):
+        self.requests.append("spotClearinghouseState")
+        return {"balances": [{"coin": "USDC", "total": "50.0", "hold": "0.0"}]}
+
+
+def test_reads_come_from_web_data2_without_rest_calls():
+    info = FakeInfo()
+    state = AccountState(cast(Info, info), "0x0")
+    web_data2 = {
+        "clearinghouseState": CLEARINGHOUSE_STATE,
+        "openOrders": OPEN_ORDERS,
+        "spotState": {"balances": [{"coin": "USDC", "total": "75.0", "hold": "0.0"}]},
+    }
+    state.on_web_data2({"channel": "webData2", "data": web_data2})
+
+    assert state.position("ETH") == -0.5
+    assert state.position("BTC") == 0.0
+    position = state.position_info("ETH")
+    assert position is not None and position.entry_px == 2000.0
+    assert state.spot_balance("USDC") == 75.0
+    assert set(state.open_orders()) == {7} and state.open_orders()[7].is_buy
+    assert state.margin().withdrawable == 900.0
+    assert info.requests == []
+
+
+def test_falls_back_to_rest_until_the_feed_delivers():
+    info = FakeInfo()
+    state = AccountState(cast(Info, info), "0x0", max_staleness=30)
+    assert state.position("ETH") == -0.5
+    assert state.spot_balance("USDC") == 50.0
+    assert info.requests == ["clearinghouseState", "openOrders", "spotClearinghouseState"]
@@ -0,0 +1,140 @@
+"""Signing throughput benchmarks.
+
+Run with `make bench` or `python -m tests.benchmarks.signing_benchmark`. Each case is timed several times and the
+best run is compared against tests/benchmarks/signing_baseline.json; a case slower than its baseline by more than
+the tolerance is reported as a regression and the runner exits with status 1. Baselines are machine specific, so
+regenerate them with --save-baseline when the reference machine changes.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import timeit
+
+import eth_account
+
+from hyperliquid.utils.signing import (
+    OrderRequest,
+    action_hash,
+    float_to_wire,
+    floats_to_wire,
+    order_request_to_order_wire,
+    order_requests_to_order_wires,
+    order_wires_to_order_action,
+    sign_l1_action,
+    sign_usd_transfer_action,
+)
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "signing_baseline.json")
+BATCH_SIZES = [1, 10, 100, 1000]
+NONCE = 1677777606040
+WALLET = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
+
+
+def order_requests(n):
+    orders = []
+    for i in range(n):
+        order: OrderRequest = {
+            "coin": "ETH",
+            "is_buy": i % 2 == 0,
+            "sz": 0.0147,
+            "limit_px": round(1670.1 + i * 0.1, 1),
+            "reduce_only": False,
+            "order_type": {"limit": {"tif": "Gtc"}},
+        }
+        orders.append(order)
+    return orders
+
+
+def order_action(n):
+    return order_wires_to_order_action([order_request_to_order_wire(o, 4) for o in order_requests(n)])
+
+
+def cancel_action(n):
+    return {"type": "cancel", "cancels": [{"a": 4, "o": 1000000 + i} for i in range(n)]}
+
+
+def modify_action(n):
+    wires = [order_request_to_order_wire(o, 4) for o in order_requests(n)]
+    return {"type": "batchModify", "modifies": [{"oid": 1000000 + i, "order": w} for i, w in enumerate(wires)]}
+
+
+def cases():
+    """Yield (name, number of orders in the batch, callable) for every benchmark case."""
+    for n in BATCH_SIZES:
+        orders = order_requests(n)
+        actions = {"order": order_action(n), "cancel": cancel_action(n), "modify": modify_action(n)}
+        yield f"build_order_wires[{n}]", n, lambda orders=orders: [order_request_to_order_wire(o, 4) for o in orders]
+        yield f"build_order_wires_batch[{n}]", n, lambda orders=orders: order_requests_to_order_wires(orders, [4] * n)
+        for kind, action in actions.items():
+            # Every real action gets a fresh nonce
+            nonces = itertools.count(NONCE)
+            yield f"action_hash_{kind}[{n}]", n, lambda action=action, nonces=nonces: action_hash(
+                action, None, next(nonces), None
+            )
+            yield f"sign_l1_{kind}[{n}]", n, lambda action=action, nonces=nonces: sign_l1_action(
+                WALLET, action, None, next(nonces), None, True
+            )
+    usd_send = {"destination": "0x5e9ee1089755c3435139848e47e6635505d5a13a", "amount": "1", "time": NONCE}
+    yield "sign_user_signed_usd_send", 1, lambda: sign_usd_transfer_action(WALLET, dict(usd_send), True)
+    prices = [1670.1 + i * 0.01 for i in range(1000)]
+    yield "float_to_wire[1000]", 1000, lambda: [float_to_wire(p) for p in prices]
+    yield "floats_to_wire[1000]", 1000, lambda: floats_to_wire(prices)
+
+
+def measure(fn, min_time=0.2, repeat=5):
+    """Best seconds per call, with the call count chosen so each run lasts at least min_time."""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing, 0.25 = 25%%")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this string")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    regressions = []
+    print(f"{'case':<32}{'per call':>14}{'per order':>14}{'orders/s':>14}{'vs baseline':>14}")
+    for name, n_orders, fn in cases():
+        if args.filter not in name:
+            continue
+        seconds = measure(fn)
+        results[name] = seconds
+        change = ""
+        if name in baseline and not args.save_baseline:
+            ratio = seconds / baseline[name] - 1
+            change = f"{ratio:+.1%}"
+            if ratio > args.tolerance:
+                regressions.append(name)
+                change += " !"
+        print(
+            f"{name:<32}{seconds * 1e6:>12.1f}us{seconds / n_orders * 1e6:>12.2f}us{n_orders / seconds:>14.0f}{change:>14}"
+        )
+
+    if args.save_baseline:
+        # Cases skipped by --filter keep their previous baseline
+        with open(args.baseline, "w") as f:
+            json.dump({**baseline, **results}, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+    if regressions:
+        print(f"Regressions over {args.tolerance:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from hyperliquid.candle_store import CandleStore  # noqa: E402
+from hyperliquid.info import Info  # noqa: E402
+from hyperliquid.utils.types import Meta, SpotMeta  # noqa: E402
+
+TEST_META: Meta = {"universe": [{"name": "BTC", "szDecimals": 5}]}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+MINUTE = 60_000
+
+
+def make_candle(t, close):
+    return {"t": t, "T": t + MINUTE - 1, "o": "1", "h": "2", "l": "0.5", "c": str(close), "v": "10", "n": 3, "s": "BTC"}
+
+
+def test_sync_fetches_only_the_missing_tail(tmp_path, monkeypatch):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    remote = [make_candle(i * MINUTE, i) for i in range(10)]
+    requests = []
+
+    def fake_candles_snapshot(name, interval, start_time, end_time):
+        requests.append((start_time, end_time))
+        return [c for c in remote if start_time <= c["t"] <= end_time][:4]
+
+    monkeypatch.setattr(info, "candles_snapshot", fake_candles_snapshot)
+    store = CandleStore(info, str(tmp_path))
+
+    assert store.sync("BTC", "1m", start_time=0, end_time=5 * MINUTE) == 6
+    assert requests[0] == (0, 5 * MINUTE)
+
+    # The last stored candle is refetched and replaced in place, everything after it is appended.
+    remote[5] = make_candle(5 * MINUTE, 55)
+    requests.clear()
+    assert store.sync("BTC", "1m", end_time=9 * MINUTE) == 4
+    assert requests[0][0] == 5 * MINUTE
+
+    candles = store.read("BTC", "1m")
+    assert isinstance(candles, np.memmap)
+    assert list(candles["t"]) == [i * MINUTE for i in range(10)]
+    assert candles["c"][5] == 55
+
+    window = store.read("BTC", "1m", 3 * MINUTE, 6 * MINUTE)
+    assert list(window["c"]) == [3, 4, 55, 6]
+    assert window.base is not None
@@ -0,0 +1,10 @@
+import pytest
+
+from hyperliquid.utils import request_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_info_cache():
+    # Info responses are cached per base URL across instances; cassette playback expects every request to be sent
+    request_cache.invalidate_all()
+    yield
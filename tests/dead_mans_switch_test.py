@@ -0,0 +1,75 @@
+from hyperliquid.dead_mans_switch import DeadMansSwitch
+from hyperliquid.exchange import Exchange
+from hyperliquid.utils.signing import CancelRequest
+from hyperliquid.utils.types import List, cast
+
+
+class FakeExchange:
+    def __init__(self):
+        self.presigned = []
+        self.posted = []
+        self.schedules = []
+
+    def presign_bulk_cancel(self, cancel_requests):
+        self.presigned.append(list(cancel_requests))
+        return {"action": {"type": "cancel", "cancels": cancel_requests}, "nonce": len(self.presigned)}
+
+    def post_presigned(self, presigned):
+        self.posted.append(presigned)
+        return {"status": "ok"}
+
+    def schedule_cancel(self, time):
+        self.schedules.append(time)
+
+
+def test_presigns_only_when_orders_change_and_fires_once():
+    exchange = FakeExchange()
+    orders: List[CancelRequest] = [{"coin": "ETH", "oid": 1}]
+    switch = DeadMansSwitch(cast(Exchange, exchange), lambda: orders, timeout=30, refresh_interval=10)
+
+    switch.presign()
+    switch.presign()
+    assert len(exchange.presigned) == 1
+
+    orders = [{"coin": "ETH", "oid": 1}, {"coin": "ETH", "oid": 2}]
+    switch.presign()
+    assert len(exchange.presigned) == 2
+
+    assert switch.fire() == {"status": "ok"}
+    assert exchange.posted[0]["nonce"] == 2
+    # The nonce was used, so firing again signs a new cancel
+    switch.fire()
+    assert exchange.posted[1]["nonce"] == 3
+
+    orders = []
+    assert switch.fire() is None
+
+    switch.stop()
+    assert exchange.schedules == [None]
+
+
+def test_fire_signs_orders_placed_after_the_last_presign():
+    exchange = FakeExchange()
+    orders: List[CancelRequest] = [{"coin": "ETH", "oid": 1}]
+    switch = DeadMansSwitch(cast(Exchange, exchange), lambda: orders, timeout=30, refresh_interval=10)
+    switch.presign()
+
+    orders = orders + [{"coin": "ETH", "oid": 2}]
+    switch.fire()
+    assert exchange.posted[0]["action"]["cancels"] == orders
+
+
+def test_fire_posts_the_presigned_cancel_when_orders_cannot_be_read():
+    exchange = FakeExchange()
+    orders: List[CancelRequest] = [{"coin": "ETH", "oid": 1}]
+
+    def order_source():
+        if exchange.presigned:
+            raise RuntimeError("order book unavailable")
+        return orders
+
+    switch = DeadMansSwitch(cast(Exchange, exchange), order_source, timeout=30, refresh_interval=10)
+    switch.presign()
+    switch.fire()
+    assert len(exchange.presigned) == 1
+    assert [presigned["nonce"] for presigned in exchange.posted] == [1]
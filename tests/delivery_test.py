@@ -0,0 +1,84 @@
+import threading
+import time
+
+from hyperliquid.utils.delivery import DeliveryWorker
+from hyperliquid.utils.types import Any, List
+from hyperliquid.websocket_manager import WebsocketManager
+
+
+def blocked_worker(mode, queue_size=2):
+    release = threading.Event()
+    started = threading.Event()
+    received = []
+
+    def callback(msg):
+        started.set()
+        release.wait(5)
+        received.append(msg)
+
+    return DeliveryWorker(callback, mode, queue_size), started, release, received
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.001)
+
+
+def test_thread_mode_drops_oldest_when_queue_is_full():
+    worker, started, release, received = blocked_worker("thread", queue_size=2)
+    worker(0)
+    started.wait(5)
+    for i in range(1, 5):
+        worker(i)
+    release.set()
+    wait_for(lambda: worker.delivered == 3)
+    worker.stop()
+    assert received == [0, 3, 4]
+    assert worker.stats()["dropped"] == 2
+
+
+def test_conflate_mode_delivers_only_the_latest_message():
+    worker, started, release, received = blocked_worker("conflate")
+    worker(0)
+    started.wait(5)
+    for i in range(1, 5):
+        worker(i)
+    release.set()
+    wait_for(lambda: worker.delivered == 2)
+    worker.stop()
+    assert received == [0, 4]
+    assert worker.stats()["conflated"] == 3
+
+
+def test_failed_callbacks_count_as_errors_not_deliveries():
+    def callback(msg):
+        if msg == "bad":
+            raise ValueError(msg)
+
+    worker = DeliveryWorker(callback)
+    for msg in ["ok", "bad", "ok"]:
+        worker(msg)
+    wait_for(lambda: worker.delivered + worker.errors == 3)
+    worker.stop()
+    assert (worker.delivered, worker.errors) == (2, 1)
+
+
+def test_slow_subscriber_does_not_block_inline_ones():
+    manager = WebsocketManager.offline()
+    release = threading.Event()
+    inline: List[Any] = []
+
+    def slow(_: Any) -> None:
+        release.wait(5)
+
+    slow_id = manager.subscribe({"type": "allMids"}, slow, delivery="conflate")
+    manager.subscribe({"type": "allMids"}, inline.append)
+    for _ in range(3):
+        manager.on_message(None, '{"channel": "allMids", "data": {"mids": {}}}')
+    assert len(inline) == 3
+    release.set()
+    assert slow_id in manager.delivery_stats()
+    manager.unsubscribe({"type": "allMids"}, slow_id)
+    assert manager.delivery_stats() == {}
@@ -0,0 +1,46 @@
+import json
+
+from hyperliquid.utils.feed_stats import FeedStats, exchange_time_ms
+from hyperliquid.utils.types import WsMsg, cast
+from hyperliquid.websocket_manager import WebsocketManager
+
+
+def test_exchange_time_is_read_from_books_and_trades_but_not_candles():
+    book = {"channel": "l2Book", "data": {"coin": "ETH", "time": 5, "levels": [[], []]}}
+    assert exchange_time_ms(cast(WsMsg, book)) == 5
+    trades = {"channel": "trades", "data": [{"coin": "ETH", "time": 7}, {"coin": "ETH", "time": 9}]}
+    assert exchange_time_ms(cast(WsMsg, trades)) == 9
+    candle = {"channel": "candle", "data": {"s": "ETH", "i": "1m", "t": 0, "T": 59999}}
+    assert exchange_time_ms(cast(WsMsg, candle)) is None
+
+
+def test_lag_gaps_and_rate_are_rolling():
+    stats = FeedStats(window_seconds=10)
+    for i in range(5):
+        received_at = 1000.0 + i
+        msg = {"channel": "l2Book", "data": {"coin": "ETH", "time": int(received_at * 1000) - 20 - i, "levels": []}}
+        stats.record("l2Book:eth", cast(WsMsg, msg), received_at)
+
+    snapshot = stats.snapshot("l2Book:eth", now=1004.5)
+    assert abs(snapshot["lag_ms_last"] - 24) < 1e-6
+    assert abs(snapshot["lag_ms_max"] - 24) < 1e-6
+    assert abs(snapshot["gap_s_mean"] - 1.0) < 1e-9
+    assert snapshot["rate_per_s"] == 0.4
+    assert snapshot["age_s"] == 0.5
+
+    assert stats.snapshot("l2Book:eth", now=1030.0)["lag_ms_mean"] is None
+
+
+def test_manager_records_frames_and_ping_round_trips():
+    manager = WebsocketManager.offline()
+    manager.subscribe({"type": "trades", "coin": "ETH"}, lambda _: None)
+    manager.on_message(None, json.dumps({"channel": "trades", "data": [{"coin": "ETH", "time": 1}]}))
+    manager.feed_stats.record_ping()
+    manager.on_message(None, json.dumps({"channel": "pong"}))
+
+    health = manager.feed_health({"type": "trades", "coin": "ETH"})
+    assert health["lag_ms_last"] > 0
+    assert health["age_s"] < 5
+    assert health["ping_rtt_ms"] >= 0
+    assert manager.feed_stats.is_fresh("trades:eth", max_age_s=5)
+    assert not manager.feed_stats.is_fresh("trades:eth", max_age_s=5, max_lag_ms=1000)
@@ -0,0 +1,84 @@
+from hyperliquid.fill_cache import FillCache
+from hyperliquid.info import Info
+from hyperliquid.utils.types import cast
+
+
+def fill(oid, tid, px, sz, fee="0.01", t=0):
+    return {
+        "coin": "ETH",
+        "px": str(px),
+        "sz": str(sz),
+        "side": "B",
+        "time": t,
+        "startPosition": "0",
+        "dir": "Open Long",
+        "closedPnl": "0",
+        "hash": "0x",
+        "oid": oid,
+        "crossed": False,
+        "fee": fee,
+        "tid": tid,
+        "feeToken": "USDC",
+    }
+
+
+class FakeInfo:
+    def __init__(self, history):
+        self.history = history
+        self.subscriptions = []
+
+    def subscribe(self, subscription, callback):
+        self.subscriptions.append((subscription, callback))
+        return 1
+
+    def iter_user_fills_by_time(self, address, start_time, end_time=None):
+        return iter(self.history)
+
+
+def test_partial_fills_are_aggregated_into_a_vwap():
+    cache = FillCache(cast(Info, FakeInfo([])), "0xabc")
+    cache.on_user_fills(
+        {
+            "channel": "userFills",
+            "data": {
+                "user": "0xabc",
+                "isSnapshot": False,
+                "fills": [fill(7, 1, 100, 1), fill(7, 2, 103, 2, t=5), fill(8, 3, 50, 1)],
+            },
+        }
+    )
+
+    order_fills = cache.get(7)
+    assert order_fills is not None
+    assert order_fills.size == 3 and order_fills.vwap == 102 and order_fills.fills == 2
+    assert abs(order_fills.fee - 0.02) < 1e-12 and order_fills.last_time == 5
+    assert cache.vwap(8) == 50
+    assert cache.get(9) is None
+
+
+def test_backfill_and_snapshot_overlap_is_counted_once():
+    info = FakeInfo([fill(7, 1, 100, 1), fill(7, 2, 110, 1)])
+    cache = FillCache(cast(Info, info), "0xabc")
+    cache.start(backfill_ms=60_000)
+    ((subscription, callback),) = info.subscriptions
+    assert subscription == {"type": "userFills", "user": "0xabc"}
+
+    callback(
+        {
+            "channel": "userFills",
+            "data": {"user": "0xabc", "isSnapshot": True, "fills": [fill(7, 2, 110, 1), fill(7, 4, 120, 2)]},
+        }
+    )
+    order_fills = cache.get(7)
+    assert order_fills is not None and order_fills.size == 4 and order_fills.vwap == 112.5
+
+
+def test_only_recent_orders_are_kept():
+    cache = FillCache(cast(Info, FakeInfo([])), "0xabc", max_orders=2)
+    for oid in range(3):
+        cache.add(fill(oid, oid, 1, 1))
+    cache.add(fill(1, 10, 1, 1))
+    cache.add(fill(3, 11, 1, 1))
+    assert cache.get(0) is None and cache.get(2) is None
+    order_fills = cache.get(1)
+    assert order_fills is not None and order_fills.size == 2 and len(cache) == 2
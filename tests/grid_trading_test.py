@@ -0,0 +1,323 @@
+import logging
+import time
+
+from hyperliquid.grid_trading import GridTrading
+from hyperliquid.utils.error import WsPostOutcomeUnknownError
+from view_logs import parse_log_lines
+
+
+class FakeInfo:
+    def __init__(self, mid=1000.0):
+        self.mid = mid
+        self.open = []
+        self.order_prices = {}
+        self.queried = []
+        self.orders_by_cloid = {}
+        self.fills = []
+        self.fill_queries = []
+        self.subscriptions = []
+
+    def meta(self):
+        return {"universe": [{"name": "ETH", "tickSize": "1"}]}
+
+    def subscribe(self, subscription, callback, **kwargs):
+        self.subscriptions.append(subscription["type"])
+        return 1
+
+    def unsubscribe(self, subscription, subscription_id):
+        self.subscriptions.remove(subscription["type"])
+        return True
+
+    def l2_snapshot(self, coin):
+        return {"levels": [[{"px": str(self.mid)}], [{"px": str(self.mid)}]]}
+
+    def open_orders(self, address):
+        return self.open
+
+    def user_state(self, address):
+        return {"assetPositions": [], "spotBalances": [{"coin": "USDC", "total": "1000000"}]}
+
+    def query_order_by_oid(self, address, oid):
+        self.queried.append(oid)
+        return {"order": {"order": {"oid": oid, "limitPx": str(self.order_prices[oid])}}}
+
+    def query_order_by_cloid(self, address, cloid):
+        return self.orders_by_cloid.get(str(cloid), {"status": "unknownOid"})
+
+    def iter_user_fills_by_time(self, address, start_time, end_time=None):
+        self.fill_queries.append(start_time)
+        return iter([fill for fill in self.fills if fill["time"] >= start_time])
+
+
+class FakeExchange:
+    def __init__(self):
+        self.next_oid = 1000
+        self.calls = []
+        self.rejected_modifies = set()
+        self.bulk_statuses = None
+        # Orders whose request is "sent" but never answered; they still reach the book when placed is True
+        self.unanswered = None
+
+    def _resting(self):
+        self.next_oid += 1
+        return {"resting": {"oid": self.next_oid}}
+
+    def order(self, coin, is_buy, sz, px, order_type, reduce_only=False, cloid=None):
+        self.calls.append(("order", is_buy, px))
+        if self.unanswered is not None:
+            info, placed = self.unanswered
+            if placed:
+                oid = self._resting()["resting"]["oid"]
+                info.orders_by_cloid[str(cloid)] = {
+                    "status": "order",
+                    "order": {"order": {"oid": oid, "limitPx": str(px), "origSz": str(sz)}, "status": "open"},
+                }
+            raise WsPostOutcomeUnknownError("No post response within 5s")
+        return {"status": "ok", "response": {"data": {"statuses": [self._resting()]}}}
+
+    def bulk_orders(self, order_requests):
+        self.calls.append(("bulk_orders", [(o["is_buy"], o["limit_px"]) for o in order_requests]))
+        if self.unanswered is not None:
+            info, placed = self.unanswered
+            for o in order_requests[: len(placed)]:
+                info.orders_by_cloid[str(o["cloid"])] = {
+                    "status": "order",
+                    "order": {"order": {"oid": self._resting()["resting"]["oid"], "limitPx": str(o["limit_px"])},
+                              "status": "open"},
+                }
+            raise WsPostOutcomeUnknownError("No post response within 5s")
+        statuses = self.bulk_statuses or [self._resting() for _ in order_requests]
+        return {"status": "ok", "response": {"data": {"statuses": statuses}}}
+
+    def bulk_modify_orders_new(self, modify_requests):
+        self.calls.append(("modify", [(m["oid"], m["order"]["limit_px"]) for m in modify_requests]))
+        statuses = [
+            {"error": "Order was never placed"} if m["oid"] in self.rejected_modifies else self._resting()
+            for m in modify_requests
+        ]
+        return {"status": "ok", "response": {"data": {"statuses": statuses}}}
+
+    def bulk_cancel(self, cancel_requests):
+        self.calls.append(("cancel", [c["oid"] for c in cancel_requests]))
+        return {"status": "ok"}
+
+
+def make_grid(info=None, exchange=None, **risk_config):
+    grid = GridTrading(
+        "0xabc", info or FakeInfo(), exchange or FakeExchange(), "ETH", 4, 1100, 900, 0.01, 0.5,
+        risk_config_path="/nonexistent/grid_risk_config.json",
+    )
+    grid.risk_config.update(risk_config)
+    return grid
+
+
+def test_fill_cache_is_unsubscribed_when_its_backfill_fails(tmp_path):
+    info = FakeInfo()
+    setattr(info, "iter_user_fills_by_time", None)  # the backfill fails with a TypeError
+    config = tmp_path / "grid_risk_config.json"
+    config.write_text('{"fill_cache_ws": true}')
+
+    grid = GridTrading("0xabc", info, FakeExchange(), "ETH", 4, 1100, 900, 0.01, 0.5, risk_config_path=str(config))
+
+    assert grid.fill_cache is None
+    assert "userFills" not in info.subscriptions
+
+
+def fill_window(grid, prices):
+    now = time.time()
+    for i, price in enumerate(prices):
+        grid._price_window.append(now - len(prices) + i, price)
+
+
+def test_calc_grid_prices_spaces_levels_evenly():
+    grid = make_grid()
+    grid._calc_grid_prices()
+    assert grid.eachprice == [900, 950, 1000, 1050, 1100]
+
+
+def test_adaptive_range_needs_samples_and_is_clamped():
+    grid = make_grid(adaptive_min_samples=10, adaptive_range_mult=4.0, adaptive_min_ratio=0.01, adaptive_max_ratio=0.2)
+    fill_window(grid, [1000.0] * 5)
+    assert grid._adaptive_grid_range(1000.0) is None
+
+    fill_window(grid, [1000.0] * 10)
+    assert grid._adaptive_grid_range(1000.0) == (990.0, 1010.0)
+
+    fill_window(grid, [600.0, 1400.0] * 10)
+    assert grid._adaptive_grid_range(1000.0) == (800.0, 1200.0)
+
+
+def test_adaptive_rebalance_moves_cancels_and_refills_entry_orders():
+    exchange = FakeExchange()
+    grid = make_grid(FakeInfo(mid=1000.0), exchange, adaptive_min_samples=10, adaptive_min_ratio=0.1)
+    # The new grid is [900, 950, 1000, 1050, 1100]: index 0 moves, index 3 would cross the mid and is cancelled,
+    # index 1 is empty and refilled, index 2 sits at the mid and stays empty
+    grid.buy_orders = [{"index": 0, "oid": 1, "px": 850}, {"index": 3, "oid": 3, "px": 990}]
+    grid.sell_orders = [{"index": 4, "oid": 4, "px": 1050, "is_tp": False}]
+    fill_window(grid, [1000.0] * 20)
+
+    grid.adaptive_rebalance()
+
+    assert grid.eachprice == [900, 950, 1000, 1050, 1100]
+    assert exchange.calls == [("modify", [(1, 900.0)]), ("cancel", [3]), ("order", True, 950)]
+    assert [(o["index"], o["oid"], o["px"]) for o in grid.buy_orders] == [(0, 1001, 900), (1, 1002, 950)]
+    assert grid.sell_orders == [{"index": 4, "oid": 4, "px": 1050, "is_tp": False}]
+
+
+def test_adaptive_rebalance_keeps_orders_whose_modify_failed():
+    exchange = FakeExchange()
+    exchange.rejected_modifies.add(2)
+    grid = make_grid(FakeInfo(mid=1000.0), exchange, adaptive_min_samples=10, adaptive_min_ratio=0.1)
+    grid.buy_orders = [{"index": 0, "oid": 1, "px": 850}, {"index": 1, "oid": 2, "px": 900}]
+    fill_window(grid, [1000.0] * 20)
+
+    grid.adaptive_rebalance()
+
+    assert exchange.calls == [("modify", [(1, 900.0), (2, 950.0)])]
+    assert grid.buy_orders == [{"index": 0, "oid": 1001, "px": 900}, {"index": 1, "oid": 2, "px": 900}]
+
+
+def test_extreme_volatility_blocks_only_fixed_rebalances():
+    info = FakeInfo(mid=1000.0)
+    info.open = [{"oid": i} for i in range(4)]
+    grid = make_grid(info, adaptive_min_samples=10, volatility_threshold=0.01)
+    fill_window(grid, [950.0, 1050.0] * 10)
+    assert grid.is_extreme_volatility()
+    assert not grid.pre_rebalance_risk_check()
+    assert grid.pre_rebalance_risk_check(block_on_volatility=False)
+
+    rebalanced = []
+    grid.adaptive_rebalance = lambda: rebalanced.append("adaptive")
+    grid.rebalance()
+    assert rebalanced == []
+    grid.risk_config["adaptive_grid"] = True
+    grid.rebalance()
+    assert rebalanced == ["adaptive"]
+
+
+def test_stale_websocket_mid_falls_back_to_rest():
+    grid = make_grid(FakeInfo(mid=1000.0), ws_mid_max_staleness=10)
+    grid.ws_midprice, grid._ws_mid_time = 1200.0, time.time()
+    assert grid.get_midprice() == 1200.0
+    grid.is_extreme_volatility()
+    assert len(grid._price_window) == 0
+
+    # After the socket drops the feed stops, so the frozen mid is ignored and the window is sampled over REST
+    grid._ws_mid_time -= 60
+    assert grid.get_midprice() == 1000.0
+    grid.is_extreme_volatility()
+    grid.is_extreme_volatility()
+    assert len(grid._price_window) == 2 and grid._price_window.last() == 1000.0
+
+
+def test_unanswered_order_is_registered_if_it_reached_the_book_and_retried_otherwise():
+    info, exchange = FakeInfo(), FakeExchange()
+    grid = make_grid(info, exchange)
+
+    exchange.unanswered = (info, True)
+    grid.place_order_with_retry("ETH", True, 0.5, 950, {"limit": {"tif": "Gtc"}}, 1)
+    assert grid.buy_orders == [{"index": 1, "oid": 1001, "px": 950.0}]
+    assert grid.pending_orders_to_place == []
+
+    exchange.unanswered = (info, False)
+    grid.place_order_with_retry("ETH", True, 0.5, 900, {"limit": {"tif": "Gtc"}}, 0)
+    assert len(grid.buy_orders) == 1
+    assert [(o["limit_px"], o["original_index"]) for o in grid.pending_orders_to_place] == [(900.0, 0)]
+
+
+def grid_with_fills(**risk_config):
+    info, exchange = FakeInfo(mid=1000.0), FakeExchange()
+    grid = make_grid(info, exchange, **risk_config)
+    # Buy 5 and sell 6 filled, buy 7 is still on the book
+    grid.buy_orders = [{"index": 0, "oid": 5, "px": 900}, {"index": 1, "oid": 7, "px": 950}]
+    grid.sell_orders = [{"index": 3, "oid": 6, "px": 1000, "is_tp": True}]
+    info.open = [{"oid": 7}]
+    info.order_prices = {5: 900.0, 6: 1000.0}
+    return grid, info, exchange
+
+
+def test_check_orders_replaces_each_fill():
+    grid, info, exchange = grid_with_fills()
+
+    grid.check_orders()
+
+    assert info.queried == [5, 6]
+    assert exchange.calls == [("order", False, 909.0), ("order", True, 990.0)]
+    assert [(o["index"], o["px"]) for o in grid.buy_orders] == [(1, 950), (3, 990.0)]
+    assert [(o["index"], o["px"], o["is_tp"]) for o in grid.sell_orders] == [(0, 909.0, False)]
+
+
+def test_batched_check_orders_reads_fill_prices_from_one_fills_query():
+    grid, info, exchange = grid_with_fills(batch_fill_handling=True)
+    since = grid._fills_since_ms = 1000
+    info.fills = [
+        {"oid": 5, "px": "899", "sz": "0.25", "time": since + 1},
+        {"oid": 5, "px": "901", "sz": "0.25", "time": since + 2},
+        # Only part of order 6 filled since the last check, so its price is looked up on its own
+        {"oid": 6, "px": "1000", "sz": "0.25", "time": since + 3},
+        {"oid": 9, "px": "1200", "sz": "0.5", "time": since + 4},
+    ]
+
+    grid.check_orders()
+
+    assert info.fill_queries == [since]
+    assert info.queried == [6]
+    assert exchange.calls == [("bulk_orders", [(False, 909.0), (True, 990.0)])]
+    assert grid._fills_since_ms > since
+
+
+def test_replacement_order_waits_for_an_unknown_price():
+    grid = make_grid()
+    grid.buy_orders = [{"index": 0, "oid": 5, "px": 900}]
+    assert grid._replacement_order("buy", 5, grid.buy_orders[0], None) is None
+    assert grid.buy_orders == [{"index": 0, "oid": 5, "px": 900}]
+
+    order = grid._replacement_order("buy", 5, grid.buy_orders[0], 900.0)
+    assert (order["is_buy"], order["limit_px"], order["order_type"]["reduceOnly"], order["grid_index"]) == (False, 909.0, True, 0)
+    assert grid.buy_orders == []
+
+
+def test_register_order_status_files_orders_by_side():
+    grid = make_grid()
+    grid._register_order_status({"resting": {"oid": 1}}, grid._order_spec(True, 900, {}, 0))
+    grid._register_order_status({"resting": {"oid": 2}}, grid._order_spec(True, 950, {}, 1, reduce_only=True))
+    grid._register_order_status({"resting": {"oid": 3}}, grid._order_spec(False, 1050, {}, 3, is_short_order=True))
+    grid._register_order_status({"resting": {"oid": 4}}, grid._order_spec(False, 1100, {}, 4, reduce_only=True))
+    grid._register_order_status({"filled": {"oid": 5, "avgPx": "1000"}}, grid._order_spec(True, 1000, {}, 2))
+    grid._register_order_status({"error": "Insufficient margin"}, grid._order_spec(True, 900, {}, 0))
+
+    assert [o["oid"] for o in grid.buy_orders] == [1]
+    assert [o["oid"] for o in grid.short_cover_orders] == [2]
+    assert [o["oid"] for o in grid.short_orders] == [3]
+    assert grid.sell_orders == [{"index": 4, "oid": 4, "px": 1100.0, "is_tp": True}]
+    assert [(o["limit_px"], o["original_index"]) for o in grid.pending_orders_to_place] == [(900.0, 0)]
+
+
+def test_bulk_placement_logs_each_order_for_the_log_analytics(caplog):
+    exchange = FakeExchange()
+    exchange.bulk_statuses = [{"resting": {"oid": 21}}, {"filled": {"oid": 22, "avgPx": "1010", "totalSz": "0.5"}},
+                              {"error": "Order has invalid price"}]
+    grid = make_grid(exchange=exchange, batch_fill_handling=True)
+    orders = [grid._order_spec(True, 990, {}, 1), grid._order_spec(False, 1010, {}, 3, reduce_only=True),
+              grid._order_spec(False, 1, {}, 4)]
+
+    with caplog.at_level(logging.INFO, logger="hyperliquid.grid_trading"):
+        grid._place_orders(orders)
+
+    assert [o["oid"] for o in grid.buy_orders] == [21]
+    assert [o["limit_px"] for o in grid.pending_orders_to_place] == [1.0]
+    formatter = logging.Formatter("%(asctime)s %(levelname)s %(message)s")
+    fills, placed, _ = parse_log_lines([formatter.format(r) for r in caplog.records], "grid.log", {})
+    assert [(o["oid"], o["coin"], o["side"], o["px"]) for o in placed] == [(21, "ETH", "B", 990.0)]
+    assert [(f["oid"], f["side"], f["px"]) for f in fills] == [(22, "A", 1010.0)]
+
+
+def test_unanswered_bulk_placement_registers_what_reached_the_book():
+    info, exchange = FakeInfo(), FakeExchange()
+    grid = make_grid(info, exchange, batch_fill_handling=True)
+    exchange.unanswered = (info, [True])
+
+    grid._place_orders([grid._order_spec(True, 950, {}, 1), grid._order_spec(True, 900, {}, 0)])
+
+    assert grid.buy_orders == [{"index": 1, "oid": 1001, "px": 950.0}]
+    assert [(o["limit_px"], o["original_index"]) for o in grid.pending_orders_to_place] == [(900.0, 0)]
@@ -1,5 +1,6 @@
 import pytest
 
+from hyperliquid import info as info_module
 from hyperliquid.info import Info
 from hyperliquid.utils.types import L2BookData, Meta, SpotMeta
 
@@ -133,3 +134,40 @@ def test_user_funding_history_without_end_time():
         for key in ["coin", "fundingRate", "szi", "type", "usdc"]:
             assert key in delta, f"There must be a key '{key}' in 'delta'"
         assert delta["type"] == "funding", "The type must be 'funding'"
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_user_fills_by_time_dedupes_page_boundaries(prefetch, monkeypatch):
+    monkeypatch.setattr(info_module, "USER_FILLS_PAGE_LIMIT", 3)
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    fills = [{"tid": i, "time": t} for i, t in enumerate([100, 200, 200, 300, 300, 300, 400])]
+    requested_start_times = []
+
+    def fake_post(url_path, payload):
+        requested_start_times.append(payload["startTime"])
+        # Pages are capped at three records, like the capped responses of the real endpoint
+        return [f for f in fills if f["time"] >= payload["startTime"]][:3]
+
+    monkeypatch.setattr(info, "post", fake_post)
+    response = list(info.iter_user_fills_by_time("0x0", 100, prefetch=prefetch))
+    assert response == fills
+    # The short page at 301 ends the walk
+    assert requested_start_times == [100, 200, 300, 300, 301]
+
+
+def test_iter_funding_history_stops_after_end_time(monkeypatch):
+    monkeypatch.setattr(info_module, "FUNDING_HISTORY_PAGE_LIMIT", 4)
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    info.name_to_coin["BTC"] = "BTC"
+    history = [{"coin": "BTC", "time": t} for t in range(0, 1000, 100)]
+    calls = []
+
+    def fake_post(url_path, payload):
+        calls.append(payload)
+        return [h for h in history if payload["startTime"] <= h["time"] <= payload["endTime"]][:4]
+
+    monkeypatch.setattr(info, "post", fake_post)
+    response = list(info.iter_funding_history("BTC", 0, 500))
+    assert [r["time"] for r in response] == [0, 100, 200, 300, 400, 500]
+    assert all(call["type"] == "fundingHistory" for call in calls)
+    assert [call["startTime"] for call in calls] == [0, 300]
@@ -0,0 +1,47 @@
+import eth_account
+import pytest
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.multi_sig import MultiSigCoordinator
+from hyperliquid.utils.constants import TESTNET_API_URL
+from hyperliquid.utils.nonce import NonceManager
+from hyperliquid.utils.signing import sign_multi_sig_l1_action_payload
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+MULTI_SIG_USER = "0x0000000000000000000000000000000000000005"
+
+
+def make_coordinator(authorized_wallets, signer_wallets):
+    outer = eth_account.Account.from_key("0x" + "11" * 32)
+    exchange = Exchange(outer, TESTNET_API_URL, meta=TEST_META, spot_meta=TEST_SPOT_META, nonce_manager=NonceManager())
+    config = {"authorizedUsers": [w.address.lower() for w in authorized_wallets], "threshold": 2}
+    setattr(exchange.info, "query_user_to_multi_sig_signers", lambda user: config)
+    return MultiSigCoordinator(exchange, MULTI_SIG_USER, signer_wallets)
+
+
+def test_prepare_matches_per_signer_signing():
+    wallets = [eth_account.Account.from_key("0x" + f"{i:02x}" * 32) for i in range(2, 5)]
+    coordinator = make_coordinator(wallets, wallets)
+    actions = [{"type": "scheduleCancel", "time": t} for t in (1, 2)]
+
+    prepared = coordinator.prepare(actions)
+
+    for action, presigned in zip(actions, prepared):
+        expected = [
+            sign_multi_sig_l1_action_payload(
+                w, action, False, None, presigned["nonce"], None, MULTI_SIG_USER, coordinator.exchange.wallet.address
+            )
+            for w in wallets
+        ]
+        assert presigned["action"]["type"] == "multiSig"
+        assert presigned["action"]["payload"]["action"] == action
+        assert presigned["action"]["signatures"] == expected
+
+
+def test_verify_rejects_unauthorized_signer():
+    wallets = [eth_account.Account.from_key("0x" + f"{i:02x}" * 32) for i in range(2, 5)]
+    coordinator = make_coordinator(wallets[:2], wallets)
+    with pytest.raises(ValueError, match="unauthorized"):
+        coordinator.prepare([{"type": "scheduleCancel", "time": 1}])
@@ -0,0 +1,49 @@
+import multiprocessing
+import threading
+
+from hyperliquid.utils import nonce
+from hyperliquid.utils.nonce import NonceManager, get_nonce_manager
+from hyperliquid.utils.types import Any, List
+
+
+def test_nonces_are_unique_across_threads():
+    manager = NonceManager()
+    results: List[int] = []
+
+    def worker():
+        results.extend(manager.next_nonce() for _ in range(500))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(results)) == len(results) == 4000
+
+
+def test_nonces_increase_within_a_millisecond(monkeypatch):
+    monkeypatch.setattr(nonce, "get_timestamp_ms", lambda: 1000)
+    manager = NonceManager()
+    assert [manager.next_nonce() for _ in range(3)] == [1000, 1001, 1002]
+
+
+def allocate(lock_path, queue):
+    manager = NonceManager(lock_path)
+    queue.put([manager.next_nonce() for _ in range(200)])
+
+
+def test_nonces_are_unique_across_processes(tmp_path):
+    lock_path = str(tmp_path / "nonce")
+    queue: "multiprocessing.Queue[Any]" = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=allocate, args=(lock_path, queue)) for _ in range(4)]
+    for p in processes:
+        p.start()
+    results = [n for _ in processes for n in queue.get(timeout=30)]
+    for p in processes:
+        p.join()
+    assert len(set(results)) == len(results) == 800
+
+
+def test_get_nonce_manager_is_shared_per_signer():
+    address = "0x5e9ee1089755c3435139848e47e6635505d5a13a"
+    assert get_nonce_manager(address) is get_nonce_manager(address.upper().replace("0X", "0x"))
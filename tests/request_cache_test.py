@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from hyperliquid.info import INFO_CACHE_TTLS, Info
+from hyperliquid.utils.request_cache import RequestCache
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+def test_concurrent_identical_requests_share_one_fetch():
+    cache = RequestCache()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"orders": [1]}
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(cache.get, "openOrders", 0, fetch) for _ in range(4)]
+        while cache.misses + cache.coalesced < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [f.result() for f in futures]
+
+    assert len(calls) == 1
+    assert results == [{"orders": [1]}] * 4
+    # Every caller gets its own copy
+    assert len({id(r) for r in results}) == 4
+
+
+def test_invalidate_discards_results_fetched_before_it():
+    cache = RequestCache()
+
+    def fetch_then_invalidate():
+        cache.invalidate()
+        return "stale"
+
+    assert cache.get("k", 10, fetch_then_invalidate) == "stale"
+    assert cache.get("k", 10, lambda: "fresh") == "fresh"
+    assert cache.get("k", 10, lambda: "unused") == "fresh"
+
+
+def test_info_reuses_account_state_until_invalidated(monkeypatch):
+    posts = []
+
+    def post(self, url_path, payload=None):
+        posts.append(payload)
+        return {"n": len(posts)}
+
+    monkeypatch.setattr("hyperliquid.api.API.post", post)
+    uncached = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    assert uncached.user_state("0x0") == {"n": 1}
+    assert uncached.user_state("0x0") == {"n": 2}
+    posts.clear()
+
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META, cache_ttls=INFO_CACHE_TTLS)
+    assert info.user_state("0x0") == {"n": 1}
+    assert info.user_state("0x0") == {"n": 1}
+    assert info.user_fills("0x0") == {"n": 2}
+    assert info.user_fills("0x0") == {"n": 3}
+
+    info.response_cache.invalidate()
+    assert info.user_state("0x0") == {"n": 4}
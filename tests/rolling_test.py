@@ -0,0 +1,43 @@
+import random
+import statistics
+
+import pytest
+
+from hyperliquid.utils.rolling import RollingWindow
+
+
+@pytest.mark.parametrize("capacity", [8, 1024])
+def test_rolling_window_matches_brute_force(capacity):
+    rng = random.Random(7)
+    window = RollingWindow(window_seconds=5.0, capacity=capacity)
+    samples = []
+    t = 0.0
+    for _ in range(3000):
+        t += rng.random()
+        price = 100 + rng.gauss(0, 2)
+        window.append(t, price)
+        samples.append((t, price))
+        samples = [(st, p) for st, p in samples if st >= t - 5.0][-capacity:]
+        prices = [p for _, p in samples]
+        assert len(window) == len(prices)
+        assert window.min() == min(prices)
+        assert window.max() == max(prices)
+        assert window.mean() == pytest.approx(statistics.fmean(prices))
+        if len(prices) > 1:
+            assert window.stdev() == pytest.approx(statistics.stdev(prices), rel=1e-6, abs=1e-9)
+            moves = [abs(b - a) for a, b in zip(prices, prices[1:])]
+            assert window.atr() == pytest.approx(sum(moves) / len(moves), rel=1e-6, abs=1e-9)
+            assert window.range_ratio() == pytest.approx((max(prices) - min(prices)) / min(prices))
+
+
+def test_rolling_window_evicts_by_time():
+    window = RollingWindow(window_seconds=60)
+    window.append(0, 100.0)
+    window.append(30, 102.0)
+    assert window.range_ratio() == pytest.approx(0.02)
+    window.evict(75)
+    assert len(window) == 1
+    assert window.range_ratio() == 0.0
+    window.evict(200)
+    assert len(window) == 0
+    assert window.min() is None
@@ -0,0 +1,35 @@
+import eth_account
+import pytest
+
+from hyperliquid.exchange import Exchange
+from hyperliquid.signing_executor import SigningExecutor
+from hyperliquid.utils.constants import TESTNET_API_URL
+from hyperliquid.utils.nonce import NonceManager
+from hyperliquid.utils.signing import sign_l1_action
+from hyperliquid.utils.types import Meta, SpotMeta
+
+TEST_META: Meta = {"universe": [{"name": "ETH", "szDecimals": 4}]}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_signs_like_sign_l1_action_with_increasing_nonces(mode):
+    wallet = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
+    exchange = Exchange(wallet, TESTNET_API_URL, meta=TEST_META, spot_meta=TEST_SPOT_META, nonce_manager=NonceManager())
+    actions = [exchange.bulk_cancel_action([{"coin": "ETH", "oid": oid}]) for oid in range(1, 4)]
+
+    with SigningExecutor(exchange, mode=mode, max_workers=2) as executor:
+        presigned = executor.sign_all(actions)
+
+    assert [p["action"] for p in presigned] == actions
+    nonces = [p["nonce"] for p in presigned]
+    assert nonces == sorted(set(nonces))
+    for p in presigned:
+        assert p["signature"] == sign_l1_action(wallet, p["action"], None, p["nonce"], None, False)
+
+
+def test_defaults_to_a_thread_pool():
+    wallet = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
+    exchange = Exchange(wallet, TESTNET_API_URL, meta=TEST_META, spot_meta=TEST_SPOT_META, nonce_manager=NonceManager())
+    with SigningExecutor(exchange) as executor:
+        assert executor.mode == "thread"
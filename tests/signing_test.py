@@ -1,20 +1,31 @@
+import random
+from decimal import Decimal
+
 import eth_account
+import msgpack
 import pytest
-from eth_utils import to_hex
+from eth_utils import keccak, to_hex
 
+from hyperliquid.utils import signing
 from hyperliquid.utils.signing import (
     OrderRequest,
     ScheduleCancelAction,
     action_hash,
     construct_phantom_agent,
     float_to_int_for_hashing,
+    float_to_wire,
+    floats_to_wire,
+    l1_payload,
     order_request_to_order_wire,
+    order_requests_to_order_wires,
     order_wires_to_order_action,
+    recover_agent_or_user_from_l1_action,
+    sign_inner,
     sign_l1_action,
     sign_usd_transfer_action,
     sign_withdraw_from_bridge_action,
 )
-from hyperliquid.utils.types import Cloid
+from hyperliquid.utils.types import Any, Cloid, Dict, List
 
 
 def test_phantom_agent_creation_matches_production():
@@ -271,3 +282,137 @@ def test_schedule_cancel_action():
     assert signature_testnet["r"] == "0x4e4f2dbd4107c69783e251b7e1057d9f2b9d11cee213441ccfa2be63516dc5bc"
     assert signature_testnet["s"] == "0x706c656b23428c8ba356d68db207e11139ede1670481a9e01ae2dfcdb0e1a678"
     assert signature_testnet["v"] == 27
+
+
+@pytest.mark.parametrize("use_coincurve", [True, False])
+@pytest.mark.parametrize("is_mainnet", [True, False])
+def test_fast_l1_signing_matches_generic_eip712(monkeypatch, use_coincurve, is_mainnet):
+    if use_coincurve:
+        pytest.importorskip("coincurve")
+    else:
+        monkeypatch.setattr(signing, "coincurve", None)
+    wallet = eth_account.Account.from_key("0x0123456789012345678901234567890123456789012345678901234567890123")
+    order_request: OrderRequest = {
+        "coin": "ETH",
+        "is_buy": True,
+        "sz": 0.0147,
+        "limit_px": 1670.1,
+        "reduce_only": False,
+        "order_type": {"limit": {"tif": "Gtc"}},
+        "cloid": Cloid.from_str("0x00000000000000000000000000000001"),
+    }
+    actions = [
+        {"type": "dummy", "num": float_to_int_for_hashing(1000)},
+        order_wires_to_order_action([order_request_to_order_wire(order_request, 1)] * 10),
+        {"type": "scheduleCancel", "time": 123456789},
+    ]
+    for action in actions:
+        for vault_address, nonce, expires_after in [
+            (None, 0, None),
+            ("0x1719884eb866cb12b2287399b15f7db5e7d775ea", 1677777606040, None),
+            (None, 1677777606040, 1677777666040),
+        ]:
+            hash = action_hash(action, vault_address, nonce, expires_after)
+            expected = sign_inner(wallet, l1_payload(construct_phantom_agent(hash, is_mainnet)))
+            assert sign_l1_action(wallet, action, vault_address, nonce, expires_after, is_mainnet) == expected
+            recovered = recover_agent_or_user_from_l1_action(
+                action, expected, vault_address, nonce, expires_after, is_mainnet
+            )
+            assert recovered == wallet.address
+
+
+def test_coincurve_key_is_kept_on_its_wallet():
+    pytest.importorskip("coincurve")
+    wallets = [eth_account.Account.create() for _ in range(2)]
+    for wallet in wallets:
+        signing.sign_hash(wallet, bytes(32))
+    first, second = (wallet._coincurve_key for wallet in wallets)
+    assert first.secret == bytes(wallets[0].key) and second.secret == bytes(wallets[1].key)
+    assert not hasattr(signing._coincurve_key, "cache_info")
+
+
+def reference_float_to_wire(x: float) -> str:
+    rounded = f"{x:.8f}"
+    if abs(float(rounded) - x) >= 1e-12:
+        raise ValueError("float_to_wire causes rounding", x)
+    if rounded == "-0":
+        rounded = "0"
+    normalized = Decimal(rounded).normalize()
+    return f"{normalized:f}"
+
+
+def test_float_to_wire_matches_decimal_reference():
+    rng = random.Random(0)
+    values = [0, 0.0, -0.0, 1, 100, 1e20, 1670.1, 0.0147, 0.00000001, -12.5, 123456.78901234]
+    for _ in range(5000):
+        decimals = rng.randint(0, 8)
+        values.append(round(rng.uniform(-1e6, 1e6), decimals))
+        values.append(round(rng.uniform(0, 1), decimals))
+    for value in values:
+        assert float_to_wire(value) == reference_float_to_wire(value), value
+    for value in [1e-9, 0.123456789]:
+        with pytest.raises(ValueError):
+            float_to_wire(value)
+
+
+def test_floats_to_wire_matches_float_to_wire():
+    rng = random.Random(1)
+    values = [0, 0.0, -0.0, 1, 100, 1e20, 1670.1, 0.0147, 0.00000001, -12.5, 9999999.99999999, -4e-13, float("inf")]
+    values += [round(1600 + i * 0.1, 1) for i in range(1000)] + [0.0147] * 100
+    for _ in range(5000):
+        decimals = rng.randint(0, 8)
+        values.append(round(rng.uniform(-1e6, 1e6), decimals))
+        values.append(round(rng.uniform(0, 1), decimals))
+    assert floats_to_wire(values) == [float_to_wire(value) for value in values]
+    for value in [1e-9, 0.123456789]:
+        with pytest.raises(ValueError):
+            floats_to_wire([1.0, value])
+
+
+def test_batch_order_wires_match_single_order_wires():
+    orders: List[OrderRequest] = [
+        {
+            "coin": "ETH",
+            "is_buy": i % 2 == 0,
+            "sz": 0.0147,
+            "limit_px": round(1670.1 + i * 0.1, 1),
+            "order_type": {"limit": {"tif": "Gtc"}},
+            "reduce_only": i % 3 == 0,
+            "cloid": Cloid.from_int(i) if i % 4 == 0 else None,
+        }
+        for i in range(20)
+    ]
+    wires = order_requests_to_order_wires(orders, [4] * len(orders))
+    assert wires == [order_request_to_order_wire(order, 4) for order in orders]
+    assert [list(wire) for wire in wires] == [list(order_request_to_order_wire(order, 4)) for order in orders]
+
+
+def test_action_hash_reuses_packed_actions_only_for_identical_bytes(monkeypatch):
+    packed: List[Any] = []
+    pack = signing._packb
+
+    def counting_packb(action):
+        packed.append(action)
+        return pack(action)
+
+    monkeypatch.setattr(signing, "_packb", counting_packb)
+    action = {"type": "scheduleCancel", "time": 1234567890123}
+    hashes = [action_hash(dict(action), None, nonce, None) for nonce in (1, 2, 3)]
+    assert len(set(hashes)) == 3 and len(packed) == 1
+    assert hashes[1] == keccak(msgpack.packb(action) + (2).to_bytes(8, "big") + b"\x00")
+
+    # Values that compare equal but pack differently, and reordered keys, are packed separately
+    for variant in [{"type": "probe", "a": True}, {"type": "probe", "a": 1}, {"a": 1, "type": "probe"}]:
+        assert action_hash(variant, None, 1, None) == keccak(msgpack.packb(variant) + (1).to_bytes(8, "big") + b"\x00")
+    assert len(packed) == 4
+
+
+def test_action_hash_reuses_packer_without_stale_output():
+    action: Dict[str, Any] = {"type": "cancel", "cancels": [{"a": 1, "o": 1}]}
+    first = action_hash(action, None, 1677777606040, None)
+    assert action_hash(action, None, 1677777606040, None) == first
+    action["cancels"][0]["o"] = 2
+    assert action_hash(action, None, 1677777606040, None) != first
+    assert action_hash(action, None, 1677777606040, None) == keccak(
+        msgpack.packb(action) + (1677777606040).to_bytes(8, "big") + b"\x00"
+    )
@@ -0,0 +1,52 @@
+from hyperliquid.trade_tape import TradeTape
+
+
+def trade(t, px, sz, side, coin="ETH"):
+    return {"coin": coin, "side": side, "px": str(px), "sz": str(sz), "hash": "0x", "time": t}
+
+
+def test_vwap_and_signed_volume_roll_over_the_window():
+    tape = TradeTape("ETH", window_seconds=10)
+    tape.on_trades({"channel": "trades", "data": [trade(0, 100, 1, "B"), trade(1000, 110, 3, "A")]})
+    assert tape.vwap() == (100 + 330) / 4
+    assert tape.signed_volume() == -2
+    assert tape.imbalance() == -0.5
+    assert tape.trade_count() == 2
+
+    tape.on_trades({"channel": "trades", "data": [trade(10_500, 120, 1, "B"), trade(10_500, 1, 1, "B", coin="BTC")]})
+    assert tape.trade_count() == 2
+    assert tape.vwap() == (330 + 120) / 4
+    assert tape.signed_volume() == -2
+    assert tape.last_price() == 120
+    # Price statistics come from the same window as the volume sums
+    assert (tape.window.min(), tape.window.max()) == (110, 120)
+
+    tape.evict(30_000)
+    assert tape.vwap() is None and tape.volume() == 0
+
+
+def test_capacity_bounds_the_window_and_sums_stay_exact():
+    tape = TradeTape("ETH", window_seconds=1e9, capacity=8)
+    for i in range(100):
+        tape.add(i, 100.0 + i, 0.1, 1.0)
+    assert len(tape) == 8
+    assert abs(tape.volume() - 0.8) < 1e-12
+    vwap = tape.vwap()
+    assert vwap is not None and abs(vwap - sum(100.0 + i for i in range(92, 100)) / 8) < 1e-9
+
+
+def test_trade_count_and_volume_bars():
+    tape = TradeTape("ETH", bar_trades=2, bar_volume=1.0)
+    tape.add(0, 10, 0.4, 1.0)
+    tape.add(1, 12, 0.4, -1.0)
+    tape.add(2, 11, 1.7, 1.0)
+
+    (bar,) = tape.bars("trades")
+    assert (bar.open, bar.high, bar.low, bar.close, bar.trades) == (10, 12, 10, 12, 2)
+    assert abs(bar.signed_volume) < 1e-12 and abs(bar.vwap - 11) < 1e-12
+
+    volume_bars = tape.bars("volume")
+    assert len(volume_bars) == 2
+    assert [round(b.volume, 9) for b in volume_bars] == [1.0, 1.0]
+    assert abs(volume_bars[0].vwap - (4 + 4.8 + 2.2) / 1.0) < 1e-9
+    assert volume_bars[1].trades == 1 and volume_bars[1].close == 11
@@ -0,0 +1,61 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from hyperliquid.utils.transport import Transport
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.path == "/slow":
+            time.sleep(1)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_reuses_warm_connection_and_records_setup_and_teardown(server_url):
+    transport = Transport(server_url, keepalive_interval=None)
+    transport.warm_up()
+    for i in range(3):
+        assert transport.post(server_url + "/info", {"n": i}).json() == {"n": i}
+    transport.close()
+
+    metrics = transport.metrics.snapshot()
+    assert metrics["connects"] == 1
+    assert metrics["pings"] == 1 and metrics["ping_failures"] == 0
+    assert metrics["closes"] == 1
+    assert metrics["connect_seconds_max"] >= metrics["last_connect_seconds"] > 0
+
+
+def test_post_gives_up_after_the_timeout(server_url):
+    transport = Transport(server_url, keepalive_interval=None, timeout=0.1)
+    with pytest.raises(requests.Timeout):
+        transport.post(server_url + "/slow", {})
+    assert transport.post(server_url + "/slow", {}, timeout=5).json() == {}
+    transport.close()
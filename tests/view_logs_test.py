@@ -0,0 +1,63 @@
+from typing import Any, Dict
+
+import pytest
+
+from view_logs import extract_logs, parse_log_lines, summarize_analytics
+
+LOG_LINES = [
+    "2024-05-01 10:00:00,100 INFO [下单请求] 币种: ETH, 买, 数量: 0.5, 价格: 3000.0, reduceOnly: False, 网格序号: 2",
+    "2024-05-01 10:00:00,250 INFO [下单成功] oid: 11, 价格: 3000.0, 数量: 0.5, reduceOnly: False, 网格序号: 2",
+    "2024-05-01 10:00:01,000 INFO [下单请求] 币种: ETH, 卖, 数量: 0.5, 价格: 2990.0, reduceOnly: True, 网格序号: 3",
+    "2024-05-01 10:00:01,200 INFO [下单直接成交] oid: 12, 价格: 2995.5, 数量: 0.5, reduceOnly: True, 网格序号: 3",
+    "2024-05-01 10:05:00,000 INFO 🎯 检测到买单成交: oid=11, 价格=2999.5",
+    "2024-05-01 10:05:01,000 ERROR [下单失败] 结果: {'status': 'err'}，将加入重试列表",
+    "not a log line",
+]
+
+
+def test_requests_pair_with_the_following_success_or_direct_fill():
+    fills, orders, errors = parse_log_lines(LOG_LINES, "grid.log", {})
+
+    (order,) = orders
+    assert (order["oid"], order["coin"], order["side"], order["px"], order["sz"]) == (11, "ETH", "B", 3000.0, 0.5)
+    assert order["grid_index"] == 2 and order["reduce_only"] is False
+
+    direct, grid_fill = fills
+    assert (direct["oid"], direct["kind"], direct["side"], direct["px"]) == (12, "直接成交", "A", 2995.5)
+    # The size of a detected fill comes from the matching [下单成功] line
+    assert (grid_fill["oid"], grid_fill["side"], grid_fill["px"], grid_fill["sz"]) == (11, "B", 2999.5, 0.5)
+
+    (error,) = errors
+    assert error["tag"] == "下单失败" and error["level"] == "ERROR"
+
+
+def test_state_carries_order_sizes_across_batches():
+    state: Dict[str, Any] = {}
+    parse_log_lines(LOG_LINES[:2], "grid.log", state)
+    fills, orders, _ = parse_log_lines(LOG_LINES[4:5], "grid.log", state)
+    assert orders == [] and fills[0]["sz"] == 0.5
+    assert state["order_sizes"] == {}
+
+
+def test_extract_resumes_from_the_checkpoint(tmp_path, capsys):
+    pytest.importorskip("pyarrow")
+    import pyarrow.dataset as ds
+
+    logs_dir, out_dir = tmp_path / "logs", tmp_path / "analytics"
+    logs_dir.mkdir()
+    log_file = logs_dir / "grid.log"
+    # The last line is still being written and must wait for the next run
+    log_file.write_text("\n".join(LOG_LINES[:3]) + "\n" + LOG_LINES[3][:40], encoding="utf-8")
+
+    assert extract_logs(str(logs_dir), str(out_dir)) == {"fills": 0, "orders": 1, "errors": 0}
+    assert extract_logs(str(logs_dir), str(out_dir)) == {"fills": 0, "orders": 0, "errors": 0}
+
+    with open(log_file, "a", encoding="utf-8") as f:
+        f.write(LOG_LINES[3][40:] + "\n" + "\n".join(LOG_LINES[4:6]) + "\n")
+    assert extract_logs(str(logs_dir), str(out_dir)) == {"fills": 2, "orders": 0, "errors": 1}
+
+    fills = ds.dataset(str(out_dir / "fills"), format="parquet").to_table().to_pylist()
+    assert sorted((f["oid"], f["sz"]) for f in fills) == [(11, 0.5), (12, 0.5)]
+
+    summarize_analytics(str(out_dir))
+    assert "2024-05-01" in capsys.readouterr().out
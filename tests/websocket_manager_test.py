@@ -0,0 +1,143 @@
+import json
+
+import pytest
+
+from hyperliquid.info import Info
+from hyperliquid.utils.error import WsPostError, WsPostNotSentError, WsPostOutcomeUnknownError
+from hyperliquid.utils.types import Any, List, Meta, SpotMeta
+from hyperliquid.websocket_manager import WebsocketManager
+
+TEST_META: Meta = {"universe": []}
+TEST_SPOT_META: SpotMeta = {"universe": [], "tokens": []}
+
+
+class ConnectedManager(WebsocketManager):
+    """A manager whose socket counts as open and records what is sent instead of sending it."""
+
+    def __init__(self) -> None:
+        super().__init__("https://api.hyperliquid.xyz")
+        self.ws_ready = True
+        self.sent: List[Any] = []
+        setattr(self.ws, "send", lambda message: self.sent.append(json.loads(message)))
+
+
+def connected_manager():
+    return ConnectedManager()
+
+
+def test_post_responses_are_matched_by_id():
+    manager = connected_manager()
+    first = manager.post_async("info", {"type": "allMids"})
+    second = manager.post_async("action", {"action": {"type": "noop"}})
+    assert [m["id"] for m in manager.sent] == [1, 2]
+    assert manager.sent[0] == {"method": "post", "id": 1, "request": {"type": "info", "payload": {"type": "allMids"}}}
+
+    response = {"type": "action", "payload": {"status": "ok", "response": {"type": "default"}}}
+    manager.on_message(None, json.dumps({"channel": "post", "data": {"id": 2, "response": response}}))
+    response = {"type": "info", "payload": {"type": "allMids", "data": {"mids": {"ETH": "1"}}}}
+    manager.on_message(None, json.dumps({"channel": "post", "data": {"id": 1, "response": response}}))
+
+    assert first.result(0) == {"mids": {"ETH": "1"}}
+    assert second.result(0) == {"status": "ok", "response": {"type": "default"}}
+    assert manager.pending_posts == {}
+
+
+def test_pending_posts_fail_when_the_socket_closes():
+    manager = connected_manager()
+    future = manager.post_async("info", {"type": "allMids"})
+    manager.on_close(None, 1006, "abnormal")
+    with pytest.raises(WsPostError):
+        future.result(0)
+
+
+def test_api_falls_back_to_http_when_websocket_post_fails(monkeypatch):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    manager = connected_manager()
+    manager.ws_ready = False
+    info.enable_ws_post(manager, timeout=0.1)
+
+    class Response:
+        status_code = 200
+
+        def json(self):
+            return {"ETH": "1"}
+
+    monkeypatch.setattr(info.transport, "post", lambda url, payload: Response())
+    assert info.all_mids() == {"ETH": "1"}
+
+
+def test_actions_fall_back_to_http_only_when_never_sent(monkeypatch):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    manager = connected_manager()
+    info.enable_ws_post(manager, timeout=0.01)
+    http_posts: List[str] = []
+
+    class Response:
+        status_code = 200
+
+        def json(self):
+            return {"status": "ok"}
+
+    def http_post(url, payload):
+        http_posts.append(url)
+        return Response()
+
+    monkeypatch.setattr(info.transport, "post", http_post)
+
+    # Sent but unanswered: the action may have run, so it must not be sent again over HTTP
+    with pytest.raises(WsPostOutcomeUnknownError):
+        info.post("/exchange", {"action": {"type": "order"}})
+    assert http_posts == [] and manager.pending_posts == {}
+
+    manager.ws_ready = False
+    with pytest.raises(WsPostNotSentError):
+        manager.post("action", {"action": {"type": "order"}})
+    assert info.post("/exchange", {"action": {"type": "order"}}) == {"status": "ok"}
+    assert len(http_posts) == 1
+
+
+def test_post_from_the_websocket_thread_falls_back_to_http(monkeypatch):
+    info = Info(skip_ws=True, meta=TEST_META, spot_meta=TEST_SPOT_META)
+    manager = connected_manager()
+    info.enable_ws_post(manager, timeout=5)
+    results = []
+
+    class Response:
+        status_code = 200
+
+        def json(self):
+            return {"status": "ok"}
+
+    monkeypatch.setattr(info.transport, "post", lambda url, payload: Response())
+    # An inline callback runs on the thread reading the socket, which is the manager itself
+    manager.subscribe({"type": "allMids"}, lambda _: results.append(info.post("/exchange", {"action": {}})))
+    manager.sent.clear()
+    message = json.dumps({"channel": "allMids", "data": {"mids": {}}})
+    monkeypatch.setattr(manager, "run", lambda: manager.on_message(None, message))
+    manager.start()
+    manager.join(1)
+
+    assert results == [{"status": "ok"}]
+    assert manager.sent == [] and manager.pending_posts == {}
+
+
+def test_user_events_subscribers_share_one_upstream_subscription():
+    manager = connected_manager()
+    first: List[Any] = []
+    second: List[Any] = []
+    manager.subscribe({"type": "userEvents", "user": "0xAbC"}, first.append)
+    manager.subscribe({"type": "userEvents", "user": "0xabc"}, second.append)
+    assert [m["method"] for m in manager.sent] == ["subscribe"]
+
+    manager.on_message(None, json.dumps({"channel": "user", "data": {"fills": []}}))
+    assert len(first) == 1 and len(second) == 1
+
+    with pytest.raises(NotImplementedError):
+        manager.subscribe({"type": "userEvents", "user": "0xdef"}, lambda _: None)
+
+
+def test_other_feeds_are_subscribed_again_for_their_snapshot():
+    manager = connected_manager()
+    for _ in range(2):
+        manager.subscribe({"type": "l2Book", "coin": "ETH"}, lambda _: None)
+    assert [m["method"] for m in manager.sent] == ["subscribe", "subscribe"]
@@ -0,0 +1,99 @@
+import json
+import time
+
+from hyperliquid.utils.types import Any, List, cast
+from hyperliquid.websocket_manager import WebsocketManager
+from hyperliquid.websocket_pool import WebsocketPool
+
+
+class FakeManager(WebsocketManager):
+    def __init__(self, base_url):
+        super().__init__(base_url)
+        self.ws_ready = True
+        self.alive = False
+        self.sent: List[Any] = []
+        setattr(self.ws, "send", lambda message: self.sent.append(json.loads(message)))
+
+    def start(self):
+        self.alive = True
+
+    def is_alive(self):
+        return self.alive
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.001)
+    return True
+
+
+def l2_book_msg(coin):
+    return json.dumps({"channel": "l2Book", "data": {"coin": coin, "time": 0, "levels": [[], []]}})
+
+
+def test_subscriptions_are_sharded_and_identifiers_stay_together():
+    pool = WebsocketPool("https://api.hyperliquid.xyz", size=3, manager_factory=FakeManager)
+    coins = [f"COIN{i}" for i in range(12)]
+    for coin in coins:
+        pool.subscribe({"type": "l2Book", "coin": coin}, lambda _: None)
+    second = pool.subscribe({"type": "l2Book", "coin": "COIN0"}, lambda _: None)
+
+    assert sum(pool.shard_sizes()) == 13
+    assert sum(1 for size in pool.shard_sizes() if size > 0) > 1
+    holders = [m for m in pool.managers if m.active_subscriptions.get("l2Book:coin0")]
+    assert len(holders) == 1 and len(holders[0].active_subscriptions["l2Book:coin0"]) == 2
+
+    assert pool.unsubscribe({"type": "l2Book", "coin": "COIN0"}, second)
+    assert not pool.unsubscribe({"type": "l2Book", "coin": "COIN0"}, second)
+    assert len(holders[0].active_subscriptions["l2Book:coin0"]) == 1
+
+
+def test_channel_sharding_puts_a_channel_on_one_connection():
+    pool = WebsocketPool("https://api.hyperliquid.xyz", size=4, shard_by="channel", manager_factory=FakeManager)
+    for coin in ["BTC", "ETH", "SOL"]:
+        pool.subscribe({"type": "trades", "coin": coin}, lambda _: None)
+    assert sorted(pool.shard_sizes()) == [0, 0, 0, 3]
+
+
+def test_dead_connection_moves_its_subscriptions():
+    pool = WebsocketPool("https://api.hyperliquid.xyz", size=2, monitor_interval=60, manager_factory=FakeManager)
+    pool.start()
+    received: List[Any] = []
+    for coin in ["BTC", "ETH", "SOL", "ARB", "OP"]:
+        pool.subscribe({"type": "l2Book", "coin": coin}, received.append, delivery="thread")
+    shard = next(i for i, size in enumerate(pool.shard_sizes()) if size > 0)
+    dead = cast(FakeManager, pool.managers[shard])
+    survivor = cast(FakeManager, pool.managers[1 - shard])
+    dead.alive = False
+    survivor.sent.clear()
+
+    pool.replace_connection(shard)
+
+    assert pool.shard_sizes()[1 - shard] == 5
+    assert pool.managers[shard] is not dead and pool.reconnects == 1
+    assert len(survivor.sent) > 0 and all(m["method"] == "subscribe" for m in survivor.sent)
+
+    # Moved delivery workers keep running on the surviving connection
+    for coin in ["BTC", "ETH", "SOL", "ARB", "OP"]:
+        survivor.on_message(None, l2_book_msg(coin))
+    assert len(pool.delivery_stats()) == 5
+    assert wait_for(lambda: len(received) == 5)
+    assert sorted(msg["data"]["coin"] for msg in received) == ["ARB", "BTC", "ETH", "OP", "SOL"]
+    pool.stop()
+
+
+def test_user_events_of_different_users_get_separate_connections():
+    pool = WebsocketPool("https://api.hyperliquid.xyz", size=2, manager_factory=FakeManager)
+    users = ["0x1", "0x2", "0x3"]
+    for user in users:
+        pool.subscribe({"type": "userEvents", "user": user}, lambda _: None)
+        pool.subscribe({"type": "orderUpdates", "user": user}, lambda _: None)
+    pool.subscribe({"type": "userEvents", "user": "0x1"}, lambda _: None)
+
+    assert len(pool.managers) == 3
+    owners = [m.user_channel_owners for m in pool.managers]
+    assert sorted(o["userEvents"] for o in owners) == users
+    assert sorted(o["orderUpdates"] for o in owners) == users
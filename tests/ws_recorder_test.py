@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from hyperliquid.websocket_manager import WebsocketManager
+from hyperliquid.ws_recorder import FRAME_HEADER, WsRecorder, read_frames, replay
+
+
+def all_mids(price):
+    return json.dumps({"channel": "allMids", "data": {"mids": {"ETH": price}}})
+
+
+@pytest.mark.parametrize("suffix", [".bin", ".lz4"])
+def test_recorded_messages_replay_through_subscriptions(tmp_path, suffix):
+    if suffix == ".lz4":
+        pytest.importorskip("lz4")
+    path = str(tmp_path / f"feed{suffix}")
+    live = WebsocketManager.offline()
+    live.start_recording(path)
+    live.on_message(None, "Websocket connection established.")
+    live.on_message(None, all_mids("1.5"))
+    live.stop_recording()
+    # Appending after a restart continues the same recording
+    live.start_recording(path)
+    live.on_message(None, all_mids("1.6"))
+    live.stop_recording()
+
+    assert [m for _, m in read_frames(path)] == ["Websocket connection established.", all_mids("1.5"), all_mids("1.6")]
+
+    replayed = WebsocketManager.offline()
+    prices = []
+    replayed.subscribe({"type": "allMids"}, lambda msg: prices.append(msg["data"]["mids"]["ETH"]))
+    stats = replay(path, replayed)
+    assert prices == ["1.5", "1.6"]
+    assert stats["frames"] == 3
+
+
+def test_truncated_last_frame_is_ignored(tmp_path):
+    path = tmp_path / "feed.bin"
+    message = all_mids("1.5").encode()
+    path.write_bytes(FRAME_HEADER.pack(1.0, len(message)) + message + FRAME_HEADER.pack(2.0, 100) + b"{")
+    assert list(read_frames(str(path))) == [(1.0, all_mids("1.5"))]
+
+
+def test_recorded_frames_are_flushed_and_late_messages_after_close_are_dropped(tmp_path):
+    path = str(tmp_path / "feed.bin")
+    recorder = WsRecorder(path, flush_interval=0)
+    recorder.record(all_mids("1.5"), 1.0)
+    # Readable while the recorder is still open
+    assert list(read_frames(path)) == [(1.0, all_mids("1.5"))]
+
+    recorder.close()
+    recorder.record(all_mids("1.6"), 2.0)
+    recorder.close()
+    assert recorder.frames == 1
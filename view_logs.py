@@ -5,9 +5,26 @@
 """
 
 import os
+import re
 import sys
 import glob
-from datetime import datetime
+import json
+from datetime import datetime, timezone
+
+ANALYTICS_DIR = os.path.join(os.path.dirname(__file__), "analytics")
+CHECKPOINT_FILE = "checkpoint.json"
+MAX_TRACKED_ORDERS = 10000
+
+# 日志格式: '%(asctime)s %(levelname)s %(message)s'
+LINE_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}),(\d{3}) (\w+) (.*)$")
+ORDER_REQUEST_RE = re.compile(r"\[下单请求\] 币种: (\S+), (买|卖), 数量: ([^,]+), 价格: ([^,]+), reduceOnly: (\w+), 网格序号: (\S+)")
+ORDER_SUCCESS_RE = re.compile(r"\[下单成功\] oid: (\d+), 价格: ([^,]+), 数量: ([^,]+), reduceOnly: (\w+), 网格序号: (\S+)")
+DIRECT_FILL_RE = re.compile(r"\[下单直接成交\] oid: (\w+), 价格: ([^,]+), 数量: ([^,]+), reduceOnly: (\w+), 网格序号: (\S+)")
+FILL_RE = re.compile(r"🎯 检测到(买单|卖单|做空单|平空单)成交: oid=(\d+), 价格=(\S+)")
+ERROR_TAG_RE = re.compile(r"^\[([^\]]+)\]")
+
+# 成交类型 -> 方向
+FILL_KIND_SIDE = {"买单": "B", "卖单": "A", "做空单": "A", "平空单": "B"}
 
 def list_log_files():
     """列出所有日志文件"""
@@ -84,6 +101,233 @@ def search_logs(keyword, lines=10):
     if not found:
         print(f"没有找到包含 '{keyword}' 的日志记录")
 
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_log_lines(lines, log_name, state):
+    """解析日志行，返回 (fills, orders, errors) 三类记录
+
+    state 保存跨批次的解析状态：最近一次下单请求，以及 oid -> 下单数量（用于补全成交数量）
+    """
+    fills, orders, errors = [], [], []
+    order_sizes = state.setdefault("order_sizes", {})
+    for line in lines:
+        m = LINE_RE.match(line)
+        if not m:
+            continue
+        # 按日志中的本地时间原样存储，不做时区换算
+        ts = datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+        time_ms = int(ts.timestamp() * 1000) + int(m.group(2))
+        level, message = m.group(3), m.group(4)
+
+        req = ORDER_REQUEST_RE.search(message)
+        if req:
+            state["last_request"] = {
+                "coin": req.group(1),
+                "side": "B" if req.group(2) == "买" else "A",
+            }
+            continue
+
+        ok = ORDER_SUCCESS_RE.search(message)
+        if ok:
+            last_request = state.pop("last_request", None) or {}
+            oid, sz = int(ok.group(1)), _to_float(ok.group(3))
+            order_sizes[str(oid)] = sz
+            if len(order_sizes) > MAX_TRACKED_ORDERS:
+                # 撤销的订单永远不会成交，丢弃最早的记录防止检查点无限增长
+                del order_sizes[next(iter(order_sizes))]
+            orders.append({
+                "time": time_ms,
+                "log": log_name,
+                "oid": oid,
+                "coin": last_request.get("coin"),
+                "side": last_request.get("side"),
+                "px": _to_float(ok.group(2)),
+                "sz": sz,
+                "reduce_only": ok.group(4) == "True",
+                "grid_index": _to_int(ok.group(5)),
+            })
+            continue
+
+        direct = DIRECT_FILL_RE.search(message)
+        if direct:
+            last_request = state.pop("last_request", None) or {}
+            fills.append({
+                "time": time_ms,
+                "log": log_name,
+                "oid": _to_int(direct.group(1)),
+                "kind": "直接成交",
+                "side": last_request.get("side"),
+                "px": _to_float(direct.group(2)),
+                "sz": _to_float(direct.group(3)),
+            })
+            continue
+
+        fill = FILL_RE.search(message)
+        if fill:
+            kind, oid = fill.group(1), int(fill.group(2))
+            fills.append({
+                "time": time_ms,
+                "log": log_name,
+                "oid": oid,
+                "kind": kind,
+                "side": FILL_KIND_SIDE[kind],
+                "px": _to_float(fill.group(3)),
+                "sz": order_sizes.pop(str(oid), None),
+            })
+            continue
+
+        if level in ("ERROR", "CRITICAL"):
+            tag = ERROR_TAG_RE.match(message)
+            errors.append({
+                "time": time_ms,
+                "log": log_name,
+                "level": level,
+                "tag": tag.group(1) if tag else None,
+                "message": message,
+            })
+    return fills, orders, errors
+
+
+def _load_checkpoint(out_dir):
+    path = os.path.join(out_dir, CHECKPOINT_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_checkpoint(out_dir, checkpoint):
+    path = os.path.join(out_dir, CHECKPOINT_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _write_parquet(out_dir, table_name, records, schema, part_name):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if not records:
+        return
+    table_dir = os.path.join(out_dir, table_name)
+    os.makedirs(table_dir, exist_ok=True)
+    columns = {field.name: [r[field.name] for r in records] for field in schema}
+    table = pa.Table.from_pydict(columns, schema=schema)
+    pq.write_table(table, os.path.join(table_dir, f"{part_name}.parquet"))
+
+
+def extract_logs(logs_dir=None, out_dir=ANALYTICS_DIR):
+    """增量解析日志文件，将成交/下单/错误记录写入 Parquet 列式存储
+
+    每个日志文件记录已解析的字节偏移量，再次运行时只解析新增内容。
+    每次运行写出一个新的 part 文件，可用 pyarrow.dataset 或 pandas 直接读取整个目录。
+    """
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print("extract 需要安装 pyarrow: pip install pyarrow")
+        return None
+
+    logs_dir = logs_dir or os.path.join(os.path.dirname(__file__), "logs")
+    if not os.path.exists(logs_dir):
+        print("logs目录不存在")
+        return None
+    os.makedirs(out_dir, exist_ok=True)
+
+    time_type = pa.timestamp("ms")
+    schemas = {
+        "fills": pa.schema([
+            ("time", time_type), ("log", pa.string()), ("oid", pa.int64()), ("kind", pa.string()),
+            ("side", pa.string()), ("px", pa.float64()), ("sz", pa.float64()),
+        ]),
+        "orders": pa.schema([
+            ("time", time_type), ("log", pa.string()), ("oid", pa.int64()), ("coin", pa.string()),
+            ("side", pa.string()), ("px", pa.float64()), ("sz", pa.float64()), ("reduce_only", pa.bool_()),
+            ("grid_index", pa.int64()),
+        ]),
+        "errors": pa.schema([
+            ("time", time_type), ("log", pa.string()), ("level", pa.string()), ("tag", pa.string()),
+            ("message", pa.string()),
+        ]),
+    }
+
+    checkpoint = _load_checkpoint(out_dir)
+    log_files = sorted(glob.glob(os.path.join(logs_dir, "*.log")), key=os.path.getmtime)
+    counts = {"fills": 0, "orders": 0, "errors": 0}
+    part_name = datetime.now().strftime("part-%Y%m%d_%H%M%S_%f")
+    for log_file in log_files:
+        log_name = os.path.basename(log_file)
+        entry = checkpoint.setdefault(log_name, {"offset": 0, "state": {}})
+        size = os.path.getsize(log_file)
+        if size < entry["offset"]:
+            # 文件被截断或重写，从头开始解析
+            entry = checkpoint[log_name] = {"offset": 0, "state": {}}
+        if size == entry["offset"]:
+            continue
+        with open(log_file, "rb") as f:
+            f.seek(entry["offset"])
+            data = f.read()
+        # 只处理完整的行，未写完的最后一行留到下次
+        end = data.rfind(b"\n")
+        if end < 0:
+            continue
+        lines = data[: end + 1].decode("utf-8", errors="replace").splitlines()
+        fills, orders, errors = parse_log_lines(lines, log_name, entry["state"])
+        file_part = f"{part_name}-{log_name[:-4]}"
+        for table_name, records in (("fills", fills), ("orders", orders), ("errors", errors)):
+            _write_parquet(out_dir, table_name, records, schemas[table_name], file_part)
+            counts[table_name] += len(records)
+        entry["offset"] += end + 1
+        # 检查点在数据落盘之后写入，中断时最多重复解析一次
+        _save_checkpoint(out_dir, checkpoint)
+
+    print(f"解析完成: 成交 {counts['fills']} 条, 下单 {counts['orders']} 条, 错误 {counts['errors']} 条 -> {out_dir}")
+    return counts
+
+
+def summarize_analytics(out_dir=ANALYTICS_DIR):
+    """读取列式存储，按天统计成交、下单数量和成交率"""
+    try:
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+    except ImportError:
+        print("summary 需要安装 pyarrow: pip install pyarrow")
+        return
+
+    def daily_counts(table_name):
+        table_dir = os.path.join(out_dir, table_name)
+        if not os.path.exists(table_dir):
+            return {}
+        table = ds.dataset(table_dir, format="parquet").to_table(columns=["time"])
+        days = pc.strftime(table["time"], format="%Y-%m-%d")
+        counts = pc.value_counts(days).to_pylist()
+        return {c["values"]: c["counts"] for c in counts}
+
+    fills, orders, errors = daily_counts("fills"), daily_counts("orders"), daily_counts("errors")
+    days = sorted(set(fills) | set(orders) | set(errors))
+    if not days:
+        print("没有找到分析数据，请先运行 python view_logs.py extract")
+        return
+    print(f"{'日期':<12}{'下单':>8}{'成交':>8}{'成交率':>10}{'错误':>8}")
+    for day in days:
+        n_orders, n_fills = orders.get(day, 0), fills.get(day, 0)
+        fill_rate = f"{n_fills / n_orders:.1%}" if n_orders else "-"
+        print(f"{day:<12}{n_orders:>8}{n_fills:>8}{fill_rate:>10}{errors.get(day, 0):>8}")
+
+
 def main():
     if len(sys.argv) < 2:
         print("使用方法:")
@@ -91,6 +335,8 @@ def main():
         print("  python view_logs.py view <文件名或编号>      # 查看指定日志文件")
         print("  python view_logs.py search <关键词>         # 搜索日志内容")
         print("  python view_logs.py latest                  # 查看最新的日志文件")
+        print("  python view_logs.py extract                 # 增量解析日志，写入Parquet列式存储")
+        print("  python view_logs.py summary                 # 按天统计下单、成交和错误")
         return
     
     command = sys.argv[1].lower()
@@ -137,6 +383,12 @@ def main():
         if log_files:
             view_log_file(log_files[0])
     
+    elif command == "extract":
+        extract_logs()
+
+    elif command == "summary":
+        summarize_analytics()
+
     else:
         print(f"未知命令: {command}")
 